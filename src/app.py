@@ -5,7 +5,18 @@ import tkinter as tk # Import tkinter for StringVar
 # Make sure EngineerTable is imported correctly
 from src.views.engineer_table import EngineerTable
 from src.views.engineer_dialog import EngineerDialog
-from src.utils.db import init_database
+from src.views.import_view import ImportView
+from src.views.dashboard_view import DashboardView
+from src.views.companies_view import CompaniesView
+from src.views.projects_view import ProjectsView
+from src.views.combinations_view import SavedCombinationsView
+from src.views.reports_view import ReportsView
+from src.views.settings_view import SettingsView
+from src.views.export_dialog import ExportDialog
+from src.utils.db import init_database, get_engine
+from src.utils.background import BackgroundQueryExecutor
+from src.services.attachment_health import scan_attachments
+from src.services.backup import create_backup, backup_due
 from src.services.notification import notification
 from CTkMessagebox import CTkMessagebox
 
@@ -13,6 +24,16 @@ from CTkMessagebox import CTkMessagebox
 SIDEBAR_WIDTH = 200
 ICON_SIZE = 20
 
+# Background PDF file checks: engineers whose file changed are checked every interval,
+# all engineers every FULL_SCAN_EVERY scans (the first scan is a full one). The next
+# scan is scheduled when the previous one finished, so scans never overlap
+ATTACHMENT_SCAN_DELAY_MS = 2000
+ATTACHMENT_SCAN_INTERVAL_MS = 30 * 1000
+FULL_SCAN_EVERY = 20
+# Automatic backup check (a backup is taken when the newest one is older than a day)
+BACKUP_CHECK_DELAY_MS = 10 * 1000
+BACKUP_CHECK_INTERVAL_MS = 60 * 60 * 1000
+
 # Theme icons
 MOON_ICON = "🌙"
 SUN_ICON = "☀️"
@@ -37,7 +58,10 @@ class App(ctk.CTk):
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
-        self.session = init_database()
+        # Session factory: every page load, dialog and bulk operation opens its own short-lived session
+        self.session_factory = init_database()
+        # Pages other than Engineers, created on first visit: name -> frame
+        self.pages = {}
 
         # --- Sidebar ---
         self.sidebar = ctk.CTkFrame(self, width=SIDEBAR_WIDTH, corner_radius=0)
@@ -106,6 +130,7 @@ class App(ctk.CTk):
         toolbar.grid_columnconfigure(3, weight=0) # Select All Button
         toolbar.grid_columnconfigure(4, weight=0) # Clear Selection Button
         toolbar.grid_columnconfigure(5, weight=0) # Add Engineer Button
+        toolbar.grid_columnconfigure(6, weight=0) # Export Button
 
         # Theme toggle button
         self.is_dark_theme = True
@@ -116,10 +141,12 @@ class App(ctk.CTk):
         self.theme_button.grid(row=0, column=0, padx=(5, 10))
 
         # Search Entry
-        self.search_entry = ctk.CTkEntry(toolbar, placeholder_text="Enter value to filter by...", height=35)
+        self.search_entry = ctk.CTkEntry(toolbar, placeholder_text="Search engineers & careers (Enter), or pick a field to filter by...", height=35)
         self.search_entry.grid(row=0, column=1, sticky="ew", padx=(0, 10))
         # Removed KeyRelease binding - filtering triggered by dropdown change
         # self.search_entry.bind("<KeyRelease>", self.on_search)
+        # Enter runs a ranked full-text search (or re-applies the selected field filter)
+        self.search_entry.bind("<Return>", self.on_search_submit)
 
         # --- Filter Dropdown ---
         filter_options = ["Filter by...", "Company", "Technical Field", "Expertise", "Experience", "Rating", "Is PM"] # Add relevant filterable fields
@@ -152,13 +179,20 @@ class App(ctk.CTk):
         )
         add_button.grid(row=0, column=5, padx=(0, 5))
 
+        # Export button (selection or current filter result)
+        export_button = ctk.CTkButton(
+            toolbar, text="Export", command=self.export_engineers, height=35, font=("Arial Bold", 12), width=90
+        )
+        export_button.grid(row=0, column=6, padx=(0, 5))
+
         # --- Create engineer table ---
-        self.engineer_table = EngineerTable(self.content, self.session)
+        self.engineer_table = EngineerTable(self.content, self.session_factory)
         self.engineer_table.grid(row=1, column=0, sticky="nsew")
 
         # --- Create pagination frame ---
         pagination_frame = ctk.CTkFrame(self.content, fg_color="transparent")
         pagination_frame.grid(row=2, column=0, sticky="ew", pady=(10, 0)) # Reduced bottom padding
+        self.pagination_frame = pagination_frame # Kept to re-grid it after visiting other pages
         # Adjust weights for better centering/distribution if needed
         pagination_frame.grid_columnconfigure(0, weight=1) # Label spacer left
         pagination_frame.grid_columnconfigure(1, weight=0) # Label
@@ -196,35 +230,107 @@ class App(ctk.CTk):
         # Update pagination button states initially
         self.update_page_info(self.engineer_table.current_page, self.engineer_table.total_pages)
 
+        # PDF file checks run off the UI thread; the grid only reads their cached results
+        self.scan_executor = BackgroundQueryExecutor(self, self.session_factory, max_workers=1, name="attachment-scan")
+        self._scan_count = 0
+        self._full_scan_pending = True # Until a full scan has actually completed
+        self.backup_executor = BackgroundQueryExecutor(self, self.session_factory, max_workers=1, name="auto-backup")
+        self.after(ATTACHMENT_SCAN_DELAY_MS, self._scan_attachments)
+        self.after(BACKUP_CHECK_DELAY_MS, self._auto_backup)
+
+    # --- Attachment Health ---
+    def _scan_attachments(self):
+        full = self._full_scan_pending
+        self.scan_executor.submit("scan", lambda session: scan_attachments(session, only_unchecked=not full),
+                                  on_done=lambda stats: self._on_attachment_scan(stats, full),
+                                  on_error=lambda e: self._schedule_attachment_scan()) # A failed full scan stays pending
+
+    def _schedule_attachment_scan(self):
+        self.after(ATTACHMENT_SCAN_INTERVAL_MS, self._scan_attachments)
+
+    def _on_attachment_scan(self, stats, full):
+        if full: self._full_scan_pending = False
+        self._scan_count += 1
+        if self._scan_count % FULL_SCAN_EVERY == 0: self._full_scan_pending = True
+        self._schedule_attachment_scan()
+        if stats["changed"] and self.engineer_table.winfo_ismapped():
+            self.engineer_table.refresh_data()
+
+    # --- Automatic Backups ---
+    def _auto_backup(self):
+        """Takes a backup on the backup worker when the last one is a day old; the copy runs in small page steps."""
+        def run(session): # The backup opens its own connections; the worker session stays unused
+            if backup_due(): create_backup()
+        self.backup_executor.submit("backup", run, on_done=lambda _: self._schedule_auto_backup(),
+                                    on_error=self._on_auto_backup_error)
+
+    def _schedule_auto_backup(self):
+        self.after(BACKUP_CHECK_INTERVAL_MS, self._auto_backup)
+
+    def _on_auto_backup_error(self, error):
+        print(f"Automatic backup failed: {error}")
+        self._schedule_auto_backup()
 
     def on_nav_button_click(self, text):
         if text == "Engineers":
             self.show_engineers_page()
+        elif text in self.page_builders():
+            self.show_page(text)
         else:
             # Placeholder for other pages
             print(f"Navigate to {text} (not implemented)")
-            # Clear content or show placeholder frame for other pages
-            for widget in self.content.winfo_children():
-                 # Keep toolbar, hide/destroy others like table and pagination
-                 if isinstance(widget, EngineerTable) or widget == self.content.grid_slaves(row=2, column=0)[0]: # Find pagination frame better if needed
-                     widget.grid_forget()
-
+            self._hide_engineers_page()
+            self._hide_pages()
+
+    def page_builders(self):
+        """Factories for the pages reachable from the sidebar (besides Engineers)."""
+        return {
+            "Dashboard": lambda parent: DashboardView(parent, self.session_factory),
+            "Settings": lambda parent: SettingsView(parent, on_restore=self.engineer_table.refresh_data),
+            "Reports": lambda parent: ReportsView(parent, self.session_factory, get_selection=lambda: set(self.engineer_table.selected_rows)),
+            "Import Data": lambda parent: ImportView(parent, get_engine(), on_complete=self.engineer_table.refresh_data),
+            "Companies": lambda parent: CompaniesView(parent, self.session_factory),
+            "Projects": lambda parent: ProjectsView(parent, self.session_factory),
+            "Saved Combinations": lambda parent: SavedCombinationsView(parent, self.session_factory),
+        }
+
+    def show_page(self, name):
+        """Shows a sidebar page in the content area, creating it on first use."""
+        self._hide_engineers_page()
+        self._hide_pages()
+        page = self.pages.get(name)
+        if page is None:
+            page = self.page_builders()[name](self.content)
+            self.pages[name] = page
+        page.grid(row=1, column=0, rowspan=2, sticky="nsew")
+        if hasattr(page, "on_show"): page.on_show()
+
+    def _hide_pages(self):
+        for page in self.pages.values(): page.grid_forget()
+
+    def _hide_engineers_page(self):
+        # Keep toolbar, hide the table and the pagination frame
+        self.engineer_table.grid_forget()
+        self.pagination_frame.grid_forget()
 
     def show_engineers_page(self):
+        self._hide_pages()
         # Ensure table and pagination are visible
         self.engineer_table.grid(row=1, column=0, sticky="nsew")
-        # Find pagination frame and grid it back if forgotten
-        pagination_frame = self.content.grid_slaves(row=2, column=0)
-        if pagination_frame:
-            pagination_frame[0].grid(row=2, column=0, sticky="ew", pady=(10, 0))
+        # Grid the pagination frame back in case another page was shown
+        self.pagination_frame.grid(row=2, column=0, sticky="ew", pady=(10, 0))
         self.engineer_table.load_data()
 
 
     def add_engineer(self):
         # Pass self as parent for the dialog
-        dialog = EngineerDialog(self, self.session, on_save=self.engineer_table.load_data)
+        dialog = EngineerDialog(self, self.session_factory, on_save=self.engineer_table.refresh_data)
         dialog.grab_set() # Make dialog modal
 
+    def export_engineers(self):
+        ExportDialog(self, self.session_factory, selected_ids=self.engineer_table.get_selected_engineer_ids(),
+                     id_query=self.engineer_table.export_id_query())
+
     # Removed on_search as filtering is now driven by dropdown
     # def on_search(self, event):
     #     self.engineer_table.apply_filter(self.search_entry.get())
@@ -239,6 +345,14 @@ class App(ctk.CTk):
             # Apply filter for the selected field using the search term
             self.engineer_table.apply_specific_filter(selected_field, search_term)
 
+    def on_search_submit(self, event=None):
+        """Enter in the search box: full-text search, or field filter if a field is selected."""
+        selected_field = self.filter_var.get()
+        if selected_field == "Filter by...":
+            self.engineer_table.apply_search(self.search_entry.get())
+        else:
+            self.apply_app_filter(selected_field)
+
     def update_page_info(self, current_page, total_pages):
         self.page_label.configure(text=f"Page {current_page} of {total_pages}")
         # Enable/disable buttons based on page (assuming buttons are stored/accessible)
@@ -1,21 +1,23 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Boolean, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Boolean, Float, Index, func
 from sqlalchemy.orm import relationship
 from .base import Base
 
 class Engineer(Base):
     __tablename__ = 'engineers'
     id = Column(Integer, primary_key=True)
-    name = Column(String)
-    company_name = Column(String)
-    date_of_birth = Column(Date)
+    name = Column(String, index=True)
+    company_name = Column(String, index=True)
+    company_id = Column(Integer, ForeignKey('companies.id'), index=True) # Derived from company_name by triggers
+    date_of_birth = Column(Date, index=True)
     address = Column(String)
     position_and_rank = Column(String)
     responsible_technical_manager = Column(String)
     experience = Column(String)
-    field_name = Column(String)
-    evaluation_target = Column(String)
-    pdf_file = Column(String)
-    selected = Column(Boolean)
+    field_name = Column(String, index=True)
+    evaluation_target = Column(String, index=True)
+    pdf_file = Column(String)                        # Original file name (legacy rows: the path picked in the dialog)
+    attachment_id = Column(Integer, ForeignKey('attachments.id'), index=True) # Stored copy, see src/services/attachments.py
+    selected = Column(Boolean, index=True)
     technical_grades = relationship("TechnicalGrade", back_populates="engineer", cascade="all, delete-orphan")
     technical_qualifications = relationship("Qualification", back_populates="engineer", cascade="all, delete-orphan")
     education = relationship("Education", back_populates="engineer", cascade="all, delete-orphan")
@@ -32,7 +34,7 @@ class Engineer(Base):
 class TechnicalGrade(Base):
     __tablename__ = 'technical_grades'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     grade_type = Column(String)  # Job Field|Technical Sector, Specialized Field, etc.
     field = Column(String)       # Construction, Industry, Road and Airport, etc.
     grade = Column(String)       # Professional Engineer, etc.
@@ -41,7 +43,7 @@ class TechnicalGrade(Base):
 class Qualification(Base):
     __tablename__ = 'qualifications'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     title = Column(String)  # Type and Grade
     acquisition_date = Column(Date)  # Pass Date
     registration_number = Column(String)
@@ -50,7 +52,7 @@ class Qualification(Base):
 class Education(Base):
     __tablename__ = 'education'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     graduation_date = Column(Date)
     school_name = Column(String)
     major = Column(String)  # Department (Major)
@@ -60,39 +62,39 @@ class Education(Base):
 class TechnicalSectorParticipation(Base):
     __tablename__ = 'technical_sector_participation'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     technical_sector = Column(String)
-    participation_days = Column(String)
+    participation_days = Column(Integer)
     engineer = relationship("Engineer", back_populates="technical_sector_participation")
 
 class JobSectorParticipation(Base):
     __tablename__ = 'job_sector_participation'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     job = Column(String)
-    participation_days = Column(String)
+    participation_days = Column(Integer)
     engineer = relationship("Engineer", back_populates="job_sector_participation")
 
 class SpecializedFieldParticipation(Base):
     __tablename__ = 'specialized_field_participation'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     specialized_field = Column(String)
-    participation_days = Column(String)
+    participation_days = Column(Integer)
     engineer = relationship("Engineer", back_populates="specialized_field_participation")
 
 class ConstructionTypeParticipation(Base):
     __tablename__ = 'construction_type_participation'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     construction_type = Column(String)
-    participation_days = Column(String)
+    participation_days = Column(Integer)
     engineer = relationship("Engineer", back_populates="construction_type_participation")
 
 class EducationAndTraining(Base):
     __tablename__ = 'education_and_training'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     training_period = Column(String)
     course_name = Column(String)
     institution_name = Column(String)
@@ -103,7 +105,7 @@ class EducationAndTraining(Base):
 class Award(Base):
     __tablename__ = 'awards'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     date = Column(Date)
     type_and_basis = Column(String)
     awarding_institution = Column(String)
@@ -112,8 +114,8 @@ class Award(Base):
 class Sanction(Base):
     __tablename__ = 'sanctions'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
-    penalty_points = Column(String)
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
+    penalty_points = Column(Float)
     date = Column(Date)
     type = Column(String)
     sanction_period = Column(String)
@@ -124,18 +126,20 @@ class Sanction(Base):
 class Workplace(Base):
     __tablename__ = 'workplace'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     workplace_experience_period = Column(String)
     workplace_company_name = Column(String)
+    company_id = Column(Integer, ForeignKey('companies.id'), index=True) # Derived from workplace_company_name by triggers
     engineer = relationship("Engineer", back_populates="workplace")
 
 class ProjectDetail(Base):
     __tablename__ = 'project_details'
     id = Column(Integer, primary_key=True)
-    engineer_id = Column(Integer, ForeignKey('engineers.id'))
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), index=True)
     service_name = Column(String)
     project_type = Column(String)
     company_name = Column(String)
+    company_id = Column(Integer, ForeignKey('companies.id'), index=True) # Derived from company_name by triggers
     representative_contractor = Column(String)
     contract_number = Column(String)
     service_number = Column(String)
@@ -147,7 +151,7 @@ class ProjectDetail(Base):
     issuing_department = Column(String)
     contract_date = Column(Date)
     contract_period = Column(String)
-    contract_amount = Column(String)
+    contract_amount = Column(Integer) # Whole currency units
     performance = Column(String)
     participation_period = Column(String)
     participation_days = Column(Integer)
@@ -157,3 +161,89 @@ class ProjectDetail(Base):
     specialized_field = Column(String)
     position = Column(String)
     engineer = relationship("Engineer", back_populates="project_details")
+    # Projects page: ordering by contract date, grouping by contract number, typed filters
+    # (composite indexes end in contract_date so a scan for one filter value is already in page order;
+    # they don't hold the list columns, see src/services/projects.py)
+    __table_args__ = (
+        Index("ix_project_details_contract_date", "contract_date"),
+        Index("ix_project_details_contract_number_engineer_id", "contract_number", "engineer_id"),
+        Index("ix_project_details_client_contract_date", "client", "contract_date"),
+        Index("ix_project_details_construction_type_contract_date", "construction_type", "contract_date"),
+        Index("ix_project_details_technical_sector_contract_date", "technical_sector", "contract_date"),
+        Index("ix_project_details_equity_ratio", "equity_ratio"),
+    )
+
+class EngineerStats(Base):
+    """Per-engineer aggregates, maintained by SQLite triggers (see src/services/stats.py). Read-only for the app."""
+    __tablename__ = 'engineer_stats'
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), primary_key=True)
+    project_count = Column(Integer, nullable=False, server_default="0", index=True)
+    qualification_count = Column(Integer, nullable=False, server_default="0", index=True)
+    participation_days = Column(Integer, nullable=False, server_default="0", index=True) # Sum over the 4 participation tables
+    contract_amount = Column(Integer, nullable=False, server_default="0")
+    penalty_points = Column(Float, nullable=False, server_default="0")
+
+class EngineerVersion(Base):
+    """Row version per engineer, bumped by SQLite triggers on any change to it or its career rows (see src/utils/schema.py). Outlives a deleted engineer. Read-only for the app."""
+    __tablename__ = 'engineer_versions'
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), primary_key=True)
+    version = Column(Integer, nullable=False, server_default="1")
+
+class Attachment(Base):
+    """A file in the content-addressed attachment store (see src/services/attachments.py)."""
+    __tablename__ = 'attachments'
+    id = Column(Integer, primary_key=True)
+    sha256 = Column(String, nullable=False, unique=True, index=True)
+    size = Column(Integer, nullable=False)          # Bytes
+    extension = Column(String)                       # ".pdf"
+    original_name = Column(String)
+    created_at = Column(DateTime, server_default=func.current_timestamp())
+
+class AttachmentHealth(Base):
+    """Last check of an engineer's PDF file, written by the background scanner (see src/services/attachment_health.py). Read-only for the app."""
+    __tablename__ = 'attachment_health'
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), primary_key=True)
+    path = Column(String)
+    status = Column(String, index=True)              # ok, modified, external, missing
+    size = Column(Integer)
+    mtime = Column(Float)
+    checked_at = Column(DateTime)
+
+class Company(Base):
+    """One row per normalized company name, maintained by SQLite triggers (see src/services/companies.py). Read-only for the app."""
+    __tablename__ = 'companies'
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)            # First spelling seen
+    normalized_key = Column(String, nullable=False, unique=True, index=True)
+
+class SavedCombination(Base):
+    """A saved bid team and the requirements it was assembled for (see src/services/combinations.py)."""
+    __tablename__ = 'saved_combinations'
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    requirements = Column(String, nullable=False)    # JSON, see normalize_requirements()
+    created_at = Column(DateTime, server_default=func.current_timestamp())
+    # Result of the last evaluation; needs_evaluation is set by triggers when a member's records change
+    status = Column(String)                           # "meets" or "unmet"
+    missing = Column(String)                          # JSON list of unmet requirements
+    total_days = Column(Integer)
+    evaluated_at = Column(DateTime)
+    needs_evaluation = Column(Boolean, nullable=False, server_default="1", index=True)
+    members = relationship("SavedCombinationMember", back_populates="combination", cascade="all, delete-orphan")
+    departures = relationship("SavedCombinationDeparture", back_populates="combination", cascade="all, delete-orphan")
+
+class SavedCombinationMember(Base):
+    __tablename__ = 'saved_combination_members'
+    combination_id = Column(Integer, ForeignKey('saved_combinations.id'), primary_key=True)
+    engineer_id = Column(Integer, ForeignKey('engineers.id'), primary_key=True, index=True)
+    combination = relationship("SavedCombination", back_populates="members")
+
+class SavedCombinationDeparture(Base):
+    """A member whose engineer was deleted; moved here by the saved_combinations_engineers_ad trigger."""
+    __tablename__ = 'saved_combination_departures'
+    id = Column(Integer, primary_key=True)
+    combination_id = Column(Integer, ForeignKey('saved_combinations.id'), nullable=False, index=True)
+    engineer_id = Column(Integer, nullable=False)      # Old id, may have been reused since
+    name = Column(String)
+    departed_at = Column(DateTime, server_default=func.current_timestamp())
+    combination = relationship("SavedCombination", back_populates="departures")
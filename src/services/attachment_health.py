@@ -0,0 +1,128 @@
+"""
+Background health checks of engineer PDF files (the `attachment_health` table).
+
+The scanner resolves each engineer's file (its stored copy, or the legacy
+pdf_file path), stats the distinct paths of a batch in a thread pool and saves
+existence, size and mtime per engineer. Only rows whose result changed are
+written. The engineer grid reads the status from this table, so rendering never
+touches the filesystem.
+
+Statuses:
+    ok        the stored copy exists with the recorded size
+    modified  the stored copy exists but its size differs from the recorded one
+    external  a legacy path outside the store that exists (see "attachments adopt")
+    missing   the file does not exist or cannot be read
+
+Triggers drop an engineer's row when its pdf_file or attachment_id changes (or
+the engineer is deleted), so scan_attachments(only_unchecked=True) re-checks
+just those engineers.
+
+Scan from the command line with:
+    python -m src.services.attachment_health scan
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import select, or_
+from sqlalchemy.dialects.sqlite import insert
+from src.models.engineer import Engineer, Attachment, AttachmentHealth
+from src.services.attachments import stored_path, store_root
+
+
+SCAN_BATCH_SIZE = 1000
+SCAN_WORKERS = 16  # Stat calls are I/O bound (network shares); threads are enough
+
+
+def _stat(path):
+    """(exists, size, mtime) of a path; unreadable counts as missing."""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return False, None, None
+    return True, st.st_size, st.st_mtime
+
+
+def _resolve(row, root):
+    """(path, expected size or None, managed?) of an engineer's file."""
+    if row.sha256:
+        return stored_path(row.sha256, row.extension or "", root), row.size, True
+    return os.path.expanduser(row.pdf_file), None, False
+
+
+def _status(result, expected_size, managed):
+    exists, size, _ = result
+    if not exists: return "missing"
+    if not managed: return "external"
+    return "ok" if expected_size is None or size == expected_size else "modified"
+
+
+def scan_attachments(session, engineer_ids=None, only_unchecked=False, batch_size=SCAN_BATCH_SIZE,
+                     workers=SCAN_WORKERS, root=None, should_stop=None):
+    """
+    Checks engineers' files and updates attachment_health. Commits after every batch.
+
+    Args:
+        engineer_ids: Check these engineers only (default: every engineer with a file).
+        only_unchecked: Skip engineers that already have a health row.
+        should_stop: Optional callable checked between batches.
+    Returns a stats dict: checked, paths, changed, elapsed.
+    """
+    started = time.perf_counter()
+    root = root or store_root()
+    stats = {"checked": 0, "paths": 0, "changed": 0, "elapsed": 0.0}
+    stmt = (
+        select(Engineer.id, Engineer.pdf_file, Attachment.sha256, Attachment.extension, Attachment.size,
+               AttachmentHealth.path.label("checked_path"), AttachmentHealth.status, AttachmentHealth.size.label("checked_size"),
+               AttachmentHealth.mtime)
+        .outerjoin(Attachment, Attachment.id == Engineer.attachment_id)
+        .outerjoin(AttachmentHealth, AttachmentHealth.engineer_id == Engineer.id)
+        .where(or_(Engineer.attachment_id.isnot(None), Engineer.pdf_file.isnot(None) & (Engineer.pdf_file != "")))
+        .order_by(Engineer.id)
+    )
+    if engineer_ids is not None: stmt = stmt.where(Engineer.id.in_(list(engineer_ids)))
+    if only_unchecked: stmt = stmt.where(AttachmentHealth.engineer_id.is_(None))
+    # Read everything first: committing per batch must not invalidate an open cursor
+    rows = session.execute(stmt).all()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="attachment-stat") as pool:
+        for start in range(0, len(rows), batch_size):
+            batch = [(row, *_resolve(row, root)) for row in rows[start:start + batch_size]]
+            paths = sorted({path for _, path, _, _ in batch})
+            results = dict(zip(paths, pool.map(_stat, paths)))
+            now = datetime.now()
+            changed = []
+            for row, path, expected_size, managed in batch:
+                result = results[path]
+                status = _status(result, expected_size, managed)
+                values = {"path": path, "status": status, "size": result[1], "mtime": result[2]}
+                if (row.checked_path, row.status, row.checked_size, row.mtime) == (path, status, result[1], result[2]): continue
+                changed.append(dict(values, engineer_id=row.id, checked_at=now))
+            if changed:
+                upsert = insert(AttachmentHealth)
+                session.execute(upsert.on_conflict_do_update(
+                    index_elements=[AttachmentHealth.engineer_id],
+                    set_={c: upsert.excluded[c] for c in ("path", "status", "size", "mtime", "checked_at")},
+                ), changed)
+                session.commit()
+            stats["checked"] += len(batch)
+            stats["paths"] += len(paths)
+            stats["changed"] += len(changed)
+            if should_stop and should_stop(): break
+    stats["elapsed"] = time.perf_counter() - started
+    if stats["changed"]:
+        print(f"Attachment scan: {stats['checked']} engineers, {stats['paths']} files, {stats['changed']} changed in {stats['elapsed']:.1f}s")
+    return stats
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "scan":
+        print("Usage: python -m src.services.attachment_health scan")
+        sys.exit(1)
+    from src.utils.db import init_database
+    session = init_database()()
+    try:
+        result = scan_attachments(session)
+        print(f"Attachment scan: {result['checked']} engineers, {result['paths']} files, {result['changed']} changed in {result['elapsed']:.1f}s")
+    finally:
+        session.close()
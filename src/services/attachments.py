@@ -0,0 +1,168 @@
+"""
+Managed, content-addressed store for engineer PDF files.
+
+Importing a file copies it into the store directory (next to engineers.db) in
+one streaming pass that also computes its SHA-256, so large files are read
+once and never held in memory. The copy is named after its hash
+(attachments/ab/cd/abcd....pdf): the same file attached to several engineers
+is stored once, and a file already in the store is not written again.
+
+Each stored file has an `attachments` row with its hash, size and original
+name; engineers link to it through `attachment_id`. `pdf_file` keeps the
+original file name for display.
+
+Command line:
+    python -m src.services.attachments adopt   # import the files pdf_file still points to
+    python -m src.services.attachments prune   # delete stored files no engineer uses
+"""
+import hashlib
+import os
+import sys
+import tempfile
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from src.models.engineer import Engineer, Attachment
+
+
+STORE_DIRECTORY = "attachments"
+CHUNK_SIZE = 1024 * 1024
+
+
+def store_root():
+    """Absolute path of the store directory (next to the database file)."""
+    from src.utils.db import get_db_path
+    return os.path.join(os.path.dirname(get_db_path()), STORE_DIRECTORY)
+
+
+def stored_path(sha256, extension=".pdf", root=None):
+    """Where the file with this hash lives in the store."""
+    return os.path.join(root or store_root(), sha256[:2], sha256[2:4], sha256 + extension)
+
+
+def attachment_path(attachment, root=None):
+    return stored_path(attachment.sha256, attachment.extension or "", root)
+
+
+def _copy_hashed(source, root, progress=None):
+    """
+    Streams `source` into a temporary file in the store while hashing it.
+    Returns (sha256 hex, size, temporary path).
+    """
+    os.makedirs(root, exist_ok=True)
+    digest, size = hashlib.sha256(), 0
+    total = os.path.getsize(source)
+    fd, temp_path = tempfile.mkstemp(prefix=".import-", dir=root)
+    try:
+        with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk: break
+                digest.update(chunk)
+                dst.write(chunk)
+                size += len(chunk)
+                if progress: progress(size, total)
+            dst.flush()
+            os.fsync(dst.fileno())
+    except BaseException:
+        try: os.remove(temp_path)
+        except OSError: pass
+        raise
+    return digest.hexdigest(), size, temp_path
+
+
+def store_file(source, root=None, progress=None):
+    """
+    Copies a file into the store. Returns (sha256, size, extension, stored path).
+    A file with the same content already in the store is kept and the copy discarded.
+
+    Args:
+        progress: Optional callback(bytes_done, total_bytes) after every chunk.
+    """
+    root = root or store_root()
+    extension = os.path.splitext(source)[1].lower() or ""
+    sha256, size, temp_path = _copy_hashed(source, root, progress)
+    target = stored_path(sha256, extension, root)
+    if os.path.exists(target) and os.path.getsize(target) == size:
+        os.remove(temp_path) # Duplicate
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(temp_path, target)
+    return sha256, size, extension, target
+
+
+def import_attachment(session, source, root=None, progress=None):
+    """
+    Stores a file and returns its Attachment row (an existing one for known content). Caller commits.
+    Raises OSError if the file cannot be read.
+    """
+    sha256, size, extension, _ = store_file(source, root, progress)
+    attachment = session.execute(select(Attachment).where(Attachment.sha256 == sha256)).scalar_one_or_none()
+    if attachment is not None: return attachment
+    attachment = Attachment(sha256=sha256, size=size, extension=extension, original_name=os.path.basename(source))
+    try:
+        with session.begin_nested():
+            session.add(attachment)
+    except IntegrityError: # Imported concurrently by another session
+        attachment = session.execute(select(Attachment).where(Attachment.sha256 == sha256)).scalar_one()
+    return attachment
+
+
+# --- Maintenance ---
+
+def adopt_legacy_files(session, root=None):
+    """
+    Imports the files that engineers' pdf_file paths still point to and links them.
+    Returns (adopted, missing) counts. Commits after every file.
+    """
+    adopted = missing = 0
+    rows = session.execute(
+        select(Engineer.id, Engineer.pdf_file)
+        .where(Engineer.attachment_id.is_(None), Engineer.pdf_file.isnot(None), Engineer.pdf_file != "")
+    ).all()
+    for engineer_id, path in rows:
+        path = os.path.expanduser(path)
+        if not os.path.isfile(path):
+            missing += 1
+            continue
+        try: attachment = import_attachment(session, path, root)
+        except OSError as e:
+            print(f"Could not import '{path}' for engineer {engineer_id}: {e}")
+            missing += 1
+            continue
+        engineer = session.get(Engineer, engineer_id)
+        engineer.attachment_id = attachment.id
+        engineer.pdf_file = attachment.original_name
+        session.commit()
+        adopted += 1
+    return adopted, missing
+
+
+def prune_attachments(session, root=None):
+    """Deletes attachments (rows and files) that no engineer links to. Returns the number deleted. Commits."""
+    used = select(Engineer.attachment_id).where(Engineer.attachment_id.isnot(None))
+    unused = session.execute(select(Attachment).where(Attachment.id.not_in(used))).scalars().all()
+    for attachment in unused:
+        try: os.remove(attachment_path(attachment, root))
+        except FileNotFoundError: pass
+        session.delete(attachment)
+    session.commit()
+    return len(unused)
+
+
+if __name__ == "__main__":
+    commands = ("adopt", "prune")
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print("Usage: python -m src.services.attachments adopt|prune")
+        sys.exit(1)
+    from src.utils.db import init_database
+    session = init_database()()
+    try:
+        if sys.argv[1] == "adopt":
+            adopted, missing = adopt_legacy_files(session)
+            print(f"Attachments adopted: {adopted}, files not found: {missing}.")
+        else:
+            print(f"Unused attachments deleted: {prune_attachments(session)}.")
+        total = session.execute(select(func.count(), func.coalesce(func.sum(Attachment.size), 0))).one()
+        print(f"Store: {total[0]} files, {total[1]:,} bytes in {store_root()}")
+    finally:
+        session.close()
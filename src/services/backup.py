@@ -0,0 +1,279 @@
+"""
+Online backups of engineers.db.
+
+Backups use SQLite's online backup API, which copies the database page by page
+through a regular connection: the copy is always consistent, even while the app
+keeps writing (SQLite restarts the copy if the source changes between steps).
+Pages are copied in small steps with a pause in between, so writers are never
+locked out for long. Every backup is checked with PRAGMA integrity_check before
+it gets its final name, and old backups are rotated out:
+    * the newest BACKUP_KEEP_LAST backups are kept, plus
+    * the newest backup of each of the last BACKUP_KEEP_DAYS days.
+
+Restoring verifies the backup first, saves the current database as a
+"pre-restore" backup, then copies the backup into the live file with the same
+API, checks the result and upgrades it to the current schema.
+
+Command line:
+    python -m src.services.backup create|list
+    python -m src.services.backup verify|restore <file>
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+BACKUP_DIRECTORY = "backups"
+BACKUP_PREFIX = "engineers-"
+BACKUP_SUFFIX = ".db"
+BACKUP_PAGES_PER_STEP = 256   # 1 MiB per step with 4 KiB pages
+BACKUP_STEP_PAUSE = 0.01      # Seconds between steps, lets other connections write
+BACKUP_KEEP_LAST = 10
+BACKUP_KEEP_DAYS = 14
+BACKUP_INTERVAL = timedelta(hours=24)  # Automatic backups (see backup_due)
+
+# Only one backup or restore at a time
+_lock = threading.Lock()
+
+
+class BackupStopped(Exception):
+    """Raised when a backup is cancelled through should_stop."""
+
+
+def backup_root():
+    """Absolute path of the backup directory (next to the database file)."""
+    from src.utils.db import get_db_path
+    return os.path.join(os.path.dirname(get_db_path()), BACKUP_DIRECTORY)
+
+
+def _database_path():
+    from src.utils.db import get_db_path
+    return get_db_path()
+
+
+def _copy(source, target, pages, pause, progress, should_stop):
+    """Page-stepped copy between two sqlite3 connections."""
+    def step(status, remaining, total):
+        if progress: progress(total - remaining, total)
+        if should_stop and should_stop(): raise BackupStopped()
+    source.backup(target, pages=max(1, int(pages)), progress=step, sleep=pause)
+
+
+def integrity_check(path):
+    """
+    Runs PRAGMA integrity_check on a database file (opened read-only).
+    Returns (ok, messages, schema version); a file SQLite cannot read at all is not ok.
+    """
+    if not os.path.isfile(path): return False, [f"File not found: {path}"], None
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        messages = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+    except sqlite3.DatabaseError as e:
+        return False, [str(e)], None
+    finally:
+        conn.close()
+    return messages == ["ok"], messages, version
+
+
+def create_backup(db_path=None, directory=None, label=None, pages=BACKUP_PAGES_PER_STEP, pause=BACKUP_STEP_PAUSE,
+                  progress=None, should_stop=None, rotate=True):
+    """
+    Copies the database into a new, verified backup file and returns its path.
+
+    Args:
+        label: Optional tag added to the file name (e.g. "pre-restore").
+        progress: Optional callback(pages_done, pages_total) after every step (called on this thread).
+        should_stop: Optional callable checked after every step; True cancels (raises BackupStopped).
+        rotate: Delete backups the retention policy no longer keeps.
+    Raises RuntimeError if another backup is running or the copy fails its integrity check.
+    """
+    if not _lock.acquire(blocking=False):
+        raise RuntimeError("Another backup or restore is already running")
+    try:
+        return _create_backup(db_path or _database_path(), directory or backup_root(), label, pages, pause,
+                              progress, should_stop, rotate)
+    finally:
+        _lock.release()
+
+
+def _create_backup(db_path, directory, label, pages, pause, progress, should_stop, rotate):
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    name = f"{BACKUP_PREFIX}{stamp}" + (f"-{label}" if label else "")
+    path = os.path.join(directory, name + BACKUP_SUFFIX)
+    n = 1
+    while os.path.exists(path):
+        n += 1
+        path = os.path.join(directory, f"{name}-{n}{BACKUP_SUFFIX}")
+    partial = path + ".partial"
+    started = time.perf_counter()
+    source = sqlite3.connect(db_path, timeout=30)
+    target = sqlite3.connect(partial)
+    try:
+        _copy(source, target, pages, pause, progress, should_stop)
+        target.execute("PRAGMA journal_mode = DELETE") # Self-contained file, no -wal next to it
+    except BaseException:
+        target.close()
+        source.close()
+        _remove(partial)
+        raise
+    target.close()
+    source.close()
+    ok, messages, _ = integrity_check(partial)
+    if not ok:
+        _remove(partial)
+        raise RuntimeError(f"Backup failed its integrity check: {'; '.join(messages[:5])}")
+    os.replace(partial, path)
+    print(f"Backup written: {path} ({os.path.getsize(path):,} bytes in {time.perf_counter() - started:.1f}s)")
+    if rotate: rotate_backups(directory)
+    return path
+
+
+def _remove(path):
+    try: os.remove(path)
+    except FileNotFoundError: pass
+
+
+# --- Listing & Retention ---
+
+def _backup_time(file_name):
+    """Creation time encoded in a backup file name, or None for other files."""
+    if not (file_name.startswith(BACKUP_PREFIX) and file_name.endswith(BACKUP_SUFFIX)): return None
+    try: return datetime.strptime(file_name[len(BACKUP_PREFIX):len(BACKUP_PREFIX) + 15], "%Y%m%d-%H%M%S")
+    except ValueError: return None
+
+
+def list_backups(directory=None):
+    """Backups as dicts (path, name, created, size), newest first."""
+    directory = directory or backup_root()
+    if not os.path.isdir(directory): return []
+    backups = []
+    for file_name in os.listdir(directory):
+        created = _backup_time(file_name)
+        if created is None: continue
+        path = os.path.join(directory, file_name)
+        backups.append({"path": path, "name": file_name, "created": created, "size": os.path.getsize(path)})
+    backups.sort(key=lambda b: (b["created"], b["name"]), reverse=True)
+    return backups
+
+
+def backups_to_keep(backups, keep_last=BACKUP_KEEP_LAST, keep_days=BACKUP_KEEP_DAYS, now=None):
+    """Paths the retention policy keeps, for list_backups() output (newest first)."""
+    now = now or datetime.now()
+    keep = {b["path"] for b in backups[:keep_last]}
+    days = set()
+    for b in backups:
+        day = b["created"].date()
+        if day in days or now - b["created"] > timedelta(days=keep_days): continue
+        days.add(day)
+        keep.add(b["path"])
+    return keep
+
+
+def rotate_backups(directory=None, keep_last=BACKUP_KEEP_LAST, keep_days=BACKUP_KEEP_DAYS):
+    """Deletes the backups the retention policy no longer keeps. Returns the deleted paths."""
+    backups = list_backups(directory)
+    keep = backups_to_keep(backups, keep_last, keep_days)
+    deleted = []
+    for b in backups:
+        if b["path"] in keep: continue
+        try:
+            os.remove(b["path"])
+            deleted.append(b["path"])
+        except OSError as e:
+            print(f"Could not delete old backup {b['path']}: {e}")
+    return deleted
+
+
+def backup_due(directory=None, interval=BACKUP_INTERVAL):
+    """True if the newest backup is older than `interval` (or there is none)."""
+    backups = list_backups(directory)
+    return not backups or datetime.now() - backups[0]["created"] >= interval
+
+
+# --- Restore ---
+
+def restore_backup(path, engine=None, db_path=None, directory=None, progress=None):
+    """
+    Replaces the database contents with a backup.
+
+    The backup must pass PRAGMA integrity_check and not be newer than this version
+    of the app. The current database is saved as a "pre-restore" backup first. After
+    the copy, the live file is checked again and migrated to the current schema
+    (when `engine` is given). Returns the path of the pre-restore backup.
+
+    Args:
+        directory: Where the pre-restore backup goes (default: the backup directory).
+        progress: Optional callback(pages_done, pages_total) during the copy.
+    """
+    from src.utils.migrations import LATEST_VERSION
+    ok, messages, version = integrity_check(path)
+    if not ok: raise RuntimeError(f"Backup is damaged: {'; '.join(messages[:5])}")
+    if version > LATEST_VERSION:
+        raise RuntimeError(f"Backup was made by a newer version of the app (schema {version}, this app: {LATEST_VERSION})")
+    db_path = db_path or _database_path()
+    if not _lock.acquire(blocking=False):
+        raise RuntimeError("Another backup or restore is already running")
+    try:
+        safety = _create_backup(db_path, directory or backup_root(), "pre-restore", BACKUP_PAGES_PER_STEP,
+                                BACKUP_STEP_PAUSE, None, None, False)
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        target = sqlite3.connect(db_path, timeout=30)
+        try:
+            _copy(source, target, BACKUP_PAGES_PER_STEP, 0, progress, None)
+            messages = [row[0] for row in target.execute("PRAGMA integrity_check")]
+        finally:
+            source.close()
+            target.close()
+        if messages != ["ok"]:
+            raise RuntimeError(f"Restored database failed its integrity check ({'; '.join(messages[:5])}); "
+                               f"the previous database is saved as {safety}")
+    finally:
+        _lock.release()
+    if engine is not None: _upgrade(engine)
+    print(f"Restored {path} (previous database saved as {safety})")
+    return safety
+
+
+def _upgrade(engine):
+    """Brings a restored (possibly older) database to the current schema and drops stale caches."""
+    from src.models import Base
+    from src.utils.migrations import run_migrations
+    from src.utils.change_tracker import change_tracker
+    engine.dispose() # Pooled connections may hold pages cached before the restore
+    run_migrations(engine)
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        tables = [row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    change_tracker.mark_changed(*tables)
+
+
+if __name__ == "__main__":
+    commands = ("create", "list", "verify", "restore")
+    if len(sys.argv) < 2 or sys.argv[1] not in commands or (sys.argv[1] in ("verify", "restore") and len(sys.argv) < 3):
+        print("Usage: python -m src.services.backup create|list|verify <file>|restore <file>")
+        sys.exit(1)
+    command = sys.argv[1]
+    try:
+        if command == "create":
+            create_backup()
+        elif command == "list":
+            for b in list_backups():
+                print(f"{b['created']:%Y-%m-%d %H:%M:%S}  {b['size']:>14,}  {b['name']}")
+        elif command == "verify":
+            ok, messages, version = integrity_check(sys.argv[2])
+            print(f"{'OK' if ok else 'DAMAGED'} (schema version {version})")
+            for message in messages[:20]:
+                if not ok: print(f"  {message}")
+            sys.exit(0 if ok else 1)
+        else:
+            from src.utils.db import init_database, get_engine
+            init_database()
+            restore_backup(sys.argv[2], engine=get_engine())
+    except Exception:
+        traceback.print_exc()
+        sys.exit(1)
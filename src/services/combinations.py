@@ -0,0 +1,461 @@
+"""
+Bid team search and saved combinations.
+
+A team must, between its members, hold every required technical grade and
+qualification and reach the required participation days per technical sector.
+
+Every engineer is reduced to a capability profile: a bitset of the grades and
+qualifications it holds (one bit per distinct value in the database) and its
+day totals per technical sector. Profiles are built with one query per source
+table and cached until one of those tables changes.
+
+find_teams() is a branch-and-bound search over the profiles. Engineers that
+at least max_members other engineers dominate (same values or more, at least
+as many days) are dropped first, then team sizes are tried from the lower
+bound up. Each pass branches on
+the requirement with the fewest engineers able to meet it, excludes engineers
+already tried for it in sibling branches (so no team is visited twice) and
+prunes branches whose bound on members or days cannot beat the teams found so
+far. Teams rank by size, then by their total days in the required sectors.
+
+Saved combinations live in saved_combinations / saved_combination_members.
+Triggers flag a combination when a member's grades, qualifications or sector
+participation change; reevaluate_combinations() then re-checks only the
+flagged ones. Deleting an engineer moves its member rows to
+saved_combination_departures, so a new engineer reusing the id never joins
+the team.
+"""
+import bisect
+import json
+import math
+import time
+from datetime import datetime
+from sqlalchemy import select, func
+from src.models.engineer import (
+    Engineer, TechnicalGrade, Qualification, TechnicalSectorParticipation, SavedCombination, SavedCombinationMember,
+    SavedCombinationDeparture,
+)
+from src.utils.cache import ResultCache
+
+# Tables a capability profile is built from
+CAPABILITY_TABLES = ("engineers", "technical_grades", "qualifications", "technical_sector_participation")
+
+TEAM_RESULT_LIMIT = 10
+TEAM_TIME_LIMIT = 5.0   # Seconds; the best teams found so far are returned when it runs out
+MAX_TEAM_SIZE = 8
+
+_cache = ResultCache(max_entries=4)
+
+
+def _key(value):
+    """Comparison key for grade/qualification/sector names."""
+    return " ".join(str(value).split()).casefold() if value is not None else ""
+
+
+def normalize_requirements(requirements):
+    """
+    Validates a requirements dict and returns a normalized copy:
+        {"grades": [...], "qualifications": [...], "sector_days": {sector: days}, "max_members": n}
+    Raises ValueError if nothing is required or a value is invalid.
+    """
+    grades = [g.strip() for g in requirements.get("grades", []) if g and g.strip()]
+    qualifications = [q.strip() for q in requirements.get("qualifications", []) if q and q.strip()]
+    sector_days = {}
+    for sector, days in (requirements.get("sector_days") or {}).items():
+        if not sector or not str(sector).strip(): continue
+        try: days = int(days)
+        except (TypeError, ValueError): raise ValueError(f"Days for sector '{sector}' must be a whole number") from None
+        if days > 0: sector_days[str(sector).strip()] = days
+    try: max_members = int(requirements.get("max_members") or MAX_TEAM_SIZE)
+    except (TypeError, ValueError): raise ValueError("Maximum team size must be a whole number") from None
+    if max_members < 1: raise ValueError("Maximum team size must be at least 1")
+    if not (grades or qualifications or sector_days):
+        raise ValueError("Enter at least one required grade, qualification or sector")
+    return {"grades": grades, "qualifications": qualifications, "sector_days": sector_days, "max_members": max_members}
+
+
+def _required_tokens(req):
+    return [("grade", _key(g), g) for g in req["grades"]] + [("qualification", _key(q), q) for q in req["qualifications"]]
+
+
+# --- Capability Profiles ---
+
+def load_profiles(session, engineer_ids=None):
+    """
+    {engineer_id: (set of (kind, key) tokens, {sector key: days})} for all engineers or the given ones.
+    One query per source table.
+    """
+    def scoped(stmt, column):
+        return stmt.where(column.in_(engineer_ids)) if engineer_ids is not None else stmt
+
+    ids = session.execute(scoped(select(Engineer.id), Engineer.id)).scalars()
+    profiles = {engineer_id: (set(), {}) for engineer_id in ids}
+    grade_rows = session.execute(scoped(
+        select(TechnicalGrade.engineer_id, TechnicalGrade.grade).where(TechnicalGrade.grade.isnot(None)).distinct(),
+        TechnicalGrade.engineer_id))
+    for engineer_id, grade in grade_rows:
+        if engineer_id in profiles: profiles[engineer_id][0].add(("grade", _key(grade)))
+    qualification_rows = session.execute(scoped(
+        select(Qualification.engineer_id, Qualification.title).where(Qualification.title.isnot(None)).distinct(),
+        Qualification.engineer_id))
+    for engineer_id, title in qualification_rows:
+        if engineer_id in profiles: profiles[engineer_id][0].add(("qualification", _key(title)))
+    day_rows = session.execute(scoped(
+        select(TechnicalSectorParticipation.engineer_id, TechnicalSectorParticipation.technical_sector,
+               func.sum(TechnicalSectorParticipation.participation_days))
+        .where(TechnicalSectorParticipation.technical_sector.isnot(None))
+        .group_by(TechnicalSectorParticipation.engineer_id, TechnicalSectorParticipation.technical_sector),
+        TechnicalSectorParticipation.engineer_id))
+    for engineer_id, sector, days in day_rows:
+        if engineer_id in profiles and days:
+            sector_days = profiles[engineer_id][1]
+            sector_days[_key(sector)] = sector_days.get(_key(sector), 0) + int(days)
+    return profiles
+
+
+class CapabilityIndex:
+    """Capability bitsets of all engineers: bits[engineer_id] has bit vocabulary[token] set for every token held."""
+
+    def __init__(self, profiles):
+        self.vocabulary = {}
+        self.bits = {}
+        self.sector_days = {}
+        for engineer_id, (tokens, sector_days) in profiles.items():
+            bits = 0
+            for token in tokens:
+                bits |= 1 << self.vocabulary.setdefault(token, len(self.vocabulary))
+            self.bits[engineer_id] = bits
+            self.sector_days[engineer_id] = sector_days
+
+
+def capability_index(session):
+    """The cached CapabilityIndex, rebuilt after a write to any of CAPABILITY_TABLES."""
+    index = _cache.get("index", CAPABILITY_TABLES)
+    if index is None:
+        version = _cache.version(CAPABILITY_TABLES)
+        index = CapabilityIndex(load_profiles(session))
+        _cache.put("index", index, CAPABILITY_TABLES, version)
+    return index
+
+
+# --- Search ---
+
+class _TeamSearch:
+    """
+    Branch-and-bound over candidates: (engineer_id, requirement bits, days per required
+    sector capped at the need, uncapped days per required sector).
+    """
+
+    def __init__(self, candidates, mask, needs, max_members, limit, deadline, first_only=False):
+        self.candidates = candidates
+        self.mask = mask
+        self.needs = needs
+        self.max_members = max_members
+        self.limit = limit
+        self.deadline = deadline
+        self.first_only = first_only  # Stop at the first team (used to find the smallest team size)
+        self.nodes = 0
+        self.timed_out = False
+        self.best = []  # Sorted (size, -days, member ids), at most `limit` entries
+        self.size_cap = 0  # Team size searched in the current pass
+        self.max_total_days = max((sum(c[3]) for c in candidates), default=0)
+        # Most a single member can contribute, for the lower bound
+        self.max_bits = max((bin(c[1]).count("1") for c in candidates), default=0)
+        self.max_days = [max((c[2][s] for c in candidates), default=0) for s in range(len(needs))]
+        # Who can help with each requirement
+        self.bit_helpers = {
+            bit: [i for i, c in enumerate(candidates) if c[1] >> bit & 1]
+            for bit in range(mask.bit_length()) if mask >> bit & 1
+        }
+        self.day_helpers = [[i for i, c in enumerate(candidates) if c[2][s]] for s in range(len(needs))]
+
+    def _lower_bound(self, uncovered, deficits):
+        """Members still needed at least: by the best single bit count and by each sector's best day total."""
+        bound = 0
+        if uncovered:
+            if not self.max_bits: return math.inf
+            bound = math.ceil(bin(uncovered).count("1") / self.max_bits)
+        for s, deficit in enumerate(deficits):
+            if deficit > 0:
+                if not self.max_days[s]: return math.inf
+                bound = max(bound, math.ceil(deficit / self.max_days[s]))
+        return bound
+
+    def _full(self):
+        return len(self.best) >= self.limit
+
+    def _team_days(self, team):
+        return sum(sum(self.candidates[i][3]) for i in team)
+
+    def _record(self, team):
+        days = self._team_days(team)
+        if self._full() and (len(team), -days) >= self.best[-1][:2]: return
+        members = sorted(self.candidates[i][0] for i in team)
+        if any(entry[2] == members for entry in self.best): return # Seeded from the size probe
+        bisect.insort(self.best, (len(team), -days, members))
+        del self.best[self.limit:]
+
+    def run(self, min_size=1):
+        # Iterative deepening on the team size: every pass only records teams of exactly
+        # size_cap, and larger sizes are only searched while fewer than `limit` teams were found
+        first = self._lower_bound(self.mask, self.needs)
+        if first == math.inf: return []
+        for size in range(max(1, first, min_size), self.max_members + 1):
+            self.size_cap = size
+            self._search([], set(), 0, list(self.needs))
+            if self._full() or self.timed_out: break
+        return [{"engineer_ids": members, "size": size, "sector_days": -days} for size, days, members in self.best]
+
+    def _open_helpers(self, uncovered, deficits):
+        """Helper lists of the requirements not met yet."""
+        helpers = [h for bit, h in self.bit_helpers.items() if uncovered >> bit & 1]
+        return helpers + [h for s, h in enumerate(self.day_helpers) if deficits[s] > 0]
+
+    def _complete_with_one(self, team, excluded, uncovered, deficits):
+        """Last free slot: no further branching, just every candidate that closes all gaps at once."""
+        open_sectors = [(s, d) for s, d in enumerate(deficits) if d > 0]
+        # The last member must help with every open requirement, so the rarest one's helpers are enough
+        helpers = min(self._open_helpers(uncovered, deficits), key=len)
+        for i in helpers:
+            _, bits, days, _ = self.candidates[i]
+            if uncovered & ~bits or i in excluded or i in team: continue
+            if all(days[s] >= d for s, d in open_sectors):
+                team.append(i)
+                self._record(team)
+                team.pop()
+
+    def _search(self, team, excluded, covered, deficits):
+        self.nodes += 1
+        if self.nodes % 2000 == 0 and time.perf_counter() > self.deadline: self.timed_out = True
+        if self.timed_out or (self.first_only and self.best): return
+        uncovered = self.mask & ~covered
+        if not uncovered and all(d <= 0 for d in deficits):
+            if len(team) == self.size_cap: self._record(team) # Smaller teams were found by earlier passes
+            return
+        remaining = self.size_cap - len(team)
+        if self._lower_bound(uncovered, deficits) > remaining: return
+        if self._full() and self._team_days(team) + remaining * self.max_total_days <= -self.best[-1][1]:
+            return # Can't beat the worst team kept on days
+        if remaining == 1:
+            self._complete_with_one(team, excluded, uncovered, deficits)
+            return
+
+        # Branch on the open requirement with the fewest available helpers
+        options = None
+        for helpers in self._open_helpers(uncovered, deficits):
+            available = [i for i in helpers if i not in excluded and i not in team]
+            if options is None or len(available) < len(options): options = available
+        if not options: return
+
+        # Most helpful first: new bits, then share of the open day deficits covered
+        def gain(i):
+            _, bits, days, _ = self.candidates[i]
+            share = sum(min(days[s], d) / self.needs[s] for s, d in enumerate(deficits) if d > 0)
+            return (bin(bits & uncovered).count("1"), share)
+        options.sort(key=gain, reverse=True)
+
+        tried = []
+        for i in options:
+            _, bits, days, _ = self.candidates[i]
+            team.append(i)
+            self._search(team, excluded, covered | bits, [d - days[s] for s, d in enumerate(deficits)])
+            team.pop()
+            # Every team containing i was covered by this branch; siblings must not pick it again
+            excluded.add(i)
+            tried.append(i)
+            if self.timed_out: break
+        excluded.difference_update(tried)
+
+
+def _pareto(candidates, needed, by_total=False):
+    """
+    Drops candidates that at least `needed` kept candidates dominate: each holds every
+    required value the candidate holds and at least its capped days in every sector
+    (and, with by_total, at least its total days).
+
+    A dominator can only replace a member it isn't already teamed with (two engineers
+    may both be needed to reach a sector's days), and a team has at most max_members - 1
+    other members. needed=max_members leaves one dominator free to swap in, which is
+    enough to find the smallest team size. Ranking the best `limit` teams needs
+    max_members + limit - 1: then the swaps give `limit` distinct teams that rank
+    higher, so no team with the dropped candidate makes the list. With by_total an
+    equal profile only dominates when it has the lower id, so equals can't drop each other.
+    """
+    def measure(c): return c[2] + ((sum(c[3]),) if by_total else ())
+
+    def dominates(k, candidate):
+        if candidate[1] & ~k[1] or not all(a <= b for a, b in zip(measure(candidate), measure(k))): return False
+        if not by_total: return True
+        return k[1] != candidate[1] or measure(k) != measure(candidate) or k[0] < candidate[0]
+
+    kept = []
+    for candidate in sorted(candidates, key=lambda c: (-bin(c[1]).count("1"), -sum(measure(c)), c[0])):
+        dominators = 0
+        for k in kept:
+            if dominates(k, candidate):
+                dominators += 1
+                if dominators >= needed: break
+        if dominators < needed:
+            kept.append(candidate)
+    return kept
+
+
+def find_teams(session, requirements, limit=TEAM_RESULT_LIMIT, time_limit=TEAM_TIME_LIMIT, candidate_ids=None):
+    """
+    Finds the best teams for `requirements` (see normalize_requirements).
+
+    Args:
+        candidate_ids: Optional engineer ids to choose from (default: all engineers).
+    Returns a dict: teams (list of {engineer_ids, size, sector_days}), complete (False if the
+    time limit cut the search short), unavailable (required values nobody has), candidates,
+    nodes and elapsed seconds.
+    """
+    started = time.perf_counter()
+    req = normalize_requirements(requirements)
+    index = capability_index(session)
+    mask, unavailable = 0, []
+    for kind, key, label in _required_tokens(req):
+        bit = index.vocabulary.get((kind, key))
+        if bit is None: unavailable.append(f"{kind}: {label}")
+        else: mask |= 1 << bit
+    sectors = [_key(s) for s in req["sector_days"]]
+    needs = list(req["sector_days"].values())
+    result = {"teams": [], "complete": True, "unavailable": unavailable, "candidates": 0, "nodes": 0, "elapsed": 0.0}
+    if not unavailable:
+        # Candidates are engineers that help with at least one requirement; days are capped at the need
+        # (more days than needed can't help) but the uncapped total is kept for ranking
+        allowed = set(candidate_ids) if candidate_ids is not None else None
+        candidates = []
+        for engineer_id, bits in index.bits.items():
+            if allowed is not None and engineer_id not in allowed: continue
+            sector_days = index.sector_days[engineer_id]
+            days = tuple(min(sector_days.get(s, 0), need) for s, need in zip(sectors, needs))
+            if bits & mask or any(days):
+                candidates.append((engineer_id, bits & mask, days, tuple(sector_days.get(s, 0) for s in sectors)))
+        deadline = started + time_limit
+        # 1. Smallest team size, searched over the non-dominated candidates only
+        probe = _TeamSearch(_pareto(candidates, req["max_members"]), mask, needs, req["max_members"], 1, deadline, first_only=True)
+        probe.run()
+        nodes, timed_out = probe.nodes, probe.timed_out
+        if probe.best:
+            # 2. The best teams from that size up; dominated candidates could only form worse variants
+            ranked = _pareto(candidates, req["max_members"] + max(1, limit) - 1, by_total=True)
+            search = _TeamSearch(ranked, mask, needs, req["max_members"], max(1, limit), deadline)
+            search.best = list(probe.best)
+            result["teams"] = search.run(min_size=probe.best[0][0])
+            nodes, timed_out = nodes + search.nodes, search.timed_out
+        result["complete"] = not timed_out
+        result["candidates"] = len(candidates)
+        result["nodes"] = nodes
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+
+# --- Evaluation ---
+
+def evaluate_team(requirements, profiles, engineer_ids, departed=()):
+    """
+    Checks a team against requirements using load_profiles() output.
+    departed: names of members whose engineer was deleted (the team is unmet while there are any).
+    Returns {"status": "meets"|"unmet", "missing": [text, ...], "total_days": n}.
+    """
+    req = normalize_requirements(requirements)
+    members = [profiles[i] for i in engineer_ids if i in profiles]
+    tokens = set().union(*(tokens for tokens, _ in members)) if members else set()
+    missing = [f"Missing {kind}: {label}" for kind, key, label in _required_tokens(req) if (kind, key) not in tokens]
+    total_days = 0
+    for sector, need in req["sector_days"].items():
+        days = sum(sector_days.get(_key(sector), 0) for _, sector_days in members)
+        total_days += days
+        if days < need: missing.append(f"{sector}: {days:,} of {need:,} days")
+    gone = len(set(engineer_ids)) - len(members) + len(departed)
+    if gone: missing.append(f"{gone} member(s) no longer exist" + (": " + ", ".join(departed) if departed else ""))
+    if len(set(engineer_ids)) > req["max_members"]: missing.append(f"More than {req['max_members']} members")
+    return {"status": "unmet" if missing else "meets", "missing": missing, "total_days": total_days}
+
+
+def _apply_evaluation(combination, result):
+    combination.status = result["status"]
+    combination.missing = json.dumps(result["missing"], ensure_ascii=False)
+    combination.total_days = result["total_days"]
+    combination.evaluated_at = datetime.now()
+    combination.needs_evaluation = False
+
+
+def save_combination(session, name, requirements, engineer_ids):
+    """Saves a team (evaluated right away) and returns the new SavedCombination. Caller commits."""
+    name = (name or "").strip()
+    if not name: raise ValueError("Please enter a name for the combination")
+    req = normalize_requirements(requirements)
+    ids = sorted(set(engineer_ids))
+    if not ids: raise ValueError("A combination needs at least one engineer")
+    combination = SavedCombination(name=name, requirements=json.dumps(req, ensure_ascii=False),
+                                   members=[SavedCombinationMember(engineer_id=i) for i in ids])
+    _apply_evaluation(combination, evaluate_team(req, load_profiles(session, ids), ids))
+    session.add(combination)
+    return combination
+
+
+def _departed_names(session, combination_ids=None):
+    """{combination_id: ["Name (deleted)", ...]} for members whose engineer was deleted."""
+    stmt = select(SavedCombinationDeparture.combination_id, SavedCombinationDeparture.engineer_id, SavedCombinationDeparture.name)
+    if combination_ids is not None: stmt = stmt.where(SavedCombinationDeparture.combination_id.in_(combination_ids))
+    departed = {}
+    for combination_id, engineer_id, name in session.execute(stmt.order_by(SavedCombinationDeparture.id)):
+        departed.setdefault(combination_id, []).append(f"{name or '#' + str(engineer_id)} (deleted)")
+    return departed
+
+
+def reevaluate_combinations(session, combination_ids=None):
+    """
+    Re-checks the combinations flagged by the triggers (or the given ones, flagged or not)
+    with one batched profile load for all their members. Caller commits. Returns the count.
+    """
+    stmt = select(SavedCombination)
+    if combination_ids is None: stmt = stmt.where(SavedCombination.needs_evaluation == True)
+    else: stmt = stmt.where(SavedCombination.id.in_(combination_ids))
+    combinations = session.execute(stmt).scalars().all()
+    if not combinations: return 0
+    members = {}
+    rows = session.execute(
+        select(SavedCombinationMember.combination_id, SavedCombinationMember.engineer_id)
+        .where(SavedCombinationMember.combination_id.in_([c.id for c in combinations]))
+    )
+    for combination_id, engineer_id in rows:
+        members.setdefault(combination_id, []).append(engineer_id)
+    departed = _departed_names(session, [c.id for c in combinations])
+    profiles = load_profiles(session, sorted({i for ids in members.values() for i in ids}))
+    for combination in combinations:
+        _apply_evaluation(combination, evaluate_team(json.loads(combination.requirements), profiles,
+                                                     members.get(combination.id, []), departed.get(combination.id, [])))
+    return len(combinations)
+
+
+def list_combinations(session):
+    """All saved combinations, newest first, as dicts with member names (for the UI thread)."""
+    combinations = session.execute(select(SavedCombination).order_by(SavedCombination.id.desc())).scalars().all()
+    names = dict(session.execute(
+        select(SavedCombinationMember.engineer_id, Engineer.name)
+        .join(Engineer, Engineer.id == SavedCombinationMember.engineer_id)
+        .distinct()
+    ).all())
+    member_ids = {}
+    for combination_id, engineer_id in session.execute(select(SavedCombinationMember.combination_id, SavedCombinationMember.engineer_id)):
+        member_ids.setdefault(combination_id, []).append(engineer_id)
+    departed = _departed_names(session)
+    return [
+        {
+            "id": c.id, "name": c.name, "requirements": json.loads(c.requirements), "status": c.status,
+            "missing": json.loads(c.missing or "[]"), "total_days": c.total_days, "evaluated_at": c.evaluated_at,
+            "needs_evaluation": c.needs_evaluation,
+            "members": [(i, names.get(i, f"#{i} (deleted)")) for i in sorted(member_ids.get(c.id, []))]
+                       + [(None, name) for name in departed.get(c.id, [])],
+        }
+        for c in combinations
+    ]
+
+
+def delete_combination(session, combination_id):
+    """Deletes a saved combination and its member rows. Caller commits."""
+    combination = session.get(SavedCombination, combination_id)
+    if combination is not None: session.delete(combination)
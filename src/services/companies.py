@@ -0,0 +1,92 @@
+"""
+Company dimension (the `companies` table).
+
+Company names are free text in engineers.company_name, project_details.company_name
+and workplace.workplace_company_name. Each of those tables also has a company_id
+column pointing at one `companies` row per normalized name, so spelling variants
+("(주)한국건설", "한국건설 주식회사", "한국 건설") count as one company and grouping
+by company is an indexed integer join instead of a string scan.
+
+Triggers keep company_id in sync with the text columns for ORM writes, bulk SQL and
+imports alike; a company disappears once nothing references it. The text columns
+stay the source of truth, rebuild the table from them with:
+    python -m src.services.companies rebuild
+"""
+import sys
+from sqlalchemy import select, func, literal_column
+from src.models.engineer import Company, Engineer, ProjectDetail
+from src.utils.change_tracker import change_tracker
+from src.utils.schema import (
+    COMPANIES_TABLE, COMPANY_SOURCES, company_schema_statements, fill_companies, normalize_company_name,
+)
+
+COMPANY_SORTS = ("name", "engineers", "projects")
+
+
+def rebuild_companies(engine):
+    """Recomputes the companies from the text columns. Returns the number of companies."""
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        for statement in company_schema_statements():
+            conn.execute(statement)
+        fill_companies(conn)
+        raw.commit()
+        count = conn.execute(f"SELECT count(*) FROM {COMPANIES_TABLE}").fetchone()[0]
+    finally:
+        raw.close()
+    change_tracker.mark_changed(COMPANIES_TABLE, *COMPANY_SOURCES)
+    return count
+
+
+# --- Queries for the Companies page ---
+
+def _filtered(stmt, search):
+    key = normalize_company_name(search)
+    if key:
+        # Prefix match as a range on the unique index (keys compare as UTF-8 bytes)
+        stmt = stmt.where(Company.normalized_key >= key, Company.normalized_key < key + "\U0010ffff")
+    return stmt
+
+
+def count_companies(session, search=None):
+    return session.execute(_filtered(select(func.count()).select_from(Company), search)).scalar()
+
+
+def company_page(session, search=None, sort="name", rows_per_page=50, page=1, after_key=None):
+    """
+    One page of companies as Row(id, name, normalized_key, engineer_count, project_count).
+
+    The counts are correlated index-only lookups on company_id, so a page costs two
+    index probes per company. Sorting by name pages by keyset (pass the last row's
+    normalized_key as after_key); the count sorts page by offset.
+    """
+    if sort not in COMPANY_SORTS: raise ValueError(f"Unknown sort '{sort}'. Choose from: {', '.join(COMPANY_SORTS)}")
+    engineer_count = (
+        select(func.count()).select_from(Engineer).where(Engineer.company_id == Company.id).scalar_subquery()
+    )
+    project_count = (
+        select(func.count()).select_from(ProjectDetail).where(ProjectDetail.company_id == Company.id).scalar_subquery()
+    )
+    stmt = _filtered(
+        select(Company.id, Company.name, Company.normalized_key,
+               engineer_count.label("engineer_count"), project_count.label("project_count")),
+        search,
+    )
+    if sort == "name":
+        if after_key is not None: stmt = stmt.where(Company.normalized_key > after_key)
+        stmt = stmt.order_by(Company.normalized_key)
+    else:
+        stmt = stmt.order_by(literal_column(f"{sort[:-1]}_count").desc(), Company.normalized_key)
+        stmt = stmt.offset((max(1, page) - 1) * rows_per_page)
+    return session.execute(stmt.limit(rows_per_page)).all()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Usage: python -m src.services.companies rebuild")
+        sys.exit(1)
+    from src.utils.db import init_database, get_engine
+    init_database()
+    count = rebuild_companies(get_engine())
+    print(f"Companies rebuilt: {count} companies.")
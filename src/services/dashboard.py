@@ -0,0 +1,134 @@
+"""
+Dashboard figures. Every tile is computed by one GROUP BY query and cached until
+a write touches one of the tables it reads (see src/utils/change_tracker.py).
+"""
+from datetime import date
+from sqlalchemy import func, case, literal, select, desc
+from src.models.engineer import Engineer, Company, TechnicalGrade, Sanction, ProjectDetail
+from src.utils.cache import ResultCache
+
+TOP_ROWS = 8              # Rows shown per breakdown tile
+SANCTION_HORIZON_MONTHS = 6
+
+_cache = ResultCache()
+
+
+def _label(column):
+    """Groups empty and missing values together as "(none)"."""
+    return func.coalesce(func.nullif(func.trim(column), ""), "(none)")
+
+
+def _breakdown(session, column, count):
+    """[(label, count), ...] for one GROUP BY over `column`, largest first."""
+    label = _label(column)
+    stmt = select(label.label("label"), count.label("count")).group_by(label).order_by(desc("count"), "label")
+    return [(row.label, row.count) for row in session.execute(stmt)]
+
+
+def _top(rows, limit=TOP_ROWS):
+    """Keeps the first `limit` rows and folds the rest into "Other"."""
+    if len(rows) <= limit: return rows
+    return rows[:limit - 1] + [("Other", sum(r[1] for r in rows[limit - 1:]))]
+
+
+def headcount_by_company(session):
+    # Grouped on the indexed company_id, so spelling variants of a name count together
+    stmt = (
+        select(func.coalesce(Company.name, "(none)").label("label"), func.count(Engineer.id).label("count"))
+        .select_from(Engineer)
+        .outerjoin(Company, Company.id == Engineer.company_id)
+        .group_by(Engineer.company_id)
+        .order_by(desc("count"), "label")
+    )
+    rows = [(row.label, row.count) for row in session.execute(stmt)]
+    return {"rows": _top(rows), "total": sum(r[1] for r in rows)}
+
+
+def headcount_by_field(session):
+    rows = _breakdown(session, Engineer.field_name, func.count(Engineer.id))
+    return {"rows": _top(rows), "total": sum(r[1] for r in rows)}
+
+
+def headcount_by_grade(session):
+    # An engineer holding the same grade in several fields is counted once per grade
+    rows = _breakdown(session, TechnicalGrade.grade, func.count(func.distinct(TechnicalGrade.engineer_id)))
+    return {"rows": _top(rows), "total": sum(r[1] for r in rows)}
+
+
+def sanction_expiry_date():
+    """
+    SQL expression for the end of a sanction: its date plus sanction_period
+    ("6 months", "1 year", "90 days"; a bare number means days). NULL if unparseable.
+    """
+    period = func.trim(Sanction.sanction_period)
+    modifier = case(
+        (period.op("NOT GLOB")("*[^0-9]*"), literal("+") + period + literal(" days")),
+        else_=literal("+") + period,
+    )
+    return func.date(Sanction.date, modifier)
+
+
+def upcoming_sanction_expiries(session, today=None):
+    """Sanctions ending from today through the next SANCTION_HORIZON_MONTHS, counted per month."""
+    today = (today or date.today()).isoformat()
+    expiry = sanction_expiry_date()
+    month = func.strftime("%Y-%m", expiry)
+    stmt = (
+        select(month.label("month"), func.count().label("count"), func.count(func.distinct(Sanction.engineer_id)).label("engineers"))
+        .where(expiry >= today, expiry < func.date(today, f"+{SANCTION_HORIZON_MONTHS} months"))
+        .group_by(month)
+        .order_by(month)
+    )
+    rows = [(row.month, row.count, row.engineers) for row in session.execute(stmt)]
+    return {"rows": rows, "total": sum(r[1] for r in rows)}
+
+
+def project_totals(session):
+    """Projects per project type with contract amount and participation day sums."""
+    label = _label(ProjectDetail.project_type)
+    stmt = (
+        select(label.label("label"), func.count().label("count"),
+               func.coalesce(func.sum(ProjectDetail.contract_amount), 0).label("amount"),
+               func.coalesce(func.sum(ProjectDetail.participation_days), 0).label("days"))
+        .group_by(label)
+        .order_by(desc("count"), "label")
+    )
+    rows = [(row.label, row.count, row.amount, row.days) for row in session.execute(stmt)]
+    totals = {"projects": sum(r[1] for r in rows), "amount": sum(r[2] for r in rows), "days": sum(r[3] for r in rows)}
+    if len(rows) > TOP_ROWS:
+        rest = rows[TOP_ROWS - 1:]
+        rows = rows[:TOP_ROWS - 1] + [("Other", sum(r[1] for r in rest), sum(r[2] for r in rest), sum(r[3] for r in rest))]
+    return {"rows": rows, "total": totals["projects"], "totals": totals}
+
+
+# name -> (title, tables read, query function)
+DASHBOARD_TILES = {
+    "company": ("Engineers by Company", ("engineers", "companies"), headcount_by_company),
+    "field": ("Engineers by Technical Field", ("engineers",), headcount_by_field),
+    "grade": ("Engineers by Grade", ("technical_grades",), headcount_by_grade),
+    "sanctions": ("Upcoming Sanction Expiries", ("sanctions",), upcoming_sanction_expiries),
+    "projects": ("Project Totals", ("project_details",), project_totals),
+}
+
+
+def _tile_key(name):
+    # Expiries depend on today's date as well as on the data
+    return (name, date.today()) if name == "sanctions" else name
+
+
+def get_tile(session, name):
+    """Returns the result of a dashboard tile, from the cache while its tables are unchanged."""
+    _, tables, query = DASHBOARD_TILES[name]
+    key = _tile_key(name)
+    result = _cache.get(key, tables)
+    if result is None:
+        version = _cache.version(tables) # Read before querying so a racing write isn't cached
+        result = query(session)
+        _cache.put(key, result, tables, version)
+    return result
+
+
+def cached_tile(name):
+    """The cached result of a tile, or None if it has to be (re)computed."""
+    _, tables, _ = DASHBOARD_TILES[name]
+    return _cache.get(_tile_key(name), tables)
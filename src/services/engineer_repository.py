@@ -0,0 +1,228 @@
+"""
+Data access helpers for engineers shared by the views.
+
+Loading profiles name the relationships a screen needs and load them with
+selectinload: one query for the engineers plus one batched query per listed
+relationship, independent of how many engineers or child rows are involved.
+Relationships outside the profile keep their default lazy loading.
+"""
+from sqlalchemy import delete, select, func, and_, true
+from sqlalchemy.orm import selectinload
+from src.models.engineer import (
+    Engineer, TechnicalSectorParticipation, JobSectorParticipation, SpecializedFieldParticipation,
+    ConstructionTypeParticipation, Sanction, ProjectDetail, EngineerStats, AttachmentHealth
+)
+from src.utils.schema import STATS_COLUMNS
+from src.utils.change_tracker import CHANGED_ROWS_OPTION
+
+# Every one-to-many relationship on Engineer
+ALL_RELATIONSHIPS = (
+    "technical_grades", "technical_qualifications", "education", "technical_sector_participation",
+    "job_sector_participation", "specialized_field_participation", "construction_type_participation",
+    "education_and_training", "awards", "sanctions", "workplace", "project_details",
+)
+
+# Stays well below SQLite's bound-parameter limit (999 on older builds)
+DELETE_CHUNK_SIZE = 500
+
+# Per-engineer numeric totals computed in SQL: name -> summed child column
+NUMERIC_TOTALS = {
+    "technical_sector_days": TechnicalSectorParticipation.participation_days,
+    "job_sector_days": JobSectorParticipation.participation_days,
+    "specialized_field_days": SpecializedFieldParticipation.participation_days,
+    "construction_type_days": ConstructionTypeParticipation.participation_days,
+    "project_days": ProjectDetail.participation_days,
+    "penalty_points": Sanction.penalty_points,
+    "contract_amount": ProjectDetail.contract_amount,
+}
+
+LOAD_PROFILES = {
+    # Grid rows: scalar columns only
+    "summary": (),
+    # EngineerDialog edits every section
+    "edit": ALL_RELATIONSHIPS,
+    # EngineerDetailDialog sections
+    "detail": (
+        "technical_grades", "technical_qualifications", "education", "workplace", "education_and_training",
+        "technical_sector_participation", "job_sector_participation", "awards", "sanctions", "project_details",
+    ),
+    # Exports/reports that need the whole career graph
+    "full": ALL_RELATIONSHIPS,
+}
+
+
+def loading_options(profile):
+    """Returns the loader options for a named profile."""
+    if profile not in LOAD_PROFILES:
+        raise ValueError(f"Unknown loading profile '{profile}'. Choose from: {', '.join(LOAD_PROFILES)}")
+    return [selectinload(getattr(Engineer, name)) for name in LOAD_PROFILES[profile]]
+
+
+def get_engineer(session, engineer_id, profile="full"):
+    """Loads one engineer with the relationships of `profile` populated, or None if it doesn't exist."""
+    if engineer_id is None: return None
+    return (
+        session.query(Engineer)
+        .options(*loading_options(profile))
+        .filter(Engineer.id == engineer_id)
+        .one_or_none()
+    )
+
+
+def get_engineers(session, engineer_ids, profile="full"):
+    """Loads several engineers (ordered by id) with the relationships of `profile` populated."""
+    ids = [i for i in engineer_ids if i is not None]
+    if not ids: return []
+    return (
+        session.query(Engineer)
+        .options(*loading_options(profile))
+        .filter(Engineer.id.in_(ids))
+        .order_by(Engineer.id)
+        .all()
+    )
+
+
+def engineer_field(field):
+    """
+    Resolves a grid db_field to a column: an Engineer column, an aggregate from
+    engineer_stats (project_count, participation_days, ...) or a cached file check
+    (attachment_status). None if unknown.
+    """
+    if field in STATS_FIELDS: return getattr(EngineerStats, field)
+    if field in HEALTH_FIELDS: return HEALTH_FIELDS[field]
+    attr = getattr(Engineer, field, None)
+    return attr if hasattr(attr, "property") and hasattr(attr, "type") else None
+
+
+# Aggregates served from engineer_stats
+STATS_FIELDS = tuple(name for name, _ in STATS_COLUMNS)
+# Served from attachment_health (filled by the background scanner). Labelled with the grid field
+# name, so projected rows expose row.attachment_status (and keyset boundaries read the same key)
+HEALTH_FIELDS = {"attachment_status": AttachmentHealth.status.label("attachment_status")}
+
+
+def grid_fields(columns, visibility, extra=()):
+    """
+    The engineer columns a grid needs: `id` plus every visible column's db_field
+    (and any `extra` fields, e.g. the sort column for keyset boundaries).
+    """
+    fields = ["id"]
+    wanted = [c.get("db_field") for c in columns if visibility.get(c["name"], True)] + list(extra)
+    for field in wanted:
+        if field and field not in fields and engineer_field(field) is not None:
+            fields.append(field)
+    return tuple(fields)
+
+
+def project_engineers(session, fields):
+    """
+    Query selecting only `fields` from engineers (and engineer_stats, attachment_health).
+
+    Rows are plain Row tuples with attribute access (row.id, row.name, ...):
+    no identity map, no change tracking, no relationship proxies. Load an ORM
+    instance with get_engineer() when a row is opened for editing.
+
+    engineer_stats and attachment_health are always LEFT JOINed on their primary
+    key, so filters and sorts on them work even when the column isn't selected;
+    SQLite drops a join from the plan when none of its columns is used.
+    """
+    return (
+        session.query(*[engineer_field(field) for field in fields])
+        .select_from(Engineer)
+        .outerjoin(EngineerStats, EngineerStats.engineer_id == Engineer.id)
+        .outerjoin(AttachmentHealth, AttachmentHealth.engineer_id == Engineer.id)
+    )
+
+
+def delete_engineers(session, engineer_ids, chunk_size=DELETE_CHUNK_SIZE):
+    """
+    Set-based delete of engineers and all their child rows.
+
+    Issues chunked DELETE ... WHERE engineer_id IN (...) statements instead of
+    loading every child through the ORM cascade. Runs in the caller's
+    transaction (use session_scope); nothing is committed here.
+    Returns {table name: rows deleted}, including "engineers".
+    """
+    ids = sorted({i for i in engineer_ids if isinstance(i, int)})
+    # Engineers go first: the search index triggers on child tables then find no
+    # engineer to re-index, so each child delete stays cheap. Foreign keys are not
+    # enforced and both steps share one transaction, so no orphan is ever visible.
+    tables = [Engineer.__table__] + [rel.mapper.local_table for name, rel in Engineer.__mapper__.relationships.items()
+                                     if name in ALL_RELATIONSHIPS]
+    counts = {table.name: 0 for table in tables}
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        for table in tables:
+            key = table.c.id if table is Engineer.__table__ else table.c.engineer_id
+            # changed_rows names the engineers, so caches drop only the pages that showed them
+            result = session.execute(delete(table).where(key.in_(chunk)),
+                                     execution_options={"synchronize_session": False, CHANGED_ROWS_OPTION: chunk})
+            counts[table.name] += result.rowcount or 0
+    return counts
+
+
+# --- Numeric Totals & Range Filters ---
+def _total_column(name):
+    if name not in NUMERIC_TOTALS:
+        raise ValueError(f"Unknown total '{name}'. Choose from: {', '.join(NUMERIC_TOTALS)}")
+    return NUMERIC_TOTALS[name]
+
+
+def engineer_totals(session, engineer_ids=None, totals=None):
+    """
+    Sums numeric career columns per engineer in SQL.
+
+    Args:
+        engineer_ids: Restrict to these engineers (None = all engineers with data).
+        totals: NUMERIC_TOTALS names to compute (default: all).
+    Returns {engineer_id: {total name: value}}; missing data counts as 0.
+    """
+    names = list(totals or NUMERIC_TOTALS)
+    ids = None if engineer_ids is None else list(engineer_ids)
+    result = {}
+    for name in names:
+        column = _total_column(name)
+        owner = column.class_.engineer_id
+        stmt = select(owner, func.coalesce(func.sum(column), 0)).group_by(owner)
+        if ids is not None:
+            if not ids: break
+            stmt = stmt.where(owner.in_(ids))
+        for engineer_id, total in session.execute(stmt):
+            result.setdefault(engineer_id, {n: 0 for n in names})[name] = total
+    if ids is not None:
+        for engineer_id in ids: result.setdefault(engineer_id, {n: 0 for n in names})
+    return result
+
+
+def grand_total(name, session, engineer_ids=None):
+    """Sum of one NUMERIC_TOTALS column over all (or the given) engineers."""
+    column = _total_column(name)
+    stmt = select(func.coalesce(func.sum(column), 0))
+    if engineer_ids is not None: stmt = stmt.where(column.class_.engineer_id.in_(list(engineer_ids)))
+    return session.execute(stmt).scalar()
+
+
+def total_in_range(name, minimum=None, maximum=None):
+    """
+    Filter clause on Engineer: engineers whose total `name` lies within [minimum, maximum].
+    Engineers without any rows count as 0. Use with query.filter(...).
+    """
+    column = _total_column(name)
+    owner = column.class_.engineer_id
+    # Correlated per-engineer sum: uses the engineer_id index of the child table
+    value = select(func.coalesce(func.sum(column), 0)).where(owner == Engineer.id).scalar_subquery()
+    clauses = []
+    if minimum is not None: clauses.append(value >= minimum)
+    if maximum is not None: clauses.append(value <= maximum)
+    return and_(*clauses) if clauses else true()
+
+
+def project_details_in_range(session, min_amount=None, max_amount=None, min_days=None, max_days=None, engineer_id=None):
+    """Query of ProjectDetail rows filtered by contract amount / participation days ranges (bounds inclusive)."""
+    query = session.query(ProjectDetail)
+    if engineer_id is not None: query = query.filter(ProjectDetail.engineer_id == engineer_id)
+    if min_amount is not None: query = query.filter(ProjectDetail.contract_amount >= min_amount)
+    if max_amount is not None: query = query.filter(ProjectDetail.contract_amount <= max_amount)
+    if min_days is not None: query = query.filter(ProjectDetail.participation_days >= min_days)
+    if max_days is not None: query = query.filter(ProjectDetail.participation_days <= max_days)
+    return query
@@ -0,0 +1,185 @@
+"""
+Streaming export of engineers with their full career graph.
+
+Formats (both can be read back by src/services/importer.py):
+  * jsonl - one file, one engineer per line with career records nested under
+    their relationship name ("project_details": [...]).
+  * csv   - a directory with engineers.csv plus one <table>.csv per child table
+    (child rows carry engineer_id).
+
+Engineer ids are exported as references only: the importer keeps them when they
+are free and renumbers them otherwise (import_id_map links the child CSV files
+of the same directory to the new ids), so an export can be imported into any
+database, including the one it came from. Import engineers.csv before the
+child tables.
+
+Engineers are streamed from a single cursor with yield_per and handled in
+batches; the child rows of each batch are fetched with one query per child
+table. Only one batch is held in memory, whatever the number of engineers.
+"""
+import csv
+import json
+import os
+import time
+import traceback
+from datetime import date, datetime
+from sqlalchemy import select, func
+from src.models.engineer import Engineer
+from src.services.importer import CHILD_MODELS, LOCAL_COLUMNS
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_FORMATS = ("jsonl", "csv")
+
+# Child tables by relationship name (the key used in JSONL documents)
+_CHILD_TABLES = {
+    name: rel.mapper.local_table
+    for name, rel in Engineer.__mapper__.relationships.items()
+    if rel.mapper.class_ in CHILD_MODELS
+}
+
+
+def _exported_columns(table):
+    # company_id and attachment_id are local to this database; the importer derives company_id from the name again
+    return [c for c in table.columns if c.name not in LOCAL_COLUMNS]
+
+
+def _json_value(value):
+    if isinstance(value, (date, datetime)): return value.isoformat()
+    return value
+
+
+def _engineer_batches(session, batch_size, engineer_ids=None, id_query=None):
+    """Yields lists of engineer row mappings, ordered by id."""
+    table = Engineer.__table__
+    if engineer_ids is not None:
+        # Explicit selection: chunked IN lists (stays below SQLite's parameter limit)
+        ids = sorted(set(engineer_ids))
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            yield session.execute(select(*_exported_columns(table)).where(table.c.id.in_(chunk)).order_by(table.c.id)).mappings().all()
+        return
+    stmt = select(*_exported_columns(table)).order_by(table.c.id)
+    if id_query is not None:
+        ids = id_query(session).subquery()
+        stmt = stmt.where(table.c.id.in_(select(list(ids.c)[0])))
+    result = session.execute(stmt.execution_options(yield_per=batch_size)).mappings()
+    for partition in result.partitions():
+        yield partition
+
+
+def _count(session, engineer_ids=None, id_query=None):
+    if engineer_ids is not None: return len(set(engineer_ids))
+    if id_query is None: return session.execute(select(func.count()).select_from(Engineer.__table__)).scalar()
+    return session.execute(select(func.count()).select_from(id_query(session).subquery())).scalar()
+
+
+def _children(session, engineer_ids):
+    """{relationship name: {engineer_id: [row mapping, ...]}} for one batch of engineers."""
+    children = {}
+    for name, table in _CHILD_TABLES.items():
+        by_engineer = {}
+        rows = session.execute(
+            select(*_exported_columns(table)).where(table.c.engineer_id.in_(engineer_ids)).order_by(table.c.engineer_id, table.c.id)
+        ).mappings()
+        for row in rows:
+            by_engineer.setdefault(row["engineer_id"], []).append(row)
+        children[name] = by_engineer
+    return children
+
+
+class _JsonlWriter:
+    def __init__(self, path):
+        self.f = open(path, "w", encoding="utf-8", newline="\n")
+
+    def write(self, engineers, children):
+        rows = 0
+        for engineer in engineers:
+            doc = {k: _json_value(v) for k, v in engineer.items()}
+            for name, by_engineer in children.items():
+                items = by_engineer.get(engineer["id"], [])
+                doc[name] = [{k: _json_value(v) for k, v in item.items() if k not in ("id", "engineer_id")} for item in items]
+                rows += len(items)
+            self.f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+        return rows + len(engineers)
+
+    def close(self):
+        self.f.close()
+
+
+class _CsvWriter:
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.files, self.writers = [], {}
+        tables = {"engineers": Engineer.__table__}
+        tables.update(_CHILD_TABLES)
+        for name, table in tables.items():
+            f = open(os.path.join(directory, f"{table.name}.csv"), "w", encoding="utf-8", newline="")
+            writer = csv.writer(f)
+            columns = [c.name for c in _exported_columns(table)]
+            writer.writerow(columns)
+            self.files.append(f)
+            self.writers[name] = (writer, columns)
+
+    def write(self, engineers, children):
+        writer, columns = self.writers["engineers"]
+        writer.writerows([[_json_value(e[c]) for c in columns] for e in engineers])
+        rows = len(engineers)
+        for name, by_engineer in children.items():
+            writer, columns = self.writers[name]
+            for items in by_engineer.values():
+                writer.writerows([[_json_value(item[c]) for c in columns] for item in items])
+                rows += len(items)
+        return rows
+
+    def close(self):
+        for f in self.files: f.close()
+
+
+def export_engineers(session_factory, path, fmt="jsonl", engineer_ids=None, id_query=None,
+                     batch_size=EXPORT_BATCH_SIZE, progress=None, should_stop=None):
+    """
+    Exports engineers and all their career records.
+
+    Args:
+        session_factory: sessionmaker; the export uses one session (one consistent read transaction).
+        path: Target file (jsonl) or directory (csv).
+        fmt: "jsonl" or "csv".
+        engineer_ids: Export exactly these engineers (e.g. the table selection), or
+        id_query: callable(session) returning a query of engineer ids (e.g. the current table filter).
+            Without either, every engineer is exported.
+        progress: Optional callback(stats) after every batch (called on the exporting thread).
+        should_stop: Optional callable checked between batches; True stops the export.
+
+    Returns a stats dict: status, engineers, total, rows, elapsed, engineers_per_sec, path.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(EXPORT_FORMATS)}")
+    batch_size = max(1, int(batch_size))
+    stats = {"status": "running", "engineers": 0, "total": 0, "rows": 0, "elapsed": 0.0, "engineers_per_sec": 0.0, "path": path}
+    started = time.perf_counter()
+    session = session_factory()
+    writer = None
+    try:
+        stats["total"] = _count(session, engineer_ids, id_query)
+        writer = _JsonlWriter(path) if fmt == "jsonl" else _CsvWriter(path)
+        for engineers in _engineer_batches(session, batch_size, engineer_ids, id_query):
+            if not engineers: continue
+            children = _children(session, [e["id"] for e in engineers])
+            stats["rows"] += writer.write(engineers, children)
+            stats["engineers"] += len(engineers)
+            stats["elapsed"] = time.perf_counter() - started
+            if stats["elapsed"] > 0: stats["engineers_per_sec"] = stats["engineers"] / stats["elapsed"]
+            if progress: progress(dict(stats))
+            if should_stop and should_stop():
+                stats["status"] = "stopped"
+                break
+        if stats["status"] == "running": stats["status"] = "done"
+        stats["elapsed"] = time.perf_counter() - started
+        print(f"Export {stats['status']}: {stats['engineers']} engineers, {stats['rows']} rows in {stats['elapsed']:.1f}s -> {path}")
+        return stats
+    except Exception:
+        traceback.print_exc()
+        raise
+    finally:
+        if writer is not None: writer.close()
+        session.close()
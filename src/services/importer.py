@@ -0,0 +1,440 @@
+"""
+Streaming bulk import of engineers and their career records.
+
+Supported inputs:
+  * JSONL - one engineer per line. Engineer columns at the top level, child
+    records as lists under the relationship or table name, e.g.
+    {"name": "...", "company_name": "...", "project_details": [{"service_name": "..."}]}
+  * CSV   - one table per file, header row = column names. The table is taken
+    from the file name (engineers.csv, project_details.csv, ...) unless given.
+    Child tables need an engineer_id column.
+
+Files are read as a stream and written in batches: every batch is one
+transaction with one executemany per table. The job's progress
+(import_jobs.records_committed) is advanced in that same transaction, so after
+a crash or a stop the next run of the same file skips exactly the committed
+records. Records with unparseable values, and child rows whose engineer does
+not exist, are rejected and reported, they don't abort the import.
+
+Engineer ids in a file keep their value when it is free; an id already taken
+(e.g. an export imported back into the same database) gets a new one. The
+mapping is kept per source directory in import_id_map, so a CSV child table
+next to engineers.csv follows its engineer; other engineer_id values must
+name an existing engineer.
+
+The search index is deferred for the whole import (see
+src/utils/schema.py:defer_search_index) and caught up once at the end.
+
+Command line:
+    python -m src.services.importer engineers.jsonl [--table T] [--batch-size N] [--restart]
+"""
+import csv
+import json
+import os
+import time
+import traceback
+from datetime import date, datetime
+from sqlalchemy import Boolean, Date, Float, Integer
+from src.models.engineer import (
+    Engineer, TechnicalGrade, Qualification, Education, TechnicalSectorParticipation,
+    JobSectorParticipation, SpecializedFieldParticipation, ConstructionTypeParticipation,
+    EducationAndTraining, Award, Sanction, Workplace, ProjectDetail
+)
+from src.utils.schema import (
+    COMPANY_ID_COLUMN, ATTACHMENT_ID_COLUMN, FTS_TABLE, defer_search_index, resume_search_index,
+)
+from src.utils.change_tracker import change_tracker
+from src.utils.numbers import parse_number
+
+IMPORT_BATCH_SIZE = 500
+# Ids local to one database: company_id is filled in by the company triggers from the company name,
+# stored attachments are not part of an import
+LOCAL_COLUMNS = (COMPANY_ID_COLUMN, ATTACHMENT_ID_COLUMN)
+MAX_REPORTED_ERRORS = 50
+ID_CHUNK_SIZE = 500
+
+CHILD_MODELS = (
+    TechnicalGrade, Qualification, Education, TechnicalSectorParticipation, JobSectorParticipation,
+    SpecializedFieldParticipation, ConstructionTypeParticipation, EducationAndTraining, Award, Sanction,
+    Workplace, ProjectDetail,
+)
+TABLE_MODELS = {model.__tablename__: model for model in (Engineer,) + CHILD_MODELS}
+
+# JSONL documents may nest children under the relationship name or the table name
+_CHILD_KEYS = {model.__tablename__: model.__tablename__ for model in CHILD_MODELS}
+_CHILD_KEYS.update({name: rel.mapper.local_table.name for name, rel in Engineer.__mapper__.relationships.items()})
+
+
+# --- Value Conversion ---
+def _to_date(value):
+    if isinstance(value, datetime): return value.date().isoformat()
+    if isinstance(value, date): return value.isoformat()
+    return date.fromisoformat(str(value).strip()[:10]).isoformat()
+
+
+def _to_bool(value):
+    if isinstance(value, bool): return int(value)
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "y"): return 1
+    if text in ("0", "false", "no", "n"): return 0
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _converter(column):
+    if isinstance(column.type, Date): return _to_date
+    if isinstance(column.type, Boolean): return _to_bool
+    if isinstance(column.type, Integer): return lambda v: parse_number(v, integer=True)
+    if isinstance(column.type, Float): return lambda v: parse_number(v)
+    return lambda v: v if isinstance(v, str) else str(v)
+
+
+class _TableWriter:
+    """Converts records for one table and inserts them with a single executemany."""
+
+    def __init__(self, model):
+        self.table = model.__table__
+        self.name = self.table.name
+        self.columns = [c.name for c in self.table.columns if c.name not in LOCAL_COLUMNS]
+        self.converters = {c.name: _converter(c) for c in self.table.columns if c.name not in LOCAL_COLUMNS}
+        self.rows = []
+        self._warned = set()
+
+    def convert(self, record):
+        """Returns {column: db value} for a record; raises ValueError on bad values."""
+        values = {}
+        for key, raw in record.items():
+            if key not in self.converters:
+                if key in LOCAL_COLUMNS: continue # Exported files may carry them, ids differ between databases
+                if key not in self._warned:
+                    print(f"Import: ignoring unknown column '{key}' for table '{self.name}'")
+                    self._warned.add(key)
+                continue
+            if raw is None or (isinstance(raw, str) and raw.strip() == ""): continue
+            try: values[key] = self.converters[key](raw)
+            except (TypeError, ValueError) as e: raise ValueError(f"{self.name}.{key}: {e}") from None
+        return values
+
+    def add(self, values):
+        self.rows.append(tuple(values.get(c) for c in self.columns))
+
+    def flush(self, conn):
+        if not self.rows: return 0
+        marks = ", ".join("?" * len(self.columns))
+        conn.executemany(f"INSERT INTO {self.name} ({', '.join(self.columns)}) VALUES ({marks})", self.rows)
+        count = len(self.rows)
+        self.rows = []
+        return count
+
+
+# --- Readers ---
+def _counting_lines(f, counter):
+    """Yields the lines of a text file while counting the bytes read (for progress)."""
+    for line in f:
+        counter[0] += len(line.encode("utf-8"))
+        yield line
+
+
+def _read_jsonl(f, counter):
+    for line_no, line in enumerate(_counting_lines(f, counter), start=1):
+        if not line.strip(): continue
+        try: yield line_no, json.loads(line)
+        except json.JSONDecodeError as e: yield line_no, ValueError(f"invalid JSON: {e}")
+
+
+def _read_csv(f, counter):
+    reader = csv.DictReader(_counting_lines(f, counter))
+    for record in reader:
+        yield reader.line_num, record
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson", ".json"): return "jsonl"
+    if ext == ".csv": return "csv"
+    raise ValueError(f"Unsupported import file type '{ext}' (expected .csv or .jsonl)")
+
+
+# --- Job Bookkeeping ---
+def _source_signature(path):
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime
+
+
+def _start_job(conn, path, target, restart):
+    """Returns (job_id, records already committed, rows already inserted) for this file."""
+    source_path, size, mtime = _source_signature(path)
+    row = conn.execute(
+        "SELECT id, records_committed, rows_inserted, status FROM import_jobs "
+        "WHERE source_path = ? AND source_size = ? AND source_mtime = ? AND target = ? ORDER BY id DESC LIMIT 1",
+        (source_path, size, mtime, target),
+    ).fetchone()
+    if row is not None and not restart:
+        job_id, committed, rows, status = row
+        if status == "done":
+            raise ValueError(f"'{os.path.basename(path)}' was already imported (job {job_id}). Use restart to import it again.")
+        print(f"Import: resuming job {job_id} after {committed} committed records")
+        conn.execute("UPDATE import_jobs SET status = 'running', error = NULL, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (job_id,))
+        return job_id, committed, rows
+    cursor = conn.execute(
+        "INSERT INTO import_jobs (source_path, source_size, source_mtime, target) VALUES (?, ?, ?, ?)",
+        (source_path, size, mtime, target),
+    )
+    return cursor.lastrowid, 0, 0
+
+
+def _finish_job(conn, job_id, status, error=None):
+    conn.execute("UPDATE import_jobs SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                 (status, error, job_id))
+
+
+# --- Import ---
+def _import_source(path):
+    """Key of import_id_map: the directory of the file (an export writes all its tables into one)."""
+    return os.path.dirname(os.path.abspath(path))
+
+
+def _existing_engineer_ids(conn, ids):
+    ids = sorted(set(ids))
+    existing = set()
+    for start in range(0, len(ids), ID_CHUNK_SIZE):
+        chunk = ids[start:start + ID_CHUNK_SIZE]
+        existing.update(row[0] for row in conn.execute(
+            f"SELECT id FROM engineers WHERE id IN ({', '.join('?' * len(chunk))})", chunk))
+    return existing
+
+
+def _mapped_engineer_ids(conn, source, source_ids):
+    source_ids = sorted(set(source_ids))
+    mapped = {}
+    for start in range(0, len(source_ids), ID_CHUNK_SIZE):
+        chunk = source_ids[start:start + ID_CHUNK_SIZE]
+        mapped.update(conn.execute(
+            f"SELECT source_id, engineer_id FROM import_id_map WHERE source = ? AND source_id IN ({', '.join('?' * len(chunk))})",
+            [source] + chunk))
+    return mapped
+
+
+class _BatchImporter:
+    """Collects records of one batch and writes them in one transaction."""
+
+    def __init__(self, target, source):
+        self.target = target
+        self.source = source
+        self.writers = {name: _TableWriter(model) for name, model in TABLE_MODELS.items()}
+
+    def add(self, record):
+        """Converts one input record into pending rows. Raises ValueError for bad records."""
+        if not isinstance(record, dict): raise ValueError("record is not an object")
+        if self.target == "engineers":
+            doc = dict(record)
+            children = {}
+            for key in list(doc):
+                if key in _CHILD_KEYS and isinstance(doc[key], list):
+                    children[_CHILD_KEYS[key]] = doc.pop(key)
+            # Convert everything first so a bad child value rejects the whole engineer
+            engineer = self.writers["engineers"].convert(doc)
+            child_rows = []
+            for table, items in children.items():
+                for item in items:
+                    if not isinstance(item, dict): raise ValueError(f"{table}: entry is not an object")
+                    values = self.writers[table].convert(item)
+                    values.pop("id", None); values.pop("engineer_id", None)
+                    child_rows.append((table, values))
+            return ("engineer", engineer, child_rows)
+        values = self.writers[self.target].convert(record)
+        values.pop("id", None)
+        if values.get("engineer_id") is None: raise ValueError(f"{self.target}: engineer_id is required")
+        return ("child", values, None)
+
+    def write(self, conn, converted):
+        """
+        Inserts a batch of (line number, converted record). Returns (rows inserted, tables touched,
+        rejected [(line number, message)]).
+        """
+        rejected = []
+        if self.target == "engineers":
+            # Explicit ids so child rows can reference their engineer without a round trip per row.
+            # A file id is kept unless it is taken (by an existing engineer or earlier in this batch).
+            provided = [e["id"] for _, (_, e, _) in converted if e.get("id") is not None]
+            taken = _existing_engineer_ids(conn, provided)
+            next_id = max([conn.execute("SELECT coalesce(max(id), 0) FROM engineers").fetchone()[0]] + provided) + 1
+            mapping = []
+            for _, (_, engineer, child_rows) in converted:
+                source_id = engineer.get("id")
+                if source_id is None or source_id in taken:
+                    engineer["id"] = next_id; next_id += 1
+                taken.add(engineer["id"])
+                if source_id is not None: mapping.append((self.source, source_id, engineer["id"]))
+                self.writers["engineers"].add(engineer)
+                for table, values in child_rows:
+                    values["engineer_id"] = engineer["id"]
+                    self.writers[table].add(values)
+            conn.executemany("INSERT OR REPLACE INTO import_id_map (source, source_id, engineer_id) VALUES (?, ?, ?)", mapping)
+        else:
+            # engineer_id as the file's engineers were stored (see import_id_map), else an existing engineer
+            source_ids = {values["engineer_id"] for _, (_, values, _) in converted}
+            mapped = _mapped_engineer_ids(conn, self.source, source_ids)
+            resolved = {source_id: mapped.get(source_id, source_id) for source_id in source_ids}
+            existing = _existing_engineer_ids(conn, resolved.values())
+            for line_no, (_, values, _) in converted:
+                engineer_id = resolved[values["engineer_id"]]
+                if engineer_id not in existing:
+                    rejected.append((line_no, f"{self.target}: engineer {values['engineer_id']} does not exist"))
+                    continue
+                values["engineer_id"] = engineer_id
+                self.writers[self.target].add(values)
+        rows, touched = 0, set()
+        for name, writer in self.writers.items():
+            count = writer.flush(conn)
+            if count: rows += count; touched.add(name)
+        return rows, touched, rejected
+
+
+def import_file(engine, path, target=None, batch_size=IMPORT_BATCH_SIZE, progress=None, should_stop=None, restart=False):
+    """
+    Imports a CSV/JSONL file. Safe to call again after a failure or stop: committed
+    batches are skipped.
+
+    Args:
+        engine: SQLAlchemy engine of engineers.db.
+        path: File to import.
+        target: Table for CSV files (default: file name). JSONL always imports engineers.
+        batch_size: Records per transaction.
+        progress: Optional callback(stats) after every committed batch (called on the importing thread).
+        should_stop: Optional callable; checked between batches, True stops the import (resumable).
+        restart: Import the file again even if a previous job finished it.
+
+    Returns a stats dict: job_id, target, status, records, rejected, skipped, rows,
+    batches, bytes_read, total_bytes, elapsed, records_per_sec, rows_per_sec, errors.
+    """
+    fmt = detect_format(path)
+    if fmt == "jsonl": target = "engineers"
+    else: target = target or os.path.splitext(os.path.basename(path))[0].lower()
+    if target not in TABLE_MODELS:
+        raise ValueError(f"Unknown import table '{target}'. Choose from: {', '.join(TABLE_MODELS)}")
+    batch_size = max(1, int(batch_size))
+
+    stats = {
+        "job_id": None, "target": target, "status": "running", "records": 0, "rejected": 0, "skipped": 0,
+        "rows": 0, "batches": 0, "bytes_read": 0, "total_bytes": os.path.getsize(path), "elapsed": 0.0,
+        "records_per_sec": 0.0, "rows_per_sec": 0.0, "errors": [],
+    }
+    raw = engine.raw_connection()
+    conn = raw.driver_connection
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None # Manual BEGIN/COMMIT per batch
+    started = time.perf_counter()
+    counter = [0]
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            job_id, resume_from, rows_before = _start_job(conn, path, target, restart)
+            # The FTS triggers would rebuild a document per inserted row; they only record the
+            # affected engineers until the import ends (one trigger swap per import, not per batch)
+            defer_search_index(conn)
+        except Exception: conn.execute("ROLLBACK"); raise
+        conn.execute("COMMIT")
+        stats["job_id"] = job_id
+
+        importer = _BatchImporter(target, _import_source(path))
+        batch, batch_records = [], 0
+
+        def commit_batch():
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows, touched, rejected = importer.write(conn, batch)
+                conn.execute(
+                    "UPDATE import_jobs SET records_committed = records_committed + ?, rows_inserted = rows_inserted + ?, "
+                    "updated_at = CURRENT_TIMESTAMP WHERE id = ?", (batch_records, rows, job_id))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if touched: change_tracker.mark_changed(*touched)
+            for line_no, message in rejected:
+                stats["rejected"] += 1
+                if len(stats["errors"]) < MAX_REPORTED_ERRORS: stats["errors"].append(f"line {line_no}: {message}")
+            stats["rows"] += rows
+            stats["records"] += batch_records
+            stats["batches"] += 1
+            _update_rates(stats, started, counter)
+            if progress: progress(dict(stats))
+
+        try:
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                records = _read_jsonl(f, counter) if fmt == "jsonl" else _read_csv(f, counter)
+                for line_no, record in records:
+                    if stats["skipped"] < resume_from:
+                        stats["skipped"] += 1 # Committed by an earlier run
+                        continue
+                    batch_records += 1
+                    try:
+                        if isinstance(record, Exception): raise record
+                        batch.append((line_no, importer.add(record)))
+                    except ValueError as e:
+                        stats["rejected"] += 1
+                        if len(stats["errors"]) < MAX_REPORTED_ERRORS: stats["errors"].append(f"line {line_no}: {e}")
+                    if batch_records >= batch_size:
+                        commit_batch()
+                        batch, batch_records = [], 0
+                        if should_stop and should_stop():
+                            stats["status"] = "stopped"
+                            break
+                if stats["status"] == "running" and batch_records:
+                    commit_batch()
+        finally:
+            # Done, stopped or failed: bring the index up to date and put the sync triggers back
+            _resume_search(conn)
+
+        if stats["status"] == "running": stats["status"] = "done"
+        _finish_job(conn, job_id, stats["status"])
+        _update_rates(stats, started, counter)
+        print(f"Import {stats['status']}: {stats['records']} records ({stats['rejected']} rejected), "
+              f"{stats['rows']} rows in {stats['elapsed']:.1f}s ({stats['records_per_sec']:.0f} records/s)")
+        return stats
+    except Exception as e:
+        traceback.print_exc()
+        if stats["job_id"] is not None:
+            try: _finish_job(conn, stats["job_id"], "failed", str(e))
+            except Exception: pass
+        raise
+    finally:
+        conn.isolation_level = previous_isolation
+        raw.close()
+
+
+def _resume_search(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try: refreshed = resume_search_index(conn)
+    except Exception: conn.execute("ROLLBACK"); raise
+    conn.execute("COMMIT")
+    if refreshed: change_tracker.mark_changed(FTS_TABLE)
+
+
+def _update_rates(stats, started, counter):
+    stats["elapsed"] = time.perf_counter() - started
+    stats["bytes_read"] = counter[0]
+    if stats["elapsed"] > 0:
+        stats["records_per_sec"] = stats["records"] / stats["elapsed"]
+        stats["rows_per_sec"] = stats["rows"] / stats["elapsed"]
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Bulk import engineers from CSV/JSONL")
+    parser.add_argument("path")
+    parser.add_argument("--table", help="Target table for CSV files (default: file name)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--restart", action="store_true", help="Import again even if already imported")
+    args = parser.parse_args()
+
+    from src.utils.db import init_database, get_engine
+    init_database()
+
+    def report(stats):
+        percent = 100.0 * stats["bytes_read"] / stats["total_bytes"] if stats["total_bytes"] else 100.0
+        print(f"  {percent:5.1f}%  {stats['records']} records, {stats['rows']} rows, {stats['records_per_sec']:.0f} records/s")
+
+    result = import_file(get_engine(), args.path, target=args.table, batch_size=args.batch_size,
+                         progress=report, restart=args.restart)
+    for error in result["errors"]: print(f"  rejected {error}")
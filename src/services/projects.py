@@ -0,0 +1,151 @@
+"""
+Queries for the Projects page: project_details across all engineers.
+
+Projects are listed newest contract first and paged by keyset on
+(contract_date, id). The grouped view folds the participations of several
+engineers in the same contract (same contract_number) into one row, paged by
+contract_number.
+
+The filter columns have composite indexes ending in contract_date (see
+ProjectDetail.__table_args__). They are not covering for the list: an
+equality filter and the page order are served by one index, which is read in
+order, and only the rows a page returns are looked up in the table. Rows
+before the keyset position are skipped inside the index. A client prefix
+matches several clients, so its matches are sorted before the first page is
+returned. Filtered counts read the index only.
+"""
+from datetime import date
+from sqlalchemy import select, func, and_, or_, tuple_, distinct
+from src.models.engineer import Engineer, ProjectDetail
+from src.utils.numbers import numeric_filter_clause
+
+PROJECT_PAGE_SIZE = 50
+
+# Columns of a project list row
+PROJECT_LIST_COLUMNS = (
+    ProjectDetail.id, ProjectDetail.engineer_id, Engineer.name.label("engineer_name"), ProjectDetail.contract_number,
+    ProjectDetail.service_name, ProjectDetail.client, ProjectDetail.contract_date, ProjectDetail.construction_type,
+    ProjectDetail.technical_sector, ProjectDetail.equity_ratio, ProjectDetail.contract_amount,
+)
+
+# Filters accepted by the queries below
+PROJECT_FILTERS = ("contract_date_from", "contract_date_to", "client", "construction_type", "technical_sector",
+                   "equity_ratio", "contract_number")
+
+_has_contract_number = and_(ProjectDetail.contract_number.isnot(None), ProjectDetail.contract_number != "")
+
+
+def _to_date(value, label):
+    if isinstance(value, date): return value
+    try: return date.fromisoformat(str(value).strip())
+    except ValueError: raise ValueError(f"{label}: expected a date like 2024-01-31, got '{value}'") from None
+
+
+def filter_clauses(filters):
+    """
+    Translates a {filter: value} dict into SQL clauses; empty values are ignored.
+
+    contract_date_from / contract_date_to: ISO dates (inclusive).
+    client: prefix, case-sensitive (a range on the client index).
+    construction_type, technical_sector, contract_number: exact value.
+    equity_ratio: numeric filter text ("50", ">=30", "20-40").
+    Raises ValueError for malformed dates.
+    """
+    clauses = []
+    for name, value in (filters or {}).items():
+        if value is None or str(value).strip() == "": continue
+        if name not in PROJECT_FILTERS: raise ValueError(f"Unknown project filter '{name}'")
+        if name == "contract_date_from":
+            clauses.append(ProjectDetail.contract_date >= _to_date(value, "Contract date from"))
+        elif name == "contract_date_to":
+            clauses.append(ProjectDetail.contract_date <= _to_date(value, "Contract date to"))
+        elif name == "client":
+            prefix = str(value).strip()
+            clauses.append(and_(ProjectDetail.client >= prefix, ProjectDetail.client < prefix + "\U0010ffff"))
+        elif name == "equity_ratio":
+            clauses.append(numeric_filter_clause(ProjectDetail.equity_ratio, value))
+        else:
+            clauses.append(getattr(ProjectDetail, name) == str(value).strip())
+    return clauses
+
+
+def _after_key_clause(after):
+    """Rows after (contract_date, id) in "newest first" order; SQLite sorts NULL dates last in DESC."""
+    value, row_id = after
+    if value is None:
+        return and_(ProjectDetail.contract_date.is_(None), ProjectDetail.id < row_id)
+    return or_(tuple_(ProjectDetail.contract_date, ProjectDetail.id) < tuple_(value, row_id),
+               ProjectDetail.contract_date.is_(None))
+
+
+def project_page(session, filters=None, after=None, rows_per_page=PROJECT_PAGE_SIZE):
+    """
+    One page of projects, newest contract first. `after` is the page_key() of the
+    last row of the previous page (None for the first page).
+    """
+    return session.execute(project_page_query(filters, after, rows_per_page)).all()
+
+
+def project_page_query(filters=None, after=None, rows_per_page=PROJECT_PAGE_SIZE):
+    stmt = (
+        select(*PROJECT_LIST_COLUMNS)
+        .select_from(ProjectDetail)
+        .outerjoin(Engineer, Engineer.id == ProjectDetail.engineer_id)
+        .where(*filter_clauses(filters))
+    )
+    if after is not None: stmt = stmt.where(_after_key_clause(after))
+    return stmt.order_by(ProjectDetail.contract_date.desc(), ProjectDetail.id.desc()).limit(rows_per_page)
+
+
+def contract_group_page(session, filters=None, after=None, rows_per_page=PROJECT_PAGE_SIZE):
+    """
+    One page of contracts (projects grouped by contract_number), in contract_number
+    order. `after` is the contract_number of the last row of the previous page.
+    Projects without a contract number are not part of any group.
+    """
+    stmt = (
+        select(
+            ProjectDetail.contract_number,
+            func.count().label("participations"),
+            func.count(distinct(ProjectDetail.engineer_id)).label("engineer_count"),
+            func.group_concat(distinct(Engineer.name)).label("engineer_names"),
+            func.max(ProjectDetail.service_name).label("service_name"),
+            func.max(ProjectDetail.client).label("client"),
+            func.max(ProjectDetail.contract_date).label("contract_date"),
+            func.max(ProjectDetail.construction_type).label("construction_type"),
+            func.max(ProjectDetail.technical_sector).label("technical_sector"),
+            func.sum(ProjectDetail.equity_ratio).label("equity_ratio"),
+            func.max(ProjectDetail.contract_amount).label("contract_amount"),
+        )
+        .select_from(ProjectDetail)
+        .outerjoin(Engineer, Engineer.id == ProjectDetail.engineer_id)
+        .where(_has_contract_number, *filter_clauses(filters))
+    )
+    if after is not None: stmt = stmt.where(ProjectDetail.contract_number > after)
+    stmt = stmt.group_by(ProjectDetail.contract_number).order_by(ProjectDetail.contract_number).limit(rows_per_page)
+    return session.execute(stmt).all()
+
+
+def page_key(row, grouped=False):
+    """Keyset position of a row returned by project_page / contract_group_page."""
+    return row.contract_number if grouped else (row.contract_date, row.id)
+
+
+def count_projects(session, filters=None, grouped=False):
+    """Number of projects (or of distinct contract numbers when grouped) matching the filters."""
+    return session.execute(count_projects_query(filters, grouped)).scalar()
+
+
+def count_projects_query(filters=None, grouped=False):
+    if grouped:
+        stmt = select(func.count(distinct(ProjectDetail.contract_number))).where(_has_contract_number)
+    else:
+        stmt = select(func.count()).select_from(ProjectDetail)
+    return stmt.where(*filter_clauses(filters))
+
+
+def distinct_values(session, column_name):
+    """Sorted non-empty values of a project column (for the filter drop-downs); reads its index."""
+    column = getattr(ProjectDetail, column_name)
+    stmt = select(column).where(column.isnot(None), column != "").group_by(column).order_by(column)
+    return list(session.execute(stmt).scalars())
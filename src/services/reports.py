@@ -0,0 +1,324 @@
+"""
+Career statement reports: one HTML or CSV document per engineer.
+
+Reports hold the sections EngineerDetailDialog shows. Engineers are read in
+batches, with the child rows of a batch fetched by one query per child table.
+Rendering runs in a process pool, so the next batch is fetched while the
+previous one renders.
+
+Every engineer has a row version in the `engineer_versions` table, bumped by
+triggers whenever the engineer or one of its career rows changes, and when it
+is deleted (the row stays, so an id SQLite hands out again never repeats a
+version the cache has seen). Rendered documents are cached by (engineer,
+format) along with the version they were rendered from, so generating the same
+reports again only renders the engineers that changed.
+
+Generate reports from the command line with:
+    python -m src.services.reports <directory> [--format html|csv] [--workers N]
+"""
+import csv
+import html
+import io
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from sqlalchemy import select, func
+from src.models.engineer import Engineer, EngineerVersion
+from src.utils.change_tracker import change_tracker
+from src.utils.schema import VERSIONS_TABLE
+
+
+REPORT_FORMATS = ("html", "csv")
+REPORT_BATCH_SIZE = 200
+REPORT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+REPORT_CACHE_SIZE = 5000  # Rendered documents kept in memory
+
+# Basic information fields, in two columns like the detail dialog
+BASIC_FIELDS = (
+    ("Name", "name"), ("Birth Date", "date_of_birth"), ("Position", "position_and_rank"),
+    ("Experience", "experience"), ("Evaluation Target", "evaluation_target"), ("Company", "company_name"),
+    ("Address", "address"), ("Resp. Tech Manager", "responsible_technical_manager"), ("Field Name", "field_name"),
+)
+
+# (title, Engineer relationship, [(label, column), ...]) in report order
+REPORT_SECTIONS = (
+    ("Technical Grades", "technical_grades", (("Type", "grade_type"), ("Field", "field"), ("Grade", "grade"))),
+    ("Qualifications", "technical_qualifications", (("Title", "title"), ("Acquisition Date", "acquisition_date"), ("Reg. Number", "registration_number"))),
+    ("Education", "education", (("Graduation", "graduation_date"), ("School Name", "school_name"), ("Major", "major"), ("Degree", "degree"))),
+    ("Workplace History", "workplace", (("Period", "workplace_experience_period"), ("Company", "workplace_company_name"))),
+    ("Education and Training", "education_and_training", (
+        ("Period", "training_period"), ("Course", "course_name"), ("Institution", "institution_name"),
+        ("Completion No", "completion_number"), ("Training Field", "training_field"))),
+    ("Technical Sector Participation", "technical_sector_participation", (("Sector", "technical_sector"), ("Days", "participation_days"))),
+    ("Job Sector Participation", "job_sector_participation", (("Job", "job"), ("Days", "participation_days"))),
+    ("Specialized Field Participation", "specialized_field_participation", (("Field", "specialized_field"), ("Days", "participation_days"))),
+    ("Construction Type Participation", "construction_type_participation", (("Type", "construction_type"), ("Days", "participation_days"))),
+    ("Awards", "awards", (("Date", "date"), ("Type/Basis", "type_and_basis"), ("Institution", "awarding_institution"))),
+    ("Sanctions", "sanctions", (
+        ("Date", "date"), ("Type", "type"), ("Points", "penalty_points"), ("Period", "sanction_period"),
+        ("Basis", "basis"), ("Institution", "sanctioning_institution"))),
+    ("Project Details", "project_details", (
+        ("Service Name", "service_name"), ("Project Type", "project_type"), ("Company", "company_name"),
+        ("Client", "client"), ("Contract Date", "contract_date"), ("Contract Amount", "contract_amount"),
+        ("Participation Period", "participation_period"), ("Days", "participation_days"), ("Position", "position"))),
+)
+
+_SECTION_TABLES = {rel: Engineer.__mapper__.relationships[rel].mapper.local_table for _, rel, _ in REPORT_SECTIONS}
+
+
+# --- Rendered Document Cache ---
+
+class _ReportCache:
+    """Rendered documents by (engineer_id, format), each tagged with the row version it was rendered from."""
+
+    def __init__(self, max_entries=REPORT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, engineer_id, fmt, version):
+        with self._lock:
+            entry = self._entries.get((engineer_id, fmt))
+            if entry is None or entry[0] != version: return None
+            self._entries.move_to_end((engineer_id, fmt))
+            return entry[1]
+
+    def put(self, engineer_id, fmt, version, document):
+        with self._lock:
+            self._entries[(engineer_id, fmt)] = (version, document)
+            self._entries.move_to_end((engineer_id, fmt))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = _ReportCache()
+
+
+def _on_change(tables):
+    # Triggers write engineer_versions without telling the tracker; a write reported for the
+    # table itself is a restore, which can take versions back to numbers the cache has seen
+    if VERSIONS_TABLE in tables: _cache.clear()
+
+
+change_tracker.subscribe(_on_change)
+
+
+# --- Rendering (runs in worker processes; plain dicts in, text out) ---
+
+def _text(value):
+    if value is None: return ""
+    if isinstance(value, bool): return "Yes" if value else "No"
+    if isinstance(value, (date, datetime)): return value.isoformat()
+    if isinstance(value, float): return f"{value:,.1f}".rstrip("0").rstrip(".")
+    if isinstance(value, int): return f"{value:,}"
+    return str(value)
+
+
+_HTML_STYLE = (
+    "body{font-family:Arial,sans-serif;margin:24px;color:#222}h1{margin-bottom:4px}"
+    "h2{color:#16A085;border-bottom:1px solid #ccc;padding-bottom:2px;margin-top:24px}"
+    "table{border-collapse:collapse;width:100%}th,td{border:1px solid #ddd;padding:4px 6px;text-align:left;vertical-align:top}"
+    "th{background:#f3f3f3}.basic td:nth-child(odd){font-weight:bold;width:18%}.empty{color:#888}"
+)
+
+
+def render_html(doc):
+    """Career statement of one engineer as a standalone HTML page."""
+    engineer = doc["engineer"]
+    esc = lambda value: html.escape(_text(value))
+    out = [f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{esc(engineer['name'])}</title>"
+           f"<style>{_HTML_STYLE}</style></head><body>",
+           f"<h1>{esc(engineer['name'])}</h1><p class=\"empty\">Career statement generated {esc(doc['generated'])}</p>",
+           "<h2>Basic Information</h2><table class=\"basic\">"]
+    for i in range(0, len(BASIC_FIELDS), 2):
+        cells = "".join(f"<td>{html.escape(label)}</td><td>{esc(engineer.get(column))}</td>" for label, column in BASIC_FIELDS[i:i + 2])
+        out.append(f"<tr>{cells}</tr>")
+    out.append("</table>")
+    for title, rel, fields in REPORT_SECTIONS:
+        out.append(f"<h2>{html.escape(title)}</h2>")
+        items = doc["sections"].get(rel, [])
+        if not items:
+            out.append(f"<p class=\"empty\">No {html.escape(title.lower())} recorded.</p>")
+            continue
+        out.append("<table><tr>" + "".join(f"<th>{html.escape(label)}</th>" for label, _ in fields) + "</tr>")
+        for item in items:
+            out.append("<tr>" + "".join(f"<td>{esc(item.get(column))}</td>" for _, column in fields) + "</tr>")
+        out.append("</table>")
+    out.append("</body></html>")
+    return "\n".join(out)
+
+
+def render_csv(doc):
+    """Career statement of one engineer as CSV rows: section, item number, field, value."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(("section", "item", "field", "value"))
+    engineer = doc["engineer"]
+    for label, column in BASIC_FIELDS:
+        writer.writerow(("Basic Information", 1, label, _text(engineer.get(column))))
+    for title, rel, fields in REPORT_SECTIONS:
+        for n, item in enumerate(doc["sections"].get(rel, []), start=1):
+            for label, column in fields:
+                writer.writerow((title, n, label, _text(item.get(column))))
+    return buffer.getvalue()
+
+
+_RENDERERS = {"html": render_html, "csv": render_csv}
+
+
+def render_documents(docs, fmt):
+    """Renders a chunk of report documents; returns [(engineer_id, text), ...]. Process pool entry point."""
+    render = _RENDERERS[fmt]
+    return [(doc["engineer"]["id"], render(doc)) for doc in docs]
+
+
+# --- Data Fetching ---
+
+def _fetch_documents(session, engineer_ids, generated):
+    """Report documents (plain dicts, picklable) for a batch of engineers; one query per table."""
+    engineer_rows = session.execute(
+        select(*[Engineer.__table__.c[column] for column in ("id",) + tuple(c for _, c in BASIC_FIELDS)])
+        .where(Engineer.id.in_(engineer_ids))
+    ).mappings()
+    docs = {row["id"]: {"engineer": dict(row), "sections": {}, "generated": generated} for row in engineer_rows}
+    for rel, table in _SECTION_TABLES.items():
+        rows = session.execute(
+            select(table).where(table.c.engineer_id.in_(engineer_ids)).order_by(table.c.engineer_id, table.c.id)
+        ).mappings()
+        for row in rows:
+            doc = docs.get(row["engineer_id"])
+            if doc is not None: doc["sections"].setdefault(rel, []).append(dict(row))
+    return [docs[i] for i in engineer_ids if i in docs]
+
+
+def _version_batches(session, batch_size, engineer_ids=None):
+    """Yields lists of (engineer_id, name, version), ordered by id."""
+    stmt = (
+        select(Engineer.id, Engineer.name, func.coalesce(EngineerVersion.version, 0))
+        .outerjoin(EngineerVersion, EngineerVersion.engineer_id == Engineer.id)
+        .order_by(Engineer.id)
+    )
+    if engineer_ids is not None:
+        ids = sorted(set(engineer_ids))
+        for start in range(0, len(ids), batch_size):
+            yield session.execute(stmt.where(Engineer.id.in_(ids[start:start + batch_size]))).all()
+        return
+    for partition in session.execute(stmt.execution_options(yield_per=batch_size)).partitions():
+        yield partition
+
+
+def report_file_name(engineer_id, name, fmt):
+    safe = re.sub(r'[\\/:*?"<>|\s]+', "_", name or "").strip("._")[:60]
+    return f"{engineer_id:06d}_{safe or 'engineer'}.{fmt}"
+
+
+# --- Pipeline ---
+
+def generate_reports(session_factory, directory, fmt="html", engineer_ids=None, batch_size=REPORT_BATCH_SIZE,
+                     workers=REPORT_WORKERS, progress=None, should_stop=None):
+    """
+    Writes one report file per engineer into `directory`.
+
+    Args:
+        session_factory: sessionmaker; one session (one consistent read transaction) is used.
+        fmt: "html" or "csv".
+        engineer_ids: Report on these engineers only (default: every engineer).
+        workers: Rendering processes; 1 renders on the calling thread.
+        progress: Optional callback(stats) after every batch (called on the generating thread).
+        should_stop: Optional callable checked between batches; True stops after the current batch.
+
+    Returns a stats dict: status, engineers, total, rendered, cached, elapsed, directory.
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format '{fmt}'. Choose from: {', '.join(REPORT_FORMATS)}")
+    batch_size = max(1, int(batch_size))
+    workers = max(1, int(workers))
+    os.makedirs(directory, exist_ok=True)
+    stats = {"status": "running", "engineers": 0, "total": 0, "rendered": 0, "cached": 0, "elapsed": 0.0, "directory": directory}
+    started = time.perf_counter()
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M")
+    session = session_factory()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def write(engineer_id, name, document):
+        with open(os.path.join(directory, report_file_name(engineer_id, name, fmt)), "w", encoding="utf-8", newline="") as f:
+            f.write(document)
+
+    def finish(pending):
+        """Collects a rendered batch: caches and writes its documents."""
+        batch, futures = pending
+        for future in futures:
+            results = future.result() if pool is not None else future
+            for engineer_id, document in results:
+                name, version = batch[engineer_id]
+                _cache.put(engineer_id, fmt, version, document)
+                write(engineer_id, name, document)
+                stats["rendered"] += 1
+        stats["engineers"] += len(batch)
+        stats["elapsed"] = time.perf_counter() - started
+        if progress: progress(dict(stats))
+
+    try:
+        if engineer_ids is not None:
+            stats["total"] = len(set(engineer_ids))
+        else:
+            stats["total"] = session.execute(select(func.count()).select_from(Engineer)).scalar()
+        pending = None
+        for rows in _version_batches(session, batch_size, engineer_ids):
+            batch, stale = {}, []
+            for engineer_id, name, version in rows:
+                batch[engineer_id] = (name, version)
+                document = _cache.get(engineer_id, fmt, version)
+                if document is None:
+                    stale.append(engineer_id)
+                else:
+                    write(engineer_id, name, document)
+                    stats["cached"] += 1
+            docs = _fetch_documents(session, stale, generated) if stale else []
+            if pool is not None:
+                # Split the batch across the workers; the next batch is fetched while these render
+                chunk = max(1, -(-len(docs) // workers))
+                futures = [pool.submit(render_documents, docs[i:i + chunk], fmt) for i in range(0, len(docs), chunk)]
+            else:
+                futures = [render_documents(docs, fmt)]
+            if pending is not None: finish(pending)
+            pending = (batch, futures)
+            if should_stop and should_stop():
+                stats["status"] = "stopped"
+                break
+        if pending is not None: finish(pending)
+        if stats["status"] == "running": stats["status"] = "done"
+        stats["elapsed"] = time.perf_counter() - started
+        print(f"Reports {stats['status']}: {stats['engineers']} engineers ({stats['rendered']} rendered, "
+              f"{stats['cached']} unchanged) in {stats['elapsed']:.1f}s -> {directory}")
+        return stats
+    except Exception:
+        traceback.print_exc()
+        raise
+    finally:
+        if pool is not None: pool.shutdown(cancel_futures=True)
+        session.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate engineer career statement reports.")
+    parser.add_argument("directory", help="Output directory (one file per engineer)")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="html")
+    parser.add_argument("--workers", type=int, default=REPORT_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=REPORT_BATCH_SIZE)
+    args = parser.parse_args()
+    from src.utils.db import init_database
+    session_factory = init_database()
+    result = generate_reports(session_factory, args.directory, args.format, batch_size=args.batch_size, workers=args.workers)
+    sys.exit(0 if result["status"] == "done" else 1)
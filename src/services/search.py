@@ -0,0 +1,80 @@
+"""
+Full-text search over engineers and their career records (SQLite FTS5).
+
+Every engineer has one document in the `engineer_search` FTS5 table (rowid =
+engineers.id). The document is rebuilt by triggers whenever the engineer or one
+of its child rows is inserted, updated or deleted, so writes from the ORM, bulk
+SQL and imports all keep the index in sync.
+
+Rebuild the whole index from the command line with:
+    python -m src.services.search rebuild
+"""
+import re
+import sys
+from sqlalchemy import text, Integer, Float
+from src.utils.change_tracker import change_tracker
+from src.utils.schema import FTS_TABLE, FTS_COLUMNS, search_schema_statements, fill_search_index, resume_search_index
+
+
+def rebuild_search_index(engine):
+    """Re-creates every search document from the source tables. Returns the number of indexed engineers."""
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        for statement in search_schema_statements():
+            conn.execute(statement)
+        resume_search_index(conn) # Drops the deferred triggers an interrupted import may have left
+        fill_search_index(conn)
+        raw.commit()
+        count = conn.execute(f"SELECT count(*) FROM {FTS_TABLE}").fetchone()[0]
+    finally:
+        raw.close()
+    change_tracker.mark_changed(FTS_TABLE) # Raw SQL: the caches of search results don't see it otherwise
+    return count
+
+
+def build_match_query(search_text):
+    """
+    Turns free user input into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term ("bridge"*), all terms must match.
+    Returns None if the input has no searchable words.
+    """
+    words = re.findall(r"\w+", search_text or "", flags=re.UNICODE)
+    if not words: return None
+    return " AND ".join(f'"{w}"*' for w in words)
+
+
+def search_subquery(search_text):
+    """
+    Returns a subquery with (engineer_id, rank) for the ranked matches, or None for empty input.
+    Lower rank is a better match (bm25 convention).
+    """
+    match = build_match_query(search_text)
+    if match is None: return None
+    weights = ", ".join(str(w) for _, w in FTS_COLUMNS)
+    stmt = text(
+        f"SELECT rowid AS engineer_id, bm25({FTS_TABLE}, {weights}) AS rank "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+    ).bindparams(match=match).columns(engineer_id=Integer, rank=Float)
+    return stmt.subquery("fts")
+
+
+def search_engineers(session, search_text, limit=50):
+    """Returns [(engineer_id, rank), ...] best matches first."""
+    fts = search_subquery(search_text)
+    if fts is None: return []
+    rows = session.execute(
+        fts.select().order_by(fts.c.rank, fts.c.engineer_id).limit(limit)
+    ).all()
+    return [(row.engineer_id, row.rank) for row in rows]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Usage: python -m src.services.search rebuild")
+        sys.exit(1)
+    from src.utils.db import init_database, get_engine
+    init_database()
+    count = rebuild_search_index(get_engine())
+    print(f"Search index rebuilt: {count} engineers indexed.")
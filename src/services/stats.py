@@ -0,0 +1,41 @@
+"""
+Materialized per-engineer aggregates (the `engineer_stats` table).
+
+One row per engineer with counts and sums over its child rows. Triggers on the
+child tables apply the difference of every insert, update and delete, so the
+row stays current for ORM writes, bulk SQL and imports alike, and sorting or
+filtering by an aggregate reads one indexed column instead of running
+subqueries over the child tables.
+
+Rebuild all rows from the child tables with:
+    python -m src.services.stats rebuild
+"""
+import sys
+from src.utils.change_tracker import change_tracker
+from src.utils.schema import STATS_TABLE, stats_schema_statements, fill_engineer_stats
+
+
+def rebuild_engineer_stats(engine):
+    """Recomputes every stats row from the child tables. Returns the number of engineers."""
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        for statement in stats_schema_statements():
+            conn.execute(statement)
+        fill_engineer_stats(conn)
+        raw.commit()
+        count = conn.execute(f"SELECT count(*) FROM {STATS_TABLE}").fetchone()[0]
+    finally:
+        raw.close()
+    change_tracker.mark_changed(STATS_TABLE)
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Usage: python -m src.services.stats rebuild")
+        sys.exit(1)
+    from src.utils.db import init_database, get_engine
+    init_database()
+    count = rebuild_engineer_stats(get_engine())
+    print(f"Engineer stats rebuilt: {count} engineers.")
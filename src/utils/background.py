@@ -0,0 +1,131 @@
+"""
+Runs database work off the Tk main loop.
+
+Tasks execute on a small thread pool; every worker thread owns its own
+SQLAlchemy session. Results are handed back through a queue that the Tk widget
+polls with after(), so callbacks always run on the UI thread.
+
+Tasks are grouped by a key (e.g. "page"). Submitting a new task for a key makes
+any older task with that key stale: if it hasn't started it is cancelled, and
+if it is already running its result is dropped when it arrives.
+"""
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundQueryExecutor:
+    POLL_INTERVAL_MS = 30
+
+    def __init__(self, widget, session_factory, max_workers=2, name="db-worker"):
+        """
+        Args:
+            widget: Any Tk widget, used for after() polling.
+            session_factory: Callable returning a new Session (e.g. a sessionmaker).
+        """
+        self.widget = widget
+        self.session_factory = session_factory
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._results = queue.Queue()
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        self._generations = {}  # key -> latest generation number
+        self._futures = {}      # key -> future of the latest task
+        self._pending = 0
+        self._poll_job = None
+        self._closed = False
+
+    # --- Public API ---
+    def submit(self, key, func, on_done=None, on_error=None):
+        """
+        Runs func(session) on a worker thread. on_done(result) / on_error(exc) are
+        called on the Tk thread, but only if no newer task was submitted for `key`.
+        Returns the generation number of the task.
+        """
+        if self._closed: return None
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        previous = self._futures.get(key)
+        if previous is not None and previous.cancel():
+            self._pending -= 1 # Never started, won't report back
+        self._pending += 1
+        self._futures[key] = self._pool.submit(self._run, key, generation, func, on_done, on_error)
+        self._schedule_poll()
+        return generation
+
+    def cancel(self, key):
+        """Makes any outstanding task for `key` stale."""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        previous = self._futures.pop(key, None)
+        if previous is not None and previous.cancel():
+            self._pending -= 1
+
+    def is_current(self, key, generation):
+        return self._generations.get(key) == generation
+
+    def shutdown(self):
+        """Stops polling and closes all worker sessions."""
+        self._closed = True
+        if self._poll_job is not None:
+            try: self.widget.after_cancel(self._poll_job)
+            except Exception: pass
+            self._poll_job = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._sessions_lock:
+            for session in self._sessions:
+                try: session.close()
+                except Exception: pass
+            self._sessions.clear()
+
+    # --- Worker Side ---
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.session_factory()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _run(self, key, generation, func, on_done, on_error):
+        if not self.is_current(key, generation):
+            self._results.put((key, generation, None, None, None, None)) # Stale before it started
+            return
+        session = self._session()
+        try:
+            result = func(session)
+            # Detach results so the UI thread can read them, and end the read transaction
+            session.expunge_all()
+            session.rollback()
+            self._results.put((key, generation, on_done, on_error, result, None))
+        except Exception as e:
+            traceback.print_exc()
+            try: session.rollback()
+            except Exception: pass
+            self._results.put((key, generation, on_done, on_error, None, e))
+
+    # --- UI Side ---
+    def _schedule_poll(self):
+        if self._poll_job is None and not self._closed:
+            self._poll_job = self.widget.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        if self._closed: return
+        while True:
+            try: key, generation, on_done, on_error, result, error = self._results.get_nowait()
+            except queue.Empty: break
+            self._pending -= 1
+            if not self.is_current(key, generation): continue # A newer request replaced this one
+            self._futures.pop(key, None)
+            try:
+                if error is not None:
+                    if on_error: on_error(error)
+                elif on_done:
+                    on_done(result)
+            except Exception:
+                traceback.print_exc()
+        if self._pending > 0:
+            self._schedule_poll()
@@ -0,0 +1,224 @@
+"""
+Small in-process caches for query results, invalidated through the change tracker.
+
+Besides commits of tracked sessions, every cache drops its entries when the
+change tracker sees writes it can't attribute (change_tracker.external_writes():
+other processes such as the command line tools or a second app instance, a
+restored backup, raw connections).
+"""
+import sys
+import threading
+from collections import OrderedDict
+from src.utils.change_tracker import change_tracker
+
+
+def normalize_filters(filters):
+    """Turns a {column: value} filter dict into a hashable, order/case/whitespace-insensitive key."""
+    return tuple(sorted(
+        (str(name), str(value).strip().lower())
+        for name, value in (filters or {}).items()
+        if value is not None and str(value).strip() != ""
+    ))
+
+
+class CountCache:
+    """
+    Caches row counts per normalized filter set.
+
+    Each entry remembers the change-tracker version of `tables` it was computed
+    at; a commit touching any of those tables (or an external write) makes the
+    entry stale.
+    """
+    def __init__(self, tables=("engineers",), max_entries=256):
+        self.tables = tuple(tables)
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self):
+        """Stamp to read before running a query and pass to put()."""
+        return change_tracker.version(*self.tables), change_tracker.external_writes()
+
+    def get(self, filter_key):
+        version = self.version()
+        with self._lock:
+            entry = self._entries.get(filter_key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, filter_key, count, version=None):
+        """Stores a count. Pass the version read *before* running the query to avoid caching a racing write."""
+        if version is None: version = self.version()
+        with self._lock:
+            if len(self._entries) >= self.max_entries and filter_key not in self._entries:
+                self._entries.pop(next(iter(self._entries))) # Drop the oldest entry
+            self._entries[filter_key] = (version, count)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ResultCache:
+    """
+    Caches arbitrary query results by key. Every entry names the tables it was
+    computed from and is stale once any of them gets a committed write (or an
+    external write happens).
+    """
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def version(tables):
+        """Stamp to read before running a query and pass to put()."""
+        return change_tracker.version(*tables), change_tracker.external_writes()
+
+    def get(self, key, tables):
+        version = self.version(tables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, tables, version=None):
+        """Stores a result. Pass the version read *before* running the query to avoid caching a racing write."""
+        if version is None: version = self.version(tables)
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                self._entries.pop(next(iter(self._entries))) # Drop the oldest entry
+            self._entries[key] = (version, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class PageCache:
+    """
+    LRU cache of grid pages (lists of projected rows), evicted by estimated size.
+
+    Entries are grouped by result set: every page of one filter/search/sort/page-size
+    combination shares a `signature`. Row-level changes drop only the pages they can
+    affect (see invalidate_row); anything else calls clear(). Because invalidation is
+    driven by events, put() refuses results whose query raced a commit.
+
+    Per-signature info passed to put():
+        order:   "id" / "id_desc" when rows are ordered by id alone, else None
+        depends: columns deciding membership and order ("*" = any column, e.g. search)
+    """
+    def __init__(self, tables=("engineers",), max_bytes=16 * 1024 * 1024):
+        self.tables = tuple(tables)
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict() # key -> entry dict, least recently used first
+        self._bytes = 0
+        self._external = change_tracker.external_writes()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        self._check_external_writes()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["rows"]
+
+    def put(self, key, rows, signature, page, per_page, order=None, depends=(), version=None):
+        """
+        Stores a page. Pass the change-tracker version of `tables` read *before* the
+        query: the page is not cached if a commit landed meanwhile.
+        """
+        if version is not None and version != change_tracker.version(*self.tables): return
+        rows = list(rows)
+        size = _estimate_size(rows)
+        if size > self.max_bytes: return
+        entry = {"rows": rows, "ids": [row.id for row in rows], "signature": signature, "page": page,
+                 "full": len(rows) >= per_page, "order": order, "depends": frozenset(depends), "size": size}
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                self._discard(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def size(self):
+        """(entries, estimated bytes)"""
+        with self._lock:
+            return len(self._entries), self._bytes
+
+    # --- Invalidation ---
+    def invalidate_row(self, row_id, op, columns=None):
+        """
+        Drops the pages a changed row can affect.
+
+        op "insert"/"delete" (or an update touching a result set's `depends`, or
+        columns=None for unknown) may move rows between pages: id-ordered result sets
+        lose only the pages at or after the row's position (and the last, partly
+        filled page), a delete elsewhere loses the pages from the first one that
+        contains the row or isn't cached. Any other update only drops the pages
+        showing that row.
+        """
+        with self._lock:
+            by_signature = {}
+            for key, entry in self._entries.items():
+                by_signature.setdefault(entry["signature"], []).append((key, entry))
+            for entries in by_signature.values():
+                sample = entries[0][1]
+                moves = op != "update" or columns is None or "*" in sample["depends"] or bool(sample["depends"] & set(columns))
+                for key in self._affected(entries, sample, row_id, op, moves): self._discard(key)
+
+    def _affected(self, entries, sample, row_id, op, moves):
+        if not moves:
+            return [key for key, entry in entries if row_id in entry["ids"]]
+        if sample["order"] == "id":
+            return [key for key, entry in entries if not entry["full"] or row_id <= entry["ids"][-1]]
+        if sample["order"] == "id_desc":
+            return [key for key, entry in entries if not entry["full"] or row_id >= entry["ids"][-1]]
+        if op == "delete":
+            # Pages before the first page that holds the row (or isn't cached) keep their rows
+            pages = {}
+            for key, entry in entries: pages.setdefault(entry["page"], entry)
+            first = 1
+            while first in pages and row_id not in pages[first]["ids"]: first += 1
+            return [key for key, entry in entries if entry["page"] >= first]
+        return [key for key, entry in entries]
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None: self._bytes -= entry["size"]
+
+    def _check_external_writes(self):
+        """Writes no tracked session reported (other processes, raw SQL) make every page suspect."""
+        external = change_tracker.external_writes()
+        if external != self._external:
+            self._external = external
+            self.clear()
+
+
+def _estimate_size(rows):
+    """Approximate memory held by a list of row tuples."""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+    return size
@@ -0,0 +1,206 @@
+"""
+Tracks committed writes per table so caches can tell when their data went stale.
+
+Session events collect the tables touched by each flush (and by bulk
+UPDATE/DELETE statements, which bypass the flush) and bump a per-table version
+counter once the transaction commits. Rolled back changes are discarded.
+
+data_sequence() combines an in-process commit counter with PRAGMA
+data_version read on a dedicated connection, which changes whenever any other
+connection (including other processes, e.g. the command line tools) commits to
+the database file. Views compare it to skip reloads when nothing was written.
+
+Tables registered with track_rows() are also tracked row by row: listeners
+added with subscribe_rows() learn which keys were inserted, updated (with the
+changed columns) or deleted. Writes that don't say which rows they touched
+(bulk statements, mark_changed) are reported as unknown.
+"""
+import sqlite3
+import threading
+from collections import defaultdict
+from sqlalchemy import event, inspect
+
+_PENDING_KEY = "change_tracker_pending_tables"
+_PENDING_ROWS_KEY = "change_tracker_pending_rows"
+# Execution option listing the keys a bulk statement touches, e.g. delete(...).where(id.in_(ids))
+CHANGED_ROWS_OPTION = "changed_rows"
+
+
+class ChangeTracker:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._lock = threading.Lock()
+        self._versions = defaultdict(int)
+        self._listeners = []
+        self._commits = 0
+        self._watch_conn = None
+        self._data_version = None
+        self._external_writes = 0
+        self._row_keys = {}       # table -> attribute/column reported as the row key
+        self._row_listeners = []
+
+    # --- Public API ---
+    def version(self, *tables):
+        """Returns a number that changes whenever any of the given tables gets a committed write."""
+        with self._lock:
+            return sum(self._versions[t] for t in tables)
+
+    def data_sequence(self):
+        """
+        Returns a value that changes after every committed write: (in-process commits, PRAGMA data_version).
+        data_version is None until watch() was called.
+        """
+        with self._lock:
+            return self._commits, self._read_data_version()
+
+    def external_writes(self):
+        """
+        Counts commits seen through data_version that no tracked session reported
+        (other processes, raw connections). Caches that only follow tracked
+        writes drop everything when this number moves.
+        """
+        with self._lock:
+            self._read_data_version()
+            return self._external_writes
+
+    def _read_data_version(self, tracked=False):
+        """Reads PRAGMA data_version (lock held); a change not explained by a tracked commit counts as external."""
+        if self._watch_conn is None: return None
+        try: data_version = self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Could not read data_version: {e}")
+            return None
+        if not tracked and self._data_version is not None and data_version != self._data_version:
+            self._external_writes += 1
+        self._data_version = data_version
+        return data_version
+
+    def watch(self, db_path):
+        """Opens the connection data_sequence() reads PRAGMA data_version from. It is never written through."""
+        with self._lock:
+            if self._watch_conn is not None: self._watch_conn.close()
+            self._watch_conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._data_version = None
+            self._read_data_version()
+
+    def subscribe(self, callback):
+        """Registers callback(tables: set) to run after each commit that touched tables."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._listeners: self._listeners.remove(callback)
+            if callback in self._row_listeners: self._row_listeners.remove(callback)
+
+    def track_rows(self, table, key="id"):
+        """Tracks `table` row by row, reporting each row's `key` attribute (e.g. engineer_id for child tables)."""
+        with self._lock:
+            self._row_keys[table] = key
+
+    def subscribe_rows(self, callback):
+        """
+        Registers callback(tables: set, rows: dict) to run after each commit that touched tables.
+        rows maps each row-tracked table whose changes are all known to a list of
+        (op, key, columns) with op "insert", "update" or "delete"; columns is the set
+        of changed column attributes for updates, else None. Touched tables missing
+        from rows changed in unknown ways.
+        """
+        with self._lock:
+            self._row_listeners.append(callback)
+
+    def mark_changed(self, *tables):
+        """Records a committed write done outside the ORM session (raw SQL, other services)."""
+        self._bump(set(tables))
+
+    def install(self, session_factory):
+        """Attaches the tracking events to a sessionmaker (or Session class)."""
+        # Checked on the target itself: an id() of a collected sessionmaker can be reused by a new one
+        if event.contains(session_factory, "after_commit", self._after_commit): return
+        event.listen(session_factory, "after_flush", self._after_flush)
+        event.listen(session_factory, "do_orm_execute", self._on_orm_execute)
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_rollback", self._after_rollback)
+
+    # --- Event Handlers ---
+    def _pending(self, session):
+        return session.info.setdefault(_PENDING_KEY, set())
+
+    def _pending_rows(self, session):
+        """{table: list of (op, key, columns), or None once a change to it is unknown}"""
+        return session.info.setdefault(_PENDING_ROWS_KEY, {})
+
+    def _record_row(self, session, table, op, key, columns=None):
+        rows = self._pending_rows(session)
+        if key is None: rows[table] = None # Can't tell which row
+        elif rows.setdefault(table, []) is not None: rows[table].append((op, key, columns))
+
+    def _after_flush(self, session, flush_context):
+        pending = self._pending(session)
+        for op, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+            for obj in list(objects):
+                table = getattr(obj, "__tablename__", None)
+                if not table: continue
+                pending.add(table)
+                key_attr = self._row_keys.get(table)
+                if key_attr is None: continue
+                state = inspect(obj)
+                columns = None
+                if op == "update":
+                    columns = {attr.key for attr in state.mapper.column_attrs if state.attrs[attr.key].history.has_changes()}
+                self._record_row(session, table, op, state.dict.get(key_attr), columns)
+
+    def _on_orm_execute(self, orm_execute_state):
+        if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+            table = getattr(orm_execute_state.statement, "table", None)
+            name = getattr(table, "name", None)
+            if not name: return
+            session = orm_execute_state.session
+            self._pending(session).add(name)
+            key_attr = self._row_keys.get(name)
+            if key_attr is None: return
+            op = "insert" if orm_execute_state.is_insert else "update" if orm_execute_state.is_update else "delete"
+            keys = orm_execute_state.execution_options.get(CHANGED_ROWS_OPTION)
+            if keys is None and orm_execute_state.is_insert:
+                # INSERT (or upsert) with parameter dicts names its rows
+                params = orm_execute_state.parameters
+                params = params if isinstance(params, list) else [params or {}]
+                keys = [p.get(key_attr) for p in params]
+            if keys is None:
+                self._record_row(session, name, op, None)
+                return
+            for key in keys: self._record_row(session, name, op, key)
+
+    def _after_commit(self, session):
+        tables = session.info.pop(_PENDING_KEY, None)
+        rows = session.info.pop(_PENDING_ROWS_KEY, None) or {}
+        if tables: self._bump(tables, {t: r for t, r in rows.items() if r is not None}, tracked=True)
+
+    def _after_rollback(self, session):
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_PENDING_ROWS_KEY, None)
+
+    def _bump(self, tables, rows=None, tracked=False):
+        with self._lock:
+            self._commits += 1
+            for t in tables: self._versions[t] += 1
+            if tracked: self._read_data_version(tracked=True) # This commit already moved data_version
+            listeners = list(self._listeners)
+            row_listeners = list(self._row_listeners)
+        for callback in listeners:
+            try: callback(set(tables))
+            except Exception as e: print(f"Change listener error: {e}")
+        for callback in row_listeners:
+            try: callback(set(tables), dict(rows or {}))
+            except Exception as e: print(f"Change listener error: {e}")
+
+
+# Create a singleton instance
+change_tracker = ChangeTracker()
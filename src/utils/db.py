@@ -1,19 +1,196 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, scoped_session
 from src.models import Base
+from src.utils.migrations import run_migrations
+from src.utils.change_tracker import change_tracker
 
 DB_FILE = "engineers.db"
 
-def init_database():
-    # Create database engine
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), DB_FILE)
+# Set up by init_database()
+_session_factory = None
+_scoped_session = None
+
+# Environment variable used to pick a connection profile (e.g. ENGINEERS_DB_PROFILE=fast-read)
+DB_PROFILE_ENV = "ENGINEERS_DB_PROFILE"
+DEFAULT_DB_PROFILE = "balanced"
+
+# Named SQLite connection profiles, applied as PRAGMAs on every new connection.
+# cache_size is negative = KiB (SQLite convention), mmap_size is in bytes, busy_timeout in ms.
+DB_PROFILES = {
+    # Durable commits (fsync on every transaction), small memory footprint
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,          # ~8 MB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    # WAL + NORMAL sync is still crash-safe for the DB file, only the last commit may be lost on power failure
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -32000,         # ~32 MB
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Large page cache and mmap for browsing/reporting over big tables
+    "fast-read": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -131072,        # ~128 MB
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+# Order matters: journal_mode first so later pragmas apply to the final journal setup
+_PRAGMA_ORDER = ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout")
+
+
+def get_db_path():
+    """Returns the absolute path of the application database file."""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), DB_FILE)
+
+
+def resolve_db_profile(profile=None):
+    """
+    Resolves the PRAGMA settings to use.
+
+    `profile` may be a preset name, a dict of pragma overrides, or None. A dict can
+    name its base preset under the "profile" key; unknown keys are ignored. When no
+    profile is given, the ENGINEERS_DB_PROFILE environment variable is consulted,
+    then DEFAULT_DB_PROFILE.
+    """
+    overrides = {}
+    if isinstance(profile, dict):
+        overrides = {k: v for k, v in profile.items() if k in _PRAGMA_ORDER}
+        profile = profile.get("profile")
+    name = (profile or os.environ.get(DB_PROFILE_ENV) or DEFAULT_DB_PROFILE).strip().lower()
+    if name not in DB_PROFILES:
+        print(f"Warning: Unknown DB profile '{name}', falling back to '{DEFAULT_DB_PROFILE}'.")
+        name = DEFAULT_DB_PROFILE
+    settings = dict(DB_PROFILES[name])
+    settings.update(overrides)
+    return name, settings
+
+
+def _apply_pragmas(dbapi_connection, settings):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _PRAGMA_ORDER:
+            value = settings.get(pragma)
+            if value is None: continue
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(db_path=None, profile=None):
+    """Creates the SQLAlchemy engine with the chosen connection profile applied on connect."""
+    db_path = db_path or get_db_path()
+    profile_name, settings = resolve_db_profile(profile)
     engine = create_engine(f'sqlite:///{db_path}')
-    
-    # Create tables only if they don't exist
-    if not os.path.exists(db_path):
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _apply_pragmas(dbapi_connection, settings)
+
+    print(f"Database profile: {profile_name}")
+    return engine
+
+
+def init_database(profile=None):
+    """
+    Opens (creating or migrating as needed) the application database and returns
+    the session factory. Use short-lived sessions from it, see session_scope().
+    """
+    global _session_factory, _scoped_session
+    # Create database engine
+    db_path = get_db_path()
+    engine = create_db_engine(db_path, profile)
+
+    # New files are built from the models, existing files are upgraded in place.
+    # Migrations run in both cases (they also create objects the models can't express, e.g. FTS tables).
+    is_new_file = not os.path.exists(db_path)
+    if is_new_file:
         Base.metadata.create_all(engine)
-    
-    # Create session
-    Session = sessionmaker(bind=engine)
-    return Session()
+    run_migrations(engine)
+    if not is_new_file:
+        Base.metadata.create_all(engine) # Adds any tables introduced since the file was created
+
+    # Create session factory
+    _session_factory = sessionmaker(bind=engine)
+    change_tracker.install(_session_factory) # Lets caches see committed writes
+    change_tracker.watch(db_path) # ...and writes by other connections and processes
+    _scoped_session = scoped_session(_session_factory)
+    return _session_factory
+
+
+def get_session_factory():
+    """Returns the sessionmaker created by init_database()."""
+    if _session_factory is None:
+        raise RuntimeError("init_database() must be called before using the session factory.")
+    return _session_factory
+
+
+def get_engine():
+    """Returns the engine behind the session factory."""
+    return get_session_factory().kw["bind"]
+
+
+def get_scoped_session():
+    """Returns the calling thread's session (one per thread, reused until remove_scoped_session())."""
+    if _scoped_session is None:
+        raise RuntimeError("init_database() must be called before using scoped sessions.")
+    return _scoped_session()
+
+
+def remove_scoped_session():
+    """Closes and forgets the calling thread's scoped session."""
+    if _scoped_session is not None:
+        _scoped_session.remove()
+
+
+@contextmanager
+def session_scope(session_factory=None):
+    """
+    Per-task session: commits on success, rolls back on error, always closes.
+
+        with session_scope() as session:
+            session.add(engineer)
+    """
+    session = (session_factory or get_session_factory())()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+@contextmanager
+def count_statements(session):
+    """
+    Counts the SQL statements `session` sends to the database inside the block.
+
+        with count_statements(session) as counter:
+            session.commit()
+        print(counter["count"])
+    """
+    counter = {"count": 0}
+    connection = session.connection() # The connection the session's transaction runs on
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if conn is connection: counter["count"] += 1
+    engine = connection.engine
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
@@ -0,0 +1,304 @@
+"""
+Versioned schema migrations for engineers.db.
+
+The schema version is stored in SQLite's PRAGMA user_version. Each migration is a
+(version, description, function) entry in MIGRATIONS; the function receives a raw
+sqlite3 connection and runs inside a single transaction together with the
+version bump, so a failed migration leaves the file at the previous version.
+
+New files are created from the models and then run through every migration, so
+migrations must be idempotent on a schema that already matches the models
+(IF NOT EXISTS, column checks, ...). They also carry the schema objects the
+models cannot express, such as FTS tables and triggers.
+"""
+import re
+import traceback
+from src.utils.numbers import parse_number
+from src.utils.schema import (
+    ENGINEER_CHILD_TABLES, create_search_index, drop_search_triggers, create_search_triggers, create_engineer_stats,
+    create_companies, create_combination_tables, create_combination_departures, combination_trigger_statements,
+    create_engineer_versions, create_attachment_table, create_attachment_health, search_deferred, resume_search_index,
+    VERSIONS_TABLE,
+)
+
+# Text columns converted to numbers by migration 4: table -> {column: (SQL type, integer?)}
+NUMERIC_COLUMNS = {
+    "technical_sector_participation": {"participation_days": ("INTEGER", True)},
+    "job_sector_participation": {"participation_days": ("INTEGER", True)},
+    "specialized_field_participation": {"participation_days": ("INTEGER", True)},
+    "construction_type_participation": {"participation_days": ("INTEGER", True)},
+    "sanctions": {"penalty_points": ("FLOAT", False)},
+    "project_details": {"contract_amount": ("INTEGER", True)},
+}
+
+# Engineer columns used by EngineerTable for filtering/sorting
+ENGINEER_INDEXED_COLUMNS = ("name", "company_name", "field_name", "evaluation_target", "date_of_birth", "selected")
+
+# Indexes for the Projects page (same as ProjectDetail.__table_args__): name -> columns
+PROJECT_INDEXES = {
+    "ix_project_details_contract_date": ("contract_date",),
+    "ix_project_details_contract_number_engineer_id": ("contract_number", "engineer_id"),
+    "ix_project_details_client_contract_date": ("client", "contract_date"),
+    "ix_project_details_construction_type_contract_date": ("construction_type", "contract_date"),
+    "ix_project_details_technical_sector_contract_date": ("technical_sector", "contract_date"),
+    "ix_project_details_equity_ratio": ("equity_ratio",),
+}
+
+
+def _table_exists(conn, table_name):
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,)).fetchone()
+    return row is not None
+
+
+# --- Migrations ---
+# Index names follow SQLAlchemy's index=True convention (ix_<table>_<column>) so
+# files created by Base.metadata.create_all and migrated files end up identical.
+
+def _add_fk_and_filter_indexes(conn):
+    for table in ENGINEER_CHILD_TABLES:
+        if _table_exists(conn, table):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_engineer_id ON {table} (engineer_id)")
+    if _table_exists(conn, "engineers"):
+        for column in ENGINEER_INDEXED_COLUMNS:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_engineers_{column} ON engineers ({column})")
+
+
+def _add_search_index(conn):
+    create_search_index(conn)
+
+
+def _add_import_jobs(conn):
+    # Progress of bulk imports (src/services/importer.py); records_committed advances in
+    # the same transaction as each imported batch, which is what makes resuming exact
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS import_jobs ("
+        " id INTEGER PRIMARY KEY,"
+        " source_path TEXT NOT NULL,"
+        " source_size INTEGER NOT NULL,"
+        " source_mtime REAL NOT NULL,"
+        " target TEXT NOT NULL,"
+        " records_committed INTEGER NOT NULL DEFAULT 0,"
+        " rows_inserted INTEGER NOT NULL DEFAULT 0,"
+        " status TEXT NOT NULL DEFAULT 'running',"
+        " error TEXT,"
+        " started_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,"
+        " updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_import_jobs_source ON import_jobs (source_path, source_size, source_mtime)")
+
+
+def _declared_types(conn, table):
+    return {row[1]: (row[2] or "").upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _retype_table(conn, table, columns):
+    """
+    Changes declared column types with SQLite's table rebuild procedure (create new
+    table, copy, drop, rename, recreate indexes). Returns False if nothing to do.
+    """
+    declared = _declared_types(conn, table)
+    changes = {c: t for c, (t, _) in columns.items() if c in declared and declared[c] != t}
+    if not changes: return False
+    create_sql = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()[0]
+    index_sql = [row[0] for row in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL", (table,))]
+    new_table = f"{table}__retyped"
+    new_sql = re.sub(rf'^CREATE TABLE\s+"?{table}"?', f'CREATE TABLE "{new_table}"', create_sql, count=1)
+    for column, sql_type in changes.items():
+        new_sql, n = re.subn(rf'(\(|,)(\s*"?{column}"?\s+)[A-Za-z]+(\(\d+\))?', rf"\g<1>\g<2>{sql_type}", new_sql, count=1)
+        if n != 1: raise RuntimeError(f"Could not find column {table}.{column} in its CREATE TABLE statement")
+    conn.execute(new_sql)
+    # Same column order, so a plain copy works; numeric affinity converts clean numbers like '540'
+    conn.execute(f'INSERT INTO "{new_table}" SELECT * FROM "{table}"')
+    conn.execute(f'DROP TABLE "{table}"')
+    conn.execute(f'ALTER TABLE "{new_table}" RENAME TO "{table}"')
+    for sql in index_sql: conn.execute(sql)
+    return True
+
+
+def _normalize_numeric_text(conn, table, column, integer):
+    """
+    Parses values the copy could not convert ('1,200', '540 days'). Unparseable text becomes
+    NULL, its original value is kept in numeric_conversion_rejects. Returns the number rejected.
+    """
+    rows = conn.execute(f"SELECT id, {column} FROM {table} WHERE typeof({column}) = 'text'").fetchall()
+    updates, rejects = [], []
+    for row_id, value in rows:
+        try: number = parse_number(value, integer=integer)
+        except ValueError: number = None; rejects.append((table, column, row_id, value))
+        updates.append((number, row_id))
+    if updates: conn.executemany(f"UPDATE {table} SET {column} = ? WHERE id = ?", updates)
+    if rejects:
+        conn.executemany("INSERT INTO numeric_conversion_rejects (table_name, column_name, row_id, value) VALUES (?, ?, ?, ?)", rejects)
+        print(f"  {table}.{column}: {len(rejects)} non-numeric values set to NULL")
+    return len(rejects)
+
+
+def _convert_numeric_columns(conn):
+    # Text that is not a number can't be stored in the retyped columns; keep it here instead of losing it
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS numeric_conversion_rejects ("
+        " id INTEGER PRIMARY KEY,"
+        " table_name TEXT NOT NULL,"
+        " column_name TEXT NOT NULL,"
+        " row_id INTEGER NOT NULL,"
+        " value TEXT,"
+        " converted_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    )
+    # The search triggers reference these tables; drop them so the rebuild can rename freely
+    drop_search_triggers(conn)
+    rejected = 0
+    for table, columns in NUMERIC_COLUMNS.items():
+        if not _table_exists(conn, table): continue
+        _retype_table(conn, table, columns)
+        for column, (_, integer) in columns.items():
+            rejected += _normalize_numeric_text(conn, table, column, integer)
+    create_search_triggers(conn)
+    if rejected: print(f"  {rejected} values could not be read as numbers; originals are in numeric_conversion_rejects")
+
+
+def _add_engineer_stats(conn):
+    create_engineer_stats(conn)
+
+
+def _add_companies(conn):
+    # Recreate the search triggers so they fire only for the columns they index (the
+    # company triggers write company_id back into the rows they watch)
+    drop_search_triggers(conn)
+    create_search_triggers(conn)
+    create_companies(conn)
+
+
+def _add_project_indexes(conn):
+    if not _table_exists(conn, "project_details"): return
+    for name, columns in PROJECT_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON project_details ({', '.join(columns)})")
+
+
+def _add_saved_combinations(conn):
+    create_combination_tables(conn)
+
+
+def _add_engineer_versions(conn):
+    create_engineer_versions(conn)
+
+
+def _add_attachments(conn):
+    create_attachment_table(conn)
+
+
+def _add_attachment_health(conn):
+    create_attachment_health(conn)
+
+
+def _add_import_id_map(conn):
+    # Engineer ids found in import files -> ids they were stored under, per source directory,
+    # so CSV child tables exported next to engineers.csv follow their (possibly renumbered) engineer
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS import_id_map ("
+        " source TEXT NOT NULL,"
+        " source_id INTEGER NOT NULL,"
+        " engineer_id INTEGER NOT NULL,"
+        " PRIMARY KEY (source, source_id))"
+    )
+
+
+def _keep_deleted_engineer_versions(conn):
+    # A reused engineer id must not start again at a version the report cache has seen
+    for suffix in ("ai", "ad"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {VERSIONS_TABLE}_engineers_{suffix}")
+    create_engineer_versions(conn)
+
+
+def _detach_deleted_combination_members(conn):
+    # Member rows of engineers deleted before this migration still point at their (reusable) id
+    create_combination_departures(conn)
+    conn.execute(
+        "INSERT INTO saved_combination_departures (combination_id, engineer_id) "
+        "SELECT combination_id, engineer_id FROM saved_combination_members "
+        "WHERE engineer_id NOT IN (SELECT id FROM engineers)"
+    )
+    conn.execute(
+        "UPDATE saved_combinations SET needs_evaluation = 1 WHERE id IN "
+        "(SELECT combination_id FROM saved_combination_members WHERE engineer_id NOT IN (SELECT id FROM engineers))"
+    )
+    conn.execute("DELETE FROM saved_combination_members WHERE engineer_id NOT IN (SELECT id FROM engineers)")
+    conn.execute("DROP TRIGGER IF EXISTS saved_combinations_engineers_ad")
+    for statement in combination_trigger_statements():
+        conn.execute(statement)
+
+
+MIGRATIONS = [
+    (1, "Index engineer_id foreign keys and engineer filter/sort columns", _add_fk_and_filter_indexes),
+    (2, "Full-text search index over engineers and career records", _add_search_index),
+    (3, "Bulk import job tracking", _add_import_jobs),
+    (4, "Numeric participation days, penalty points and contract amounts", _convert_numeric_columns),
+    (5, "Per-engineer aggregate table maintained by triggers", _add_engineer_stats),
+    (6, "Normalized companies table linked from engineers, projects and workplaces", _add_companies),
+    (7, "Indexes for browsing and filtering projects", _add_project_indexes),
+    (8, "Saved team combinations with re-evaluation triggers", _add_saved_combinations),
+    (9, "Per-engineer row versions for the report cache", _add_engineer_versions),
+    (10, "Content-addressed attachment store for engineer PDF files", _add_attachments),
+    (11, "Cached attachment file checks for the engineer grid", _add_attachment_health),
+    (12, "Engineer id mapping for imports into non-empty databases", _add_import_id_map),
+    (13, "Keep row versions of deleted engineers so reused ids get new versions", _keep_deleted_engineer_versions),
+    (14, "Detach saved combination members whose engineer was deleted", _detach_deleted_combination_members),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Returns the schema version stored in the database file."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _set_schema_version(conn, version):
+    # PRAGMA does not accept bound parameters; version is always an int from MIGRATIONS
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def run_migrations(engine):
+    """
+    Upgrades the database file in place to LATEST_VERSION.
+
+    Returns the list of applied migration versions. Raises the underlying error if
+    a migration fails; earlier migrations stay committed.
+    """
+    applied = []
+    raw = engine.raw_connection()
+    conn = raw.driver_connection
+    # Take manual control of transactions so DDL is covered by BEGIN/COMMIT too
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        current = get_schema_version(conn)
+        for version, description, migrate in MIGRATIONS:
+            if version <= current: continue
+            print(f"Applying migration {version}: {description}")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                migrate(conn)
+                _set_schema_version(conn, version)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                print(f"Migration {version} failed, database left at version {current}.")
+                traceback.print_exc()
+                raise
+            current = version
+            applied.append(version)
+        # An import that died left the search index deferred; catch it up
+        if search_deferred(conn):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                refreshed = resume_search_index(conn)
+                conn.execute("COMMIT")
+                print(f"Search index: refreshed {len(refreshed)} documents left by an interrupted import")
+            except Exception:
+                conn.execute("ROLLBACK")
+                traceback.print_exc()
+    finally:
+        conn.isolation_level = previous_isolation
+        raw.close()
+    return applied
@@ -0,0 +1,49 @@
+"""Parsing of numbers typed by users or found in imported/legacy text ("1,200", "540 days")."""
+import re
+from sqlalchemy import false
+
+# Unit suffixes allowed after a number: days, amounts (won) and penalty points
+UNITS = ("일", "days", "day", "원", "점", "points")
+
+# The whole value must be one number: digits with optional thousands separators
+# (groups of three), an optional decimal part and one of UNITS
+_NUMBER = re.compile(
+    r"(?P<number>[-+]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?|[-+]?\.\d+)"
+    r"\s*(?:" + "|".join(re.escape(u) for u in UNITS) + r")?",
+    re.IGNORECASE,
+)
+
+
+def parse_number(value, integer=False):
+    """
+    Returns `value` as int/float, or None for empty input.
+    Raises ValueError unless the whole text is a number ("1,200", "540일" and "540 days" are;
+    "2020-01-05", "1,2,3" and "3 years 6 months" are not).
+    """
+    if value is None: return None
+    if isinstance(value, bool): return int(value)
+    if isinstance(value, (int, float)): return int(round(value)) if integer else value
+    text = str(value).strip()
+    if not text: return None
+    match = _NUMBER.fullmatch(text)
+    if match is None: raise ValueError(f"not a number: {value!r}")
+    digits = match.group("number")
+    number = float(digits.replace(",", ""))
+    if integer: return int(round(number))
+    return int(number) if number.is_integer() and "." not in digits else number
+
+
+def numeric_filter_clause(column, filter_value):
+    """Filter text for a numeric column: "5" (equal), ">5", ">=5", "<5", "<=5" or a range "5-10". No match if invalid."""
+    text = str(filter_value).replace(" ", "")
+    try:
+        for op in (">=", "<=", ">", "<"):
+            if text.startswith(op):
+                value = float(text[len(op):])
+                return {">=": column >= value, "<=": column <= value, ">": column > value, "<": column < value}[op]
+        range_match = re.fullmatch(r"(-?[\d.]+)-(-?[\d.]+)", text)
+        if range_match:
+            return column.between(float(range_match.group(1)), float(range_match.group(2)))
+        return column == float(text)
+    except ValueError:
+        return false()
@@ -0,0 +1,588 @@
+"""
+Schema objects the models cannot express: FTS tables, aggregate and version
+tables, and the triggers that keep them in sync.
+
+The builders here work on raw sqlite3 connections and are idempotent, so
+migrations run them on old and new files alike; the services import the table
+names and helpers they query with from this module.
+"""
+
+# Child tables that reference engineers.id
+ENGINEER_CHILD_TABLES = (
+    "technical_grades", "qualifications", "education", "technical_sector_participation",
+    "job_sector_participation", "specialized_field_participation", "construction_type_participation",
+    "education_and_training", "awards", "sanctions", "workplace", "project_details",
+)
+
+
+def _column_exists(conn, table, column):
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_info({table})"))
+
+
+# --- Full-text search (engineer_search) ---
+
+FTS_TABLE = "engineer_search"
+# Engineers whose document is stale while the index is deferred (bulk imports)
+SEARCH_PENDING_TABLE = "engineer_search_pending"
+
+# Searchable text per child table (all linked through engineer_id)
+CAREER_SOURCES = {
+    "technical_grades": ("grade_type", "field", "grade"),
+    "qualifications": ("title", "registration_number"),
+    "education": ("school_name", "major", "degree"),
+    "technical_sector_participation": ("technical_sector",),
+    "job_sector_participation": ("job",),
+    "specialized_field_participation": ("specialized_field",),
+    "construction_type_participation": ("construction_type",),
+    "education_and_training": ("course_name", "institution_name", "training_field"),
+    "awards": ("type_and_basis", "awarding_institution"),
+    "sanctions": ("type", "basis", "sanctioning_institution"),
+    "workplace": ("workplace_company_name",),
+    "project_details": ("service_name", "service_overview", "client", "company_name", "construction_type",
+                        "technical_sector", "specialized_field", "position"),
+}
+
+# Engineer columns that make up the document (updates of other columns don't touch the index)
+ENGINEER_SOURCE_COLUMNS = ("name", "company_name", "field_name", "evaluation_target", "position_and_rank", "experience")
+
+# FTS columns and their bm25 weights (a hit in the name outranks a hit deep in the career text)
+FTS_COLUMNS = (
+    ("name", 10.0),
+    ("company_name", 4.0),
+    ("profile", 3.0),    # field_name, evaluation_target, position_and_rank, experience
+    ("career", 1.0),     # everything from CAREER_SOURCES
+)
+
+
+def _concat(columns, prefix=""):
+    return " || ' ' || ".join(f"coalesce({prefix}{c}, '')" for c in columns)
+
+
+def _document_select(engineer_id_expr=None):
+    """
+    SELECT producing FTS rows: for one engineer (engineer_id_expr is SQL, e.g. NEW.engineer_id)
+    or for all engineers when engineer_id_expr is None.
+    """
+    career = " || ' ' || ".join(
+        f"coalesce((SELECT group_concat({_concat(cols)}, ' ') FROM {table} WHERE engineer_id = e.id), '')"
+        for table, cols in CAREER_SOURCES.items()
+    )
+    profile = _concat(("field_name", "evaluation_target", "position_and_rank", "experience"), "e.")
+    where = f" WHERE e.id = {engineer_id_expr}" if engineer_id_expr is not None else ""
+    return (
+        f"SELECT e.id, coalesce(e.name, ''), coalesce(e.company_name, ''), {profile}, {career} "
+        f"FROM engineers e{where}"
+    )
+
+
+def _refresh_sql(engineer_id_expr):
+    return (
+        f"DELETE FROM {FTS_TABLE} WHERE rowid = {engineer_id_expr}; "
+        f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(c for c, _ in FTS_COLUMNS)}) {_document_select(engineer_id_expr)};"
+    )
+
+
+def search_schema_statements():
+    """DDL for the FTS table and its sync triggers (idempotent)."""
+    columns = ", ".join(c for c, _ in FTS_COLUMNS)
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({columns}, tokenize = 'unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_engineers_ai AFTER INSERT ON engineers BEGIN {_refresh_sql('NEW.id')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_engineers_au AFTER UPDATE OF {', '.join(ENGINEER_SOURCE_COLUMNS)} ON engineers BEGIN {_refresh_sql('NEW.id')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_engineers_ad AFTER DELETE ON engineers BEGIN DELETE FROM {FTS_TABLE} WHERE rowid = OLD.id; END",
+    ]
+    for table, columns in CAREER_SOURCES.items():
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{table}_ai AFTER INSERT ON {table} BEGIN {_refresh_sql('NEW.engineer_id')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{table}_ad AFTER DELETE ON {table} BEGIN {_refresh_sql('OLD.engineer_id')} END",
+            # An update may move a row to another engineer: refresh both sides
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{table}_au AFTER UPDATE OF {', '.join(('engineer_id',) + columns)} ON {table} BEGIN "
+            f"{_refresh_sql('OLD.engineer_id')} {_refresh_sql('NEW.engineer_id')} END",
+        ]
+    return statements
+
+
+def search_trigger_names(prefix=FTS_TABLE):
+    """Names of the triggers that keep the FTS index in sync (prefix=SEARCH_PENDING_TABLE: the deferred ones)."""
+    names = [f"{prefix}_engineers_{suffix}" for suffix in ("ai", "au", "ad")]
+    for table in CAREER_SOURCES:
+        names += [f"{prefix}_{table}_{suffix}" for suffix in ("ai", "ad", "au")]
+    return names
+
+
+def drop_search_triggers(conn):
+    """
+    Drops the sync triggers so bulk writes don't rebuild a document per inserted row.
+    Only use inside a transaction that ends with refresh_search_documents() and
+    create_search_triggers() before COMMIT.
+    """
+    for name in search_trigger_names():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def create_search_triggers(conn):
+    """(Re)creates the sync triggers (idempotent)."""
+    for statement in search_schema_statements()[1:]:
+        conn.execute(statement)
+
+
+def _pending_sql(engineer_id_expr):
+    return (f"INSERT OR IGNORE INTO {SEARCH_PENDING_TABLE} (engineer_id) "
+            f"SELECT {engineer_id_expr} WHERE {engineer_id_expr} IS NOT NULL;")
+
+
+def deferred_search_statements():
+    """DDL for the pending table and the triggers that only record which documents went stale (idempotent)."""
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {SEARCH_PENDING_TABLE} (engineer_id INTEGER NOT NULL PRIMARY KEY)",
+        f"CREATE TRIGGER IF NOT EXISTS {SEARCH_PENDING_TABLE}_engineers_ai AFTER INSERT ON engineers BEGIN {_pending_sql('NEW.id')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {SEARCH_PENDING_TABLE}_engineers_au AFTER UPDATE OF {', '.join(ENGINEER_SOURCE_COLUMNS)} ON engineers BEGIN {_pending_sql('NEW.id')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {SEARCH_PENDING_TABLE}_engineers_ad AFTER DELETE ON engineers BEGIN {_pending_sql('OLD.id')} END",
+    ]
+    for table, columns in CAREER_SOURCES.items():
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {SEARCH_PENDING_TABLE}_{table}_ai AFTER INSERT ON {table} BEGIN {_pending_sql('NEW.engineer_id')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {SEARCH_PENDING_TABLE}_{table}_ad AFTER DELETE ON {table} BEGIN {_pending_sql('OLD.engineer_id')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {SEARCH_PENDING_TABLE}_{table}_au AFTER UPDATE OF {', '.join(('engineer_id',) + columns)} ON {table} BEGIN "
+            f"{_pending_sql('OLD.engineer_id')} {_pending_sql('NEW.engineer_id')} END",
+        ]
+    return statements
+
+
+def search_deferred(conn):
+    """True while the index is in deferred mode (see defer_search_index)."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+                       (f"{SEARCH_PENDING_TABLE}_engineers_ai",)).fetchone()
+    return row is not None
+
+
+def defer_search_index(conn):
+    """
+    Swaps the sync triggers for triggers that only record the engineer ids whose
+    document went stale, so a long bulk write (an import) neither rebuilds a
+    document per row nor needs trigger DDL per transaction. Writes from other
+    connections in the meantime are recorded too. resume_search_index() brings
+    the index up to date and puts the sync triggers back; it is safe to call at
+    any time, also while another connection still writes.
+    """
+    drop_search_triggers(conn)
+    for statement in deferred_search_statements():
+        conn.execute(statement)
+
+
+def resume_search_index(conn):
+    """Refreshes the documents recorded while deferred and restores the sync triggers. Returns the refreshed ids."""
+    ids = []
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (SEARCH_PENDING_TABLE,)).fetchone():
+        ids = [row[0] for row in conn.execute(f"SELECT engineer_id FROM {SEARCH_PENDING_TABLE}")]
+        refresh_search_documents(conn, ids)
+        conn.execute(f"DELETE FROM {SEARCH_PENDING_TABLE}")
+    for name in search_trigger_names(SEARCH_PENDING_TABLE):
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    create_search_triggers(conn)
+    return ids
+
+
+def refresh_search_documents(conn, engineer_ids, chunk_size=500):
+    """Rebuilds the search documents of the given engineers on a raw sqlite3 connection."""
+    ids = sorted(set(engineer_ids))
+    columns = ", ".join(c for c, _ in FTS_COLUMNS)
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        marks = ", ".join("?" * len(chunk))
+        conn.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marks})", chunk)
+        conn.execute(f"INSERT INTO {FTS_TABLE} (rowid, {columns}) {_document_select()} WHERE e.id IN ({marks})", chunk)
+
+
+def create_search_index(conn):
+    """Creates the FTS table/triggers on a raw sqlite3 connection and fills it. Used by the migration."""
+    for statement in search_schema_statements():
+        conn.execute(statement)
+    fill_search_index(conn)
+
+
+def fill_search_index(conn):
+    """Recreates every search document on a raw sqlite3 connection."""
+    columns = ", ".join(c for c, _ in FTS_COLUMNS)
+    conn.execute(f"DELETE FROM {FTS_TABLE}")
+    conn.execute(f"INSERT INTO {FTS_TABLE} (rowid, {columns}) {_document_select()}")
+    conn.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+
+
+# --- Aggregates (engineer_stats) ---
+
+STATS_TABLE = "engineer_stats"
+
+# Aggregate columns and their SQL types
+STATS_COLUMNS = (
+    ("project_count", "INTEGER"),
+    ("qualification_count", "INTEGER"),
+    ("participation_days", "INTEGER"),
+    ("contract_amount", "INTEGER"),
+    ("penalty_points", "FLOAT"),
+)
+# Indexed columns (the sortable ones in EngineerTable)
+STATS_INDEXED_COLUMNS = ("project_count", "qualification_count", "participation_days")
+
+# What each child row contributes: table -> {stats column: expression over the row}
+# ("{row}" is replaced with NEW/OLD in triggers and with the table name in rebuilds)
+STATS_SOURCES = {
+    "project_details": {"project_count": "1", "contract_amount": "{row}.contract_amount"},
+    "qualifications": {"qualification_count": "1"},
+    "technical_sector_participation": {"participation_days": "{row}.participation_days"},
+    "job_sector_participation": {"participation_days": "{row}.participation_days"},
+    "specialized_field_participation": {"participation_days": "{row}.participation_days"},
+    "construction_type_participation": {"participation_days": "{row}.participation_days"},
+    "sanctions": {"penalty_points": "{row}.penalty_points"},
+}
+
+
+def _watched_columns(contributions):
+    """Columns whose update changes the contribution of a row."""
+    columns = {"engineer_id"}
+    for expr in contributions.values():
+        if "{row}." in expr: columns.add(expr.split("{row}.")[1])
+    return sorted(columns)
+
+
+def _apply_sql(contributions, row, sign):
+    assignments = ", ".join(
+        f"{column} = {column} {sign} coalesce({expr.format(row=row)}, 0)" for column, expr in contributions.items()
+    )
+    return f"UPDATE {STATS_TABLE} SET {assignments} WHERE engineer_id = {row}.engineer_id;"
+
+
+def _ensure_row_sql(row):
+    return f"INSERT OR IGNORE INTO {STATS_TABLE} (engineer_id) SELECT {row}.engineer_id WHERE {row}.engineer_id IS NOT NULL;"
+
+
+def stats_schema_statements():
+    """DDL for the stats table, its indexes and the maintenance triggers (idempotent)."""
+    columns = ", ".join(f"{name} {sql_type} NOT NULL DEFAULT 0" for name, sql_type in STATS_COLUMNS)
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {STATS_TABLE} (engineer_id INTEGER NOT NULL PRIMARY KEY REFERENCES engineers (id), {columns})",
+    ]
+    statements += [f"CREATE INDEX IF NOT EXISTS ix_{STATS_TABLE}_{c} ON {STATS_TABLE} ({c})" for c in STATS_INDEXED_COLUMNS]
+    statements += [
+        f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_engineers_ai AFTER INSERT ON engineers BEGIN "
+        f"INSERT OR IGNORE INTO {STATS_TABLE} (engineer_id) VALUES (NEW.id); END",
+        f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_engineers_ad AFTER DELETE ON engineers BEGIN "
+        f"DELETE FROM {STATS_TABLE} WHERE engineer_id = OLD.id; END",
+    ]
+    for table, contributions in STATS_SOURCES.items():
+        watched = ", ".join(_watched_columns(contributions))
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_{table}_ai AFTER INSERT ON {table} BEGIN "
+            f"{_ensure_row_sql('NEW')} {_apply_sql(contributions, 'NEW', '+')} END",
+            # No row is created on delete: the engineer may be gone already (bulk delete removes it first)
+            f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_{table}_ad AFTER DELETE ON {table} BEGIN "
+            f"{_apply_sql(contributions, 'OLD', '-')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_{table}_au AFTER UPDATE OF {watched} ON {table} BEGIN "
+            f"{_apply_sql(contributions, 'OLD', '-')} {_ensure_row_sql('NEW')} {_apply_sql(contributions, 'NEW', '+')} END",
+        ]
+    return statements
+
+
+def fill_engineer_stats(conn):
+    """Recomputes every stats row on a raw sqlite3 connection."""
+    totals = {}
+    for table, contributions in STATS_SOURCES.items():
+        for column, expr in contributions.items():
+            value = "count(*)" if expr == "1" else f"sum({expr.format(row=table)})"
+            totals.setdefault(column, []).append(f"coalesce((SELECT {value} FROM {table} WHERE {table}.engineer_id = e.id), 0)")
+    names = [name for name, _ in STATS_COLUMNS]
+    conn.execute(f"DELETE FROM {STATS_TABLE}")
+    conn.execute(
+        f"INSERT INTO {STATS_TABLE} (engineer_id, {', '.join(names)}) "
+        f"SELECT e.id, {', '.join(' + '.join(totals[n]) for n in names)} FROM engineers e"
+    )
+
+
+def create_engineer_stats(conn):
+    """Creates the stats table/triggers on a raw sqlite3 connection and fills it. Used by the migration."""
+    for statement in stats_schema_statements():
+        conn.execute(statement)
+    fill_engineer_stats(conn)
+
+
+# --- Companies ---
+
+COMPANIES_TABLE = "companies"
+COMPANY_ID_COLUMN = "company_id"
+
+# Tables carrying a company name: table -> text column (each also has company_id)
+COMPANY_SOURCES = {
+    "engineers": "company_name",
+    "project_details": "company_name",
+    "workplace": "workplace_company_name",
+}
+
+# Removed when normalizing: whitespace, punctuation and legal-form markers
+COMPANY_NAME_NOISE = ("주식회사", "유한회사", "(주)", "㈜", "(유)", " ", "\t", "\n", "\r", ".", ",", "-", "·")
+
+
+def normalize_company_name(name):
+    """Python twin of company_key_sql(); '' for empty names."""
+    if name is None: return ""
+    key = "".join(ch.lower() if ch.isascii() else ch for ch in str(name)) # SQLite lower() is ASCII-only
+    for noise in COMPANY_NAME_NOISE:
+        key = key.replace(noise, "")
+    return key
+
+
+def _sql_string(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def company_key_sql(expr):
+    """SQL expression computing the normalized company key of a text expression."""
+    key = f"lower(coalesce({expr}, ''))"
+    for noise in COMPANY_NAME_NOISE:
+        key = f"replace({key}, {_sql_string(noise)}, '')"
+    return key
+
+
+def _assign_sql(table, column, row):
+    """Creates the company of row's name if needed and points the row at it."""
+    key = company_key_sql(f"{row}.{column}")
+    return (
+        f"INSERT OR IGNORE INTO {COMPANIES_TABLE} (name, normalized_key) "
+        f"SELECT trim({row}.{column}), {key} WHERE {key} <> ''; "
+        f"UPDATE {table} SET company_id = (SELECT id FROM {COMPANIES_TABLE} WHERE normalized_key = {key}) "
+        f"WHERE id = {row}.id AND company_id IS NOT (SELECT id FROM {COMPANIES_TABLE} WHERE normalized_key = {key});"
+    )
+
+
+def _prune_sql(company_id_expr):
+    """Deletes a company nothing refers to any more."""
+    unused = " AND ".join(
+        f"NOT EXISTS (SELECT 1 FROM {table} WHERE company_id = {company_id_expr})" for table in COMPANY_SOURCES
+    )
+    return f"DELETE FROM {COMPANIES_TABLE} WHERE id = {company_id_expr} AND {unused};"
+
+
+def company_schema_statements():
+    """DDL for the companies table, the company_id indexes and the sync triggers (idempotent)."""
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {COMPANIES_TABLE} ("
+        f"id INTEGER NOT NULL PRIMARY KEY, name VARCHAR NOT NULL, normalized_key VARCHAR NOT NULL)",
+        f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{COMPANIES_TABLE}_normalized_key ON {COMPANIES_TABLE} (normalized_key)",
+    ]
+    for table, column in COMPANY_SOURCES.items():
+        statements += [
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_company_id ON {table} (company_id)",
+            f"CREATE TRIGGER IF NOT EXISTS {COMPANIES_TABLE}_{table}_ai AFTER INSERT ON {table} BEGIN "
+            f"{_assign_sql(table, column, 'NEW')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {COMPANIES_TABLE}_{table}_au AFTER UPDATE OF {column} ON {table} BEGIN "
+            f"{_assign_sql(table, column, 'NEW')} {_prune_sql('OLD.company_id')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {COMPANIES_TABLE}_{table}_ad AFTER DELETE ON {table} "
+            f"WHEN OLD.company_id IS NOT NULL BEGIN {_prune_sql('OLD.company_id')} END",
+        ]
+    return statements
+
+
+def fill_companies(conn):
+    """Recreates the companies from the text columns and re-links every row."""
+    for table in COMPANY_SOURCES:
+        conn.execute(f"UPDATE {table} SET company_id = NULL WHERE company_id IS NOT NULL")
+    conn.execute(f"DELETE FROM {COMPANIES_TABLE}")
+    # The first spelling seen (lowest row id, engineers first) becomes the display name
+    names = " UNION ALL ".join(
+        f"SELECT {i} AS source, id, trim({column}) AS name, {company_key_sql(column)} AS normalized_key FROM {table}"
+        for i, (table, column) in enumerate(COMPANY_SOURCES.items())
+    )
+    conn.execute(
+        f"INSERT OR IGNORE INTO {COMPANIES_TABLE} (name, normalized_key) "
+        f"SELECT name, normalized_key FROM ({names}) WHERE normalized_key <> '' ORDER BY source, id"
+    )
+    for table, column in COMPANY_SOURCES.items():
+        conn.execute(
+            f"UPDATE {table} SET company_id = (SELECT c.id FROM {COMPANIES_TABLE} c WHERE c.normalized_key = {company_key_sql(column)}) "
+            f"WHERE {company_key_sql(column)} <> ''"
+        )
+
+
+def create_companies(conn):
+    """Adds company_id to the source tables, creates the table/triggers on a raw sqlite3 connection and fills it. Used by the migration."""
+    for table in COMPANY_SOURCES:
+        if not _column_exists(conn, table, "company_id"):
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN company_id INTEGER REFERENCES {COMPANIES_TABLE} (id)")
+    for statement in company_schema_statements():
+        conn.execute(statement)
+    fill_companies(conn)
+
+
+
+# --- Saved combinations ---
+
+def _flag_sql(engineer_id_expr):
+    return (
+        "UPDATE saved_combinations SET needs_evaluation = 1 WHERE needs_evaluation = 0 AND id IN "
+        f"(SELECT combination_id FROM saved_combination_members WHERE engineer_id = {engineer_id_expr});"
+    )
+
+
+def combination_trigger_statements():
+    """Triggers flagging saved combinations whose members' capabilities changed (idempotent)."""
+    watched = {
+        "technical_grades": "engineer_id, grade",
+        "qualifications": "engineer_id, title",
+        "technical_sector_participation": "engineer_id, technical_sector, participation_days",
+    }
+    statements = [
+        # A deleted engineer leaves the team for good: its id can be reused by a new engineer,
+        # so the member row becomes a departure (old id and name) instead of dangling
+        "CREATE TRIGGER IF NOT EXISTS saved_combinations_engineers_ad AFTER DELETE ON engineers BEGIN "
+        f"{_flag_sql('OLD.id')} "
+        "INSERT INTO saved_combination_departures (combination_id, engineer_id, name) "
+        "SELECT combination_id, OLD.id, OLD.name FROM saved_combination_members WHERE engineer_id = OLD.id; "
+        "DELETE FROM saved_combination_members WHERE engineer_id = OLD.id; END",
+    ]
+    for table, columns in watched.items():
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS saved_combinations_{table}_ai AFTER INSERT ON {table} BEGIN {_flag_sql('NEW.engineer_id')} END",
+            f"CREATE TRIGGER IF NOT EXISTS saved_combinations_{table}_ad AFTER DELETE ON {table} BEGIN {_flag_sql('OLD.engineer_id')} END",
+            f"CREATE TRIGGER IF NOT EXISTS saved_combinations_{table}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+            f"{_flag_sql('OLD.engineer_id')} {_flag_sql('NEW.engineer_id')} END",
+        ]
+    return statements
+
+
+def create_combination_tables(conn):
+    """Creates the saved combination tables and triggers on a raw sqlite3 connection. Used by the migration."""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS saved_combinations ("
+        " id INTEGER NOT NULL PRIMARY KEY,"
+        " name VARCHAR NOT NULL,"
+        " requirements VARCHAR NOT NULL,"
+        " created_at DATETIME DEFAULT (CURRENT_TIMESTAMP),"
+        " status VARCHAR,"
+        " missing VARCHAR,"
+        " total_days INTEGER,"
+        " evaluated_at DATETIME,"
+        " needs_evaluation BOOLEAN DEFAULT '1' NOT NULL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_saved_combinations_needs_evaluation ON saved_combinations (needs_evaluation)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS saved_combination_members ("
+        " combination_id INTEGER NOT NULL REFERENCES saved_combinations (id),"
+        " engineer_id INTEGER NOT NULL REFERENCES engineers (id),"
+        " PRIMARY KEY (combination_id, engineer_id))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_saved_combination_members_engineer_id ON saved_combination_members (engineer_id)")
+    create_combination_departures(conn)
+    for statement in combination_trigger_statements():
+        conn.execute(statement)
+
+
+def create_combination_departures(conn):
+    """Creates the table of members whose engineer was deleted (filled by saved_combinations_engineers_ad)."""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS saved_combination_departures ("
+        " id INTEGER NOT NULL PRIMARY KEY,"
+        " combination_id INTEGER NOT NULL REFERENCES saved_combinations (id),"
+        " engineer_id INTEGER NOT NULL,"  # The old id, no longer a reference: it may belong to someone else now
+        " name VARCHAR,"
+        " departed_at DATETIME DEFAULT (CURRENT_TIMESTAMP))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_saved_combination_departures_combination_id ON saved_combination_departures (combination_id)")
+
+
+# --- Row versions (engineer_versions) ---
+
+VERSIONS_TABLE = "engineer_versions"
+
+
+def _bump_sql(row):
+    return f"UPDATE {VERSIONS_TABLE} SET version = version + 1 WHERE engineer_id = {row}.engineer_id;"
+
+
+def version_schema_statements():
+    """
+    DDL for the version table and the triggers that bump it (idempotent). The row of a
+    deleted engineer is kept and bumped, so an engineer that reuses its id (SQLite
+    reuses the highest rowid) continues from there instead of restarting at 1.
+    """
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {VERSIONS_TABLE} (engineer_id INTEGER NOT NULL PRIMARY KEY REFERENCES engineers (id), "
+        f"version INTEGER NOT NULL DEFAULT 1)",
+        f"CREATE TRIGGER IF NOT EXISTS {VERSIONS_TABLE}_engineers_ai AFTER INSERT ON engineers BEGIN "
+        f"INSERT INTO {VERSIONS_TABLE} (engineer_id) VALUES (NEW.id) "
+        f"ON CONFLICT (engineer_id) DO UPDATE SET version = version + 1; END",
+        f"CREATE TRIGGER IF NOT EXISTS {VERSIONS_TABLE}_engineers_au AFTER UPDATE ON engineers BEGIN "
+        f"UPDATE {VERSIONS_TABLE} SET version = version + 1 WHERE engineer_id = NEW.id; END",
+        f"CREATE TRIGGER IF NOT EXISTS {VERSIONS_TABLE}_engineers_ad AFTER DELETE ON engineers BEGIN "
+        f"UPDATE {VERSIONS_TABLE} SET version = version + 1 WHERE engineer_id = OLD.id; END",
+    ]
+    for table in ENGINEER_CHILD_TABLES:
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {VERSIONS_TABLE}_{table}_ai AFTER INSERT ON {table} BEGIN {_bump_sql('NEW')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {VERSIONS_TABLE}_{table}_ad AFTER DELETE ON {table} BEGIN {_bump_sql('OLD')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {VERSIONS_TABLE}_{table}_au AFTER UPDATE ON {table} BEGIN "
+            f"{_bump_sql('OLD')} UPDATE {VERSIONS_TABLE} SET version = version + 1 "
+            f"WHERE engineer_id = NEW.engineer_id AND NEW.engineer_id IS NOT OLD.engineer_id; END",
+        ]
+    return statements
+
+
+def create_engineer_versions(conn):
+    """Creates the version table/triggers on a raw sqlite3 connection and adds a row per engineer. Used by the migration."""
+    for statement in version_schema_statements():
+        conn.execute(statement)
+    conn.execute(f"INSERT OR IGNORE INTO {VERSIONS_TABLE} (engineer_id) SELECT id FROM engineers")
+
+
+# --- Attachments ---
+
+ATTACHMENTS_TABLE = "attachments"
+ATTACHMENT_ID_COLUMN = "attachment_id"
+
+
+def create_attachment_table(conn):
+    """Creates the attachments table and adds engineers.attachment_id on a raw sqlite3 connection. Used by the migration."""
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {ATTACHMENTS_TABLE} ("
+        " id INTEGER NOT NULL PRIMARY KEY,"
+        " sha256 VARCHAR NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " extension VARCHAR,"
+        " original_name VARCHAR,"
+        " created_at DATETIME DEFAULT (CURRENT_TIMESTAMP))"
+    )
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{ATTACHMENTS_TABLE}_sha256 ON {ATTACHMENTS_TABLE} (sha256)")
+    if not _column_exists(conn, "engineers", ATTACHMENT_ID_COLUMN):
+        conn.execute(f"ALTER TABLE engineers ADD COLUMN {ATTACHMENT_ID_COLUMN} INTEGER REFERENCES {ATTACHMENTS_TABLE} (id)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS ix_engineers_{ATTACHMENT_ID_COLUMN} ON engineers ({ATTACHMENT_ID_COLUMN})")
+
+
+
+# --- Attachment health ---
+
+HEALTH_TABLE = "attachment_health"
+
+
+def health_trigger_statements():
+    """Triggers dropping a health row when its engineer's file changes or the engineer is deleted (idempotent)."""
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {HEALTH_TABLE}_engineers_au AFTER UPDATE OF pdf_file, attachment_id ON engineers "
+        f"WHEN NEW.pdf_file IS NOT OLD.pdf_file OR NEW.attachment_id IS NOT OLD.attachment_id BEGIN "
+        f"DELETE FROM {HEALTH_TABLE} WHERE engineer_id = NEW.id; END",
+        f"CREATE TRIGGER IF NOT EXISTS {HEALTH_TABLE}_engineers_ad AFTER DELETE ON engineers BEGIN "
+        f"DELETE FROM {HEALTH_TABLE} WHERE engineer_id = OLD.id; END",
+    ]
+
+
+def create_attachment_health(conn):
+    """Creates the health table and its triggers on a raw sqlite3 connection. Used by the migration."""
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {HEALTH_TABLE} ("
+        " engineer_id INTEGER NOT NULL PRIMARY KEY REFERENCES engineers (id),"
+        " path VARCHAR,"
+        " status VARCHAR,"
+        " size INTEGER,"
+        " mtime FLOAT,"
+        " checked_at DATETIME)"
+    )
+    conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{HEALTH_TABLE}_status ON {HEALTH_TABLE} (status)")
+    for statement in health_trigger_statements():
+        conn.execute(statement)
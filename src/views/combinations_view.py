@@ -0,0 +1,198 @@
+import customtkinter as ctk
+from sqlalchemy import select
+from src.models.engineer import Engineer
+from src.services.combinations import (
+    find_teams, normalize_requirements, save_combination, reevaluate_combinations, list_combinations,
+    delete_combination, MAX_TEAM_SIZE,
+)
+from src.services.notification import notification
+from src.utils.background import BackgroundQueryExecutor
+
+
+def _split(text):
+    return [part.strip() for part in text.replace(";", ",").split(",") if part.strip()]
+
+
+class SavedCombinationsView(ctk.CTkFrame):
+    """
+    Page to search for teams meeting bid requirements and keep them as saved combinations.
+    Searches, saves and re-evaluation run on a worker thread.
+    """
+
+    def __init__(self, parent, session_factory):
+        super().__init__(parent, fg_color="transparent")
+        self.executor = BackgroundQueryExecutor(self, session_factory, max_workers=1, name="combinations-worker")
+        self.last_requirements = None
+
+        self.grid_columnconfigure((0, 1), weight=1, uniform="combination_col")
+        self.grid_rowconfigure(3, weight=1)
+
+        ctk.CTkLabel(self, text="Saved Combinations", font=("Arial Bold", 20), anchor="w").grid(row=0, column=0, columnspan=2, sticky="w", padx=10, pady=(10, 5))
+
+        # --- Requirements ---
+        form = ctk.CTkFrame(self)
+        form.grid(row=1, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
+        form.grid_columnconfigure((1, 3), weight=1)
+
+        ctk.CTkLabel(form, text="Grades").grid(row=0, column=0, padx=(10, 5), pady=(10, 5), sticky="w")
+        self.grades_entry = ctk.CTkEntry(form, placeholder_text="e.g. 특급, 고급 (comma separated)")
+        self.grades_entry.grid(row=0, column=1, padx=5, pady=(10, 5), sticky="ew")
+        ctk.CTkLabel(form, text="Qualifications").grid(row=1, column=0, padx=(10, 5), pady=5, sticky="w")
+        self.qualifications_entry = ctk.CTkEntry(form, placeholder_text="comma separated")
+        self.qualifications_entry.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
+        ctk.CTkLabel(form, text="Max members").grid(row=2, column=0, padx=(10, 5), pady=(5, 10), sticky="w")
+        self.max_members_var = ctk.StringVar(value=str(MAX_TEAM_SIZE))
+        ctk.CTkEntry(form, textvariable=self.max_members_var, width=60).grid(row=2, column=1, padx=5, pady=(5, 10), sticky="w")
+
+        ctk.CTkLabel(form, text="Sector days\n(sector: days\nper line)", justify="left").grid(row=0, column=2, rowspan=3, padx=(15, 5), pady=10, sticky="nw")
+        self.sectors_text = ctk.CTkTextbox(form, height=90)
+        self.sectors_text.grid(row=0, column=3, rowspan=3, padx=5, pady=10, sticky="nsew")
+
+        self.search_button = ctk.CTkButton(form, text="Find Teams", width=120, command=self.search)
+        self.search_button.grid(row=0, column=4, padx=10, pady=(10, 5))
+        self.status_label = ctk.CTkLabel(form, text="", anchor="w", wraplength=220, justify="left")
+        self.status_label.grid(row=1, column=4, rowspan=2, padx=10, pady=5, sticky="nw")
+
+        # --- Results and saved combinations ---
+        ctk.CTkLabel(self, text="Best teams", font=("Arial Bold", 14), anchor="w").grid(row=2, column=0, sticky="w", padx=10, pady=(5, 0))
+        ctk.CTkLabel(self, text="Saved", font=("Arial Bold", 14), anchor="w").grid(row=2, column=1, sticky="w", padx=10, pady=(5, 0))
+        self.results_frame = ctk.CTkScrollableFrame(self, corner_radius=8)
+        self.results_frame.grid(row=3, column=0, sticky="nsew", padx=(10, 5), pady=(5, 10))
+        self.results_frame.grid_columnconfigure(0, weight=1)
+        self.saved_frame = ctk.CTkScrollableFrame(self, corner_radius=8)
+        self.saved_frame.grid(row=3, column=1, sticky="nsew", padx=(5, 10), pady=(5, 10))
+        self.saved_frame.grid_columnconfigure(0, weight=1)
+
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    # --- Requirements ---
+    def current_requirements(self):
+        """Requirements from the form; raises ValueError for invalid input."""
+        sector_days = {}
+        for line in self.sectors_text.get("1.0", "end").splitlines():
+            if not line.strip(): continue
+            sector, sep, days = line.rpartition(":")
+            if not sep or not sector.strip(): raise ValueError(f"Sector days: expected 'sector: days', got '{line.strip()}'")
+            sector_days[sector.strip()] = days.strip()
+        return normalize_requirements({
+            "grades": _split(self.grades_entry.get()),
+            "qualifications": _split(self.qualifications_entry.get()),
+            "sector_days": sector_days,
+            "max_members": self.max_members_var.get().strip(),
+        })
+
+    # --- Search ---
+    def search(self):
+        try: requirements = self.current_requirements()
+        except ValueError as e:
+            self.status_label.configure(text=str(e), text_color="#E74C3C")
+            return
+        self.status_label.configure(text="Searching...", text_color=("gray10", "gray90"))
+        self.search_button.configure(state="disabled")
+        self.executor.submit("search", lambda session: self._find(session, requirements),
+                             on_done=self._render_teams, on_error=self._search_failed)
+
+    def _find(self, session, requirements):
+        """Worker thread: the teams plus the names of their members."""
+        result = find_teams(session, requirements)
+        ids = {i for team in result["teams"] for i in team["engineer_ids"]}
+        names = dict(session.execute(select(Engineer.id, Engineer.name).where(Engineer.id.in_(ids))).all()) if ids else {}
+        return requirements, result, names
+
+    def _render_teams(self, outcome):
+        requirements, result, names = outcome
+        self.last_requirements = requirements
+        self.search_button.configure(state="normal")
+        for widget in self.results_frame.winfo_children(): widget.destroy()
+
+        teams = result["teams"]
+        if result["unavailable"]:
+            text = "Nobody has " + ", ".join(result["unavailable"])
+        elif not teams:
+            text = "No team of up to {} members meets the requirements".format(requirements["max_members"])
+        else:
+            text = f"{len(teams)} team(s) from {result['candidates']:,} candidates in {result['elapsed']:.2f}s"
+        if not result["complete"]: text += " (time limit reached, showing the best found)"
+        self.status_label.configure(text=text, text_color=("gray10", "gray90"))
+        if not teams:
+            ctk.CTkLabel(self.results_frame, text="No teams to show.", text_color="gray60").grid(row=0, column=0, pady=20)
+
+        for r, team in enumerate(teams):
+            card = ctk.CTkFrame(self.results_frame)
+            card.grid(row=r, column=0, sticky="ew", padx=5, pady=4)
+            card.grid_columnconfigure(0, weight=1)
+            members = ", ".join(names.get(i, f"#{i}") for i in team["engineer_ids"])
+            days = f"{team['sector_days']:,} days in the required sectors" if requirements["sector_days"] else ""
+            ctk.CTkLabel(card, text=f"{team['size']} member(s): {members}", anchor="w", justify="left", wraplength=380).grid(row=0, column=0, sticky="ew", padx=10, pady=(6, 0))
+            if days:
+                ctk.CTkLabel(card, text=days, anchor="w", text_color="gray60").grid(row=1, column=0, sticky="ew", padx=10, pady=(0, 6))
+            ctk.CTkButton(card, text="Save", width=70,
+                          command=lambda ids=team["engineer_ids"]: self.save_team(ids)).grid(row=0, column=1, rowspan=2, padx=10, pady=6)
+
+    def _search_failed(self, error):
+        self.search_button.configure(state="normal")
+        self.status_label.configure(text=f"Search failed: {error}", text_color="#E74C3C")
+        print(f"Error searching teams: {error}")
+
+    # --- Saved Combinations ---
+    def save_team(self, engineer_ids):
+        dialog = ctk.CTkInputDialog(text="Name for this combination:", title="Save Combination")
+        name = dialog.get_input()
+        if not name or not name.strip(): return
+        requirements = self.last_requirements
+
+        def save(session):
+            save_combination(session, name, requirements, engineer_ids)
+            session.commit()
+            return list_combinations(session)
+
+        def done(combinations):
+            notification.show_success(f"Saved combination '{name.strip()}'")
+            self._render_saved(combinations)
+
+        self.executor.submit("saved", save, on_done=done, on_error=self._saved_failed)
+
+    def delete_saved(self, combination):
+        def delete(session):
+            delete_combination(session, combination["id"])
+            session.commit()
+            return list_combinations(session)
+        self.executor.submit("saved", delete, on_done=self._render_saved, on_error=self._saved_failed)
+
+    def load_saved(self):
+        """Re-checks the combinations flagged since the last visit, then lists them all."""
+        def query(session):
+            if reevaluate_combinations(session): session.commit()
+            return list_combinations(session)
+        self.executor.submit("saved", query, on_done=self._render_saved, on_error=self._saved_failed)
+
+    def _render_saved(self, combinations):
+        for widget in self.saved_frame.winfo_children(): widget.destroy()
+        if not combinations:
+            ctk.CTkLabel(self.saved_frame, text="No saved combinations yet.", text_color="gray60").grid(row=0, column=0, pady=20)
+        for r, combination in enumerate(combinations):
+            meets = combination["status"] == "meets"
+            card = ctk.CTkFrame(self.saved_frame)
+            card.grid(row=r, column=0, sticky="ew", padx=5, pady=4)
+            card.grid_columnconfigure(0, weight=1)
+            status = "✔ Meets requirements" if meets else "✖ No longer meets requirements"
+            ctk.CTkLabel(card, text=combination["name"], font=("Arial Bold", 13), anchor="w").grid(row=0, column=0, sticky="ew", padx=10, pady=(6, 0))
+            ctk.CTkLabel(card, text=status, anchor="w", text_color="#2ECC71" if meets else "#E74C3C").grid(row=1, column=0, sticky="ew", padx=10)
+            members = ", ".join(name for _, name in combination["members"])
+            details = members + ("\n" + "\n".join(combination["missing"]) if combination["missing"] else "")
+            ctk.CTkLabel(card, text=details, anchor="w", justify="left", wraplength=380, text_color="gray60").grid(row=2, column=0, sticky="ew", padx=10, pady=(0, 6))
+            ctk.CTkButton(card, text="Delete", width=70, fg_color="#E74C3C", hover_color="#C0392B",
+                          command=lambda c=combination: self.delete_saved(c)).grid(row=0, column=1, rowspan=3, padx=10, pady=6)
+
+    def _saved_failed(self, error):
+        notification.show_error(f"Saved combinations: {error}")
+        print(f"Error with saved combinations: {error}")
+
+    # --- Page ---
+    def on_show(self):
+        """Called by the app every time the page is shown."""
+        self.load_saved()
+
+    def _on_destroy(self, event=None):
+        if event is not None and event.widget is not self: return
+        self.executor.shutdown()
@@ -0,0 +1,142 @@
+import customtkinter as ctk
+from src.services.companies import company_page, count_companies
+from src.utils.background import BackgroundQueryExecutor
+
+
+class CompaniesView(ctk.CTkFrame):
+    """Page listing companies with their engineer and project counts (queries run in the background)."""
+
+    ROWS_PER_PAGE = 50
+    SORTS = {"Name": "name", "Most engineers": "engineers", "Most projects": "projects"}
+    SEARCH_DELAY_MS = 300
+
+    def __init__(self, parent, session_factory):
+        super().__init__(parent, fg_color="transparent")
+        self.executor = BackgroundQueryExecutor(self, session_factory, max_workers=1, name="companies-worker")
+        self.page = 1
+        self.total_pages = 1
+        self._page_keys = {1: None}  # Name sort: page -> normalized_key of the last row on the previous page
+        self._search_job = None
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+
+        # Header: title, search and sort
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 5))
+        ctk.CTkLabel(header, text="Companies", font=("Arial Bold", 20), anchor="w").pack(side="left")
+        self.sort_var = ctk.StringVar(value=next(iter(self.SORTS)))
+        ctk.CTkOptionMenu(header, values=list(self.SORTS), variable=self.sort_var, width=150,
+                          command=lambda _: self.reload()).pack(side="right")
+        self.search_var = ctk.StringVar()
+        search_entry = ctk.CTkEntry(header, textvariable=self.search_var, placeholder_text="Search company...", width=250)
+        search_entry.pack(side="right", padx=10)
+        search_entry.bind("<KeyRelease>", self._on_search_key)
+
+        # Column headers
+        columns = ctk.CTkFrame(self, corner_radius=8)
+        columns.grid(row=1, column=0, sticky="ew", padx=10)
+        self._configure_columns(columns)
+        for col, text in enumerate(("Company", "Engineers", "Projects")):
+            ctk.CTkLabel(columns, text=text, font=("Arial Bold", 13), anchor="w" if col == 0 else "e").grid(row=0, column=col, sticky="ew", padx=10, pady=6)
+
+        # Rows
+        self.rows_frame = ctk.CTkScrollableFrame(self, corner_radius=8)
+        self.rows_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=5)
+        self._configure_columns(self.rows_frame)
+
+        # Pagination
+        pagination = ctk.CTkFrame(self, fg_color="transparent")
+        pagination.grid(row=3, column=0, sticky="ew", padx=10, pady=(0, 10))
+        self.count_label = ctk.CTkLabel(pagination, text="", anchor="w")
+        self.count_label.pack(side="left")
+        self.next_button = ctk.CTkButton(pagination, text="Next", width=100, command=self.next_page)
+        self.next_button.pack(side="right")
+        self.page_label = ctk.CTkLabel(pagination, text="Page 1 of 1")
+        self.page_label.pack(side="right", padx=10)
+        self.prev_button = ctk.CTkButton(pagination, text="Previous", width=100, command=self.prev_page)
+        self.prev_button.pack(side="right")
+
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _configure_columns(self, frame):
+        frame.grid_columnconfigure(0, weight=4)
+        frame.grid_columnconfigure((1, 2), weight=1, minsize=100)
+
+    # --- Loading ---
+    def on_show(self):
+        """Called by the app every time the page is shown."""
+        self.load_page()
+
+    def reload(self):
+        """Back to the first page (after the search or sort changed)."""
+        self.page = 1
+        self._page_keys = {1: None}
+        self.load_page()
+
+    def load_page(self):
+        request = {
+            "search": self.search_var.get().strip(),
+            "sort": self.SORTS[self.sort_var.get()],
+            "page": self.page,
+            "after_key": self._page_keys.get(self.page),
+        }
+        if request["sort"] == "name" and self.page not in self._page_keys:
+            self.page, request["page"], request["after_key"] = 1, 1, None # Lost the keyset position
+        self.page_label.configure(text="Loading...")
+        self.executor.submit("companies", lambda session: self._query(session, request),
+                             on_done=self._render, on_error=self._show_error)
+
+    def _query(self, session, request):
+        rows = company_page(session, search=request["search"], sort=request["sort"], rows_per_page=self.ROWS_PER_PAGE,
+                            page=request["page"], after_key=request["after_key"])
+        return request, rows, count_companies(session, request["search"])
+
+    # --- Rendering ---
+    def _render(self, result):
+        request, rows, total = result
+        self.total_pages = max(1, -(-total // self.ROWS_PER_PAGE))
+        if request["sort"] == "name" and rows:
+            self._page_keys[request["page"] + 1] = rows[-1].normalized_key
+        for widget in self.rows_frame.winfo_children(): widget.destroy()
+        if not rows:
+            ctk.CTkLabel(self.rows_frame, text="No companies found.", text_color="gray60").grid(row=0, column=0, columnspan=3, pady=20)
+        for r, row in enumerate(rows):
+            values = (row.name, f"{row.engineer_count:,}", f"{row.project_count:,}")
+            for col, value in enumerate(values):
+                ctk.CTkLabel(self.rows_frame, text=value, anchor="w" if col == 0 else "e").grid(row=r, column=col, sticky="ew", padx=10, pady=2)
+        self.count_label.configure(text=f"{total:,} companies")
+        self.page_label.configure(text=f"Page {self.page} of {self.total_pages}")
+        self.prev_button.configure(state="normal" if self.page > 1 else "disabled")
+        self.next_button.configure(state="normal" if self.page < self.total_pages else "disabled")
+
+    def _show_error(self, error):
+        self.page_label.configure(text="Error")
+        print(f"Error loading companies: {error}")
+
+    # --- Navigation ---
+    def next_page(self):
+        if self.page < self.total_pages:
+            self.page += 1
+            self.load_page()
+
+    def prev_page(self):
+        if self.page > 1:
+            self.page -= 1
+            self.load_page()
+
+    def _on_search_key(self, event=None):
+        # Wait for a pause in typing before querying
+        if self._search_job is not None: self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
+        self.reload()
+
+    def _on_destroy(self, event=None):
+        if event is not None and event.widget is not self: return
+        if self._search_job is not None:
+            try: self.after_cancel(self._search_job)
+            except Exception: pass
+        self.executor.shutdown()
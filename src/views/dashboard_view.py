@@ -0,0 +1,110 @@
+import customtkinter as ctk
+from src.services.dashboard import DASHBOARD_TILES, get_tile, cached_tile
+from src.utils.background import BackgroundQueryExecutor
+
+
+def _format_amount(value):
+    return f"{value:,.0f}" if value is not None else "-"
+
+
+class DashboardTile(ctk.CTkFrame):
+    """One dashboard figure: a title, a total and a small table of rows."""
+
+    def __init__(self, parent, title):
+        super().__init__(parent)
+        self.grid_columnconfigure(0, weight=1)
+        ctk.CTkLabel(self, text=title, font=("Arial Bold", 14), anchor="w").grid(row=0, column=0, sticky="w", padx=12, pady=(10, 0))
+        self.total_label = ctk.CTkLabel(self, text="", font=("Arial Bold", 22), anchor="w")
+        self.total_label.grid(row=1, column=0, sticky="w", padx=12)
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=2, column=0, sticky="nsew", padx=12, pady=(0, 10))
+        self.body.grid_columnconfigure(0, weight=1)
+        self.set_loading()
+
+    def set_loading(self):
+        self._set_rows([], [])
+        self.total_label.configure(text="Loading...", text_color="gray60")
+
+    def set_error(self, error):
+        self._set_rows([], [])
+        self.total_label.configure(text="Failed to load", text_color="#E74C3C")
+        print(f"Dashboard tile error: {error}")
+
+    def set_rows(self, total, headers, rows):
+        self.total_label.configure(text=total, text_color=("gray10", "gray90"))
+        self._set_rows(headers, rows)
+
+    def _set_rows(self, headers, rows):
+        for widget in self.body.winfo_children(): widget.destroy()
+        for col, header in enumerate(headers):
+            ctk.CTkLabel(self.body, text=header, text_color="gray60", anchor="w" if col == 0 else "e").grid(row=0, column=col, sticky="ew", padx=(0, 10))
+        for r, row in enumerate(rows, start=1):
+            for col, value in enumerate(row):
+                ctk.CTkLabel(self.body, text=str(value), anchor="w" if col == 0 else "e").grid(row=r, column=col, sticky="ew", padx=(0, 10))
+        if headers and not rows:
+            ctk.CTkLabel(self.body, text="No data", text_color="gray60", anchor="w").grid(row=1, column=0, sticky="w")
+
+
+class DashboardView(ctk.CTkFrame):
+    """
+    Overview page. Each tile is loaded by its own background query and drawn as
+    soon as it arrives; unchanged tiles come straight from the dashboard cache.
+    """
+
+    COLUMNS = 3
+
+    def __init__(self, parent, session_factory):
+        super().__init__(parent, fg_color="transparent")
+        self.executor = BackgroundQueryExecutor(self, session_factory, max_workers=2, name="dashboard-worker")
+        self.grid_columnconfigure(tuple(range(self.COLUMNS)), weight=1, uniform="tile")
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.grid(row=0, column=0, columnspan=self.COLUMNS, sticky="ew", padx=10, pady=(10, 5))
+        ctk.CTkLabel(header, text="Dashboard", font=("Arial Bold", 20), anchor="w").pack(side="left")
+        ctk.CTkButton(header, text="Refresh", width=100, command=self.refresh).pack(side="right")
+
+        self.tiles = {}
+        self._shown = {}  # name -> result currently drawn
+        for i, (name, (title, _, _)) in enumerate(DASHBOARD_TILES.items()):
+            tile = DashboardTile(self, title)
+            tile.grid(row=1 + i // self.COLUMNS, column=i % self.COLUMNS, sticky="nsew", padx=10, pady=10)
+            self.tiles[name] = tile
+
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    def on_show(self):
+        """Called by the app every time the page is shown."""
+        self.refresh()
+
+    def refresh(self):
+        for name in self.tiles:
+            # Tiles whose tables did not change are drawn right away without a query
+            result = cached_tile(name)
+            if result is not None:
+                self._render(name, result)
+                continue
+            self._shown.pop(name, None)
+            self.tiles[name].set_loading()
+            self.executor.submit(
+                f"tile:{name}", lambda session, name=name: get_tile(session, name),
+                on_done=lambda result, name=name: self._render(name, result),
+                on_error=self.tiles[name].set_error,
+            )
+
+    def _render(self, name, result):
+        if self._shown.get(name) is result: return # Cached and already on screen
+        self._shown[name] = result
+        tile = self.tiles[name]
+        if name == "sanctions":
+            tile.set_rows(f"{result['total']} expiring", ["Month", "Sanctions", "Engineers"], result["rows"])
+        elif name == "projects":
+            totals = result["totals"]
+            rows = [(label, count, _format_amount(amount), days) for label, count, amount, days in result["rows"]]
+            tile.set_rows(f"{totals['projects']} projects, {_format_amount(totals['amount'])}",
+                          ["Type", "Projects", "Amount", "Days"], rows)
+        else:
+            tile.set_rows(f"{result['total']} engineers", ["", "Count"], result["rows"])
+
+    def _on_destroy(self, event=None):
+        if event is not None and event.widget is not self: return
+        self.executor.shutdown()
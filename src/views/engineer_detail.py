@@ -1,6 +1,7 @@
 # engineer_detail.py
 import customtkinter as ctk
 import os # For potential future use (like opening PDF)
+from src.services.engineer_repository import get_engineer
 
 # --- UI Configuration ---
 COLOR_BACKGROUND = "#242424" # Main background
@@ -24,9 +25,24 @@ PADDING_FIELD_Y = 2         # Vertical padding between fields in a section
 PADDING_FIELD_X = 5
 
 class EngineerDetailDialog(ctk.CTkToplevel):
-    def __init__(self, parent, engineer):
+    def __init__(self, parent, engineer, session_factory=None):
+        """
+        Args:
+            parent: The parent widget.
+            engineer: Engineer object (or id when session_factory is given).
+            session_factory: Optional sessionmaker. If given, the engineer is reloaded
+                with the "detail" loading profile so every section is fetched in a
+                fixed number of queries instead of one lazy load per section.
+        """
         super().__init__(parent)
 
+        if session_factory is not None:
+            session = session_factory()
+            try:
+                engineer = get_engineer(session, getattr(engineer, "id", engineer), profile="detail")
+            finally:
+                session.close() # Loaded sections stay available on the detached object
+
         # --- Window setup ---
         self.title(f"Engineer Details - {engineer.name}")
         self.geometry("900x750")
@@ -147,14 +163,14 @@ class EngineerDetailDialog(ctk.CTkToplevel):
             self.create_detail_field(part_frame, "Technical Sector:", "", row=part_row, label_font=FONT_LABEL)
             part_row += 1
             for p in engineer.technical_sector_participation:
-                 self.create_detail_field(part_frame, f"  • {p.technical_sector}", f"{p.participation_days} days", row=part_row)
+                 self.create_detail_field(part_frame, f"  • {p.technical_sector}", f"{p.participation_days if p.participation_days is not None else '-'} days", row=part_row)
                  part_row += 1
         if engineer.job_sector_participation:
             has_participation = True
             self.create_detail_field(part_frame, "Job Sector:", "", row=part_row, label_font=FONT_LABEL)
             part_row += 1
             for p in engineer.job_sector_participation:
-                 self.create_detail_field(part_frame, f"  • {p.job}", f"{p.participation_days} days", row=part_row)
+                 self.create_detail_field(part_frame, f"  • {p.job}", f"{p.participation_days if p.participation_days is not None else '-'} days", row=part_row)
                  part_row += 1
         # ... Add specialized_field_participation and construction_type_participation similarly ...
         if not has_participation:
@@ -7,14 +7,39 @@ from src.models.engineer import (
     EducationAndTraining, Award, Sanction, Workplace, ProjectDetail
 )
 from src.widgets.date_picker import DatePicker
+from src.services.engineer_repository import get_engineer
+from src.services.attachments import import_attachment
+from src.utils.background import BackgroundQueryExecutor
+from src.utils.db import count_statements
+from src.utils.numbers import parse_number
 from datetime import datetime
+import os
 import traceback # Import traceback for error logging
 
+# Numeric child fields: name -> whole numbers only?
+NUMERIC_FIELDS = {'participation_days': True, 'penalty_points': False, 'contract_amount': True}
+
 class EngineerDialog(ctk.CTkToplevel):
-    def __init__(self, session, engineer=None, on_save=None):
-        super().__init__()
-        self.session = session
-        # If editing, use the existing engineer; otherwise, create a new one
+    def __init__(self, parent, session_factory, engineer=None, on_save=None):
+        """
+        Args:
+            parent: The parent widget.
+            session_factory: SQLAlchemy sessionmaker; the dialog works in its own
+                session for its lifetime and closes it when destroyed.
+            engineer: Engineer (or engineer id) to edit, None to add a new one.
+                Only the id is used, the row is reloaded in the dialog's session.
+            on_save: Callback run after a successful save.
+        """
+        super().__init__(parent)
+        self.session = session_factory()
+        # PDF files are copied into the attachment store on a worker thread
+        self.attachment_executor = BackgroundQueryExecutor(self, session_factory, max_workers=1, name="attachment-worker")
+        self.attachment_id = None
+        self._pdf_importing = False
+        # If editing, load the existing engineer in this dialog's session; otherwise, create a new one
+        engineer_id = getattr(engineer, "id", engineer)
+        # All 12 sections are loaded up front in a fixed number of batched queries
+        engineer = get_engineer(self.session, engineer_id, profile="edit")
         self.engineer = engineer if engineer else Engineer()
         self.on_save = on_save # Callback function to refresh parent table
         self.title("Edit Engineer" if engineer else "Add Engineer")
@@ -97,9 +122,9 @@ class EngineerDialog(ctk.CTkToplevel):
         pdf_frame = ctk.CTkFrame(self.container, fg_color="transparent")
         pdf_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=5, pady=2) # Reduced pady
         pdf_frame.grid_columnconfigure(1, weight=1) # Allow entry to expand
-        ctk.CTkLabel(pdf_frame, text="PDF File Path", width=150, anchor='w').grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        ctk.CTkLabel(pdf_frame, text="PDF File", width=150, anchor='w').grid(row=0, column=0, padx=5, pady=5, sticky="w")
         self.pdf_file_path = ctk.StringVar()
-        pdf_entry = ctk.CTkEntry(pdf_frame, textvariable=self.pdf_file_path, state="readonly") # Show path
+        pdf_entry = ctk.CTkEntry(pdf_frame, textvariable=self.pdf_file_path, state="readonly") # Show file name
         pdf_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
         self.pdf_file_button = ctk.CTkButton(pdf_frame, text="Browse...", command=self._upload_pdf, width=80)
         self.pdf_file_button.grid(row=0, column=2, padx=5, pady=5)
@@ -160,6 +185,13 @@ class EngineerDialog(ctk.CTkToplevel):
         self.grab_set()
         self.after(100, self.name_input.focus_set) # Focus first field
 
+    def destroy(self):
+        """Closes the dialog and releases its session."""
+        self.attachment_executor.shutdown()
+        try: self.session.close()
+        except Exception as e: print(f"Error closing dialog session: {e}")
+        super().destroy()
+
     # --- Helper Methods for UI Creation ---
     # create_section_header, create_entry_row, create_textbox_row remain the same as previous version
 
@@ -534,6 +566,7 @@ class EngineerDialog(ctk.CTkToplevel):
         # Load expertise area if needed: self.expertise_area_input.insert("1.0", engineer.expertise_area or "")
         self.evaluation_target.insert(0, engineer.evaluation_target or "")
         self.pdf_file_path.set(engineer.pdf_file or "")
+        self.attachment_id = engineer.attachment_id
         self.selected_var.set(engineer.selected or False)
 
         # --- Helper to load relationship data (Works with explicit create methods) ---
@@ -550,6 +583,7 @@ class EngineerDialog(ctk.CTkToplevel):
                 for item in items:
                     new_fields = create_fields_method(container) # Create new UI row explicitly
                     if not new_fields: continue
+                    new_fields['item'] = item # Remember the child row so save can diff against it
                     # Populate the newly created widgets
                     for model_attr, widget_key in field_map.items():
                         value = getattr(item, model_attr, None)
@@ -634,6 +668,9 @@ class EngineerDialog(ctk.CTkToplevel):
     # Use the fully corrected save_engineer method from previous responses
     # It handles correct field names, data types, date parsing, notifications etc.
     def save_engineer(self):
+        if self._pdf_importing:
+            notification.show_error("Please wait until the PDF file has been imported.")
+            return
         try:
             # --- Basic information ---
             self.engineer.name = self.name_input.get().strip()
@@ -651,17 +688,21 @@ class EngineerDialog(ctk.CTkToplevel):
             self.engineer.field_name = self.field_name_input.get().strip() # Correct
             self.engineer.evaluation_target = self.evaluation_target.get().strip()
             self.engineer.pdf_file = self.pdf_file_path.get().strip()
+            self.engineer.attachment_id = self.attachment_id
             self.engineer.selected = self.selected_var.get()
 
             # --- Helper to Save Relationships ---
+            # Widget rows loaded from the database carry their child object ('item'); only
+            # changed fields are assigned, so the flush UPDATEs just those rows, INSERTs new
+            # rows and DELETEs (delete-orphan) the rows the user removed.
             def save_relation(relation_attr, data_list, model_class, field_map):
                 target_list = getattr(self.engineer, relation_attr, [])
                 if target_list is None: target_list = []; setattr(self.engineer, relation_attr, target_list)
-                target_list.clear()
+                existing = {id(i) for i in target_list}; kept = set()
                 for item_widgets in data_list:
                     kwargs = {}; has_data = False
                     for model_attr, widget_key in field_map.items():
-                        widget = item_widgets.get(widget_key); value_to_save = None
+                        widget = item_widgets.get(widget_key); value_to_save = None; value = None
                         if isinstance(widget, DatePicker):
                             date_str = widget.get_date()
                             if date_str:
@@ -673,11 +714,27 @@ class EngineerDialog(ctk.CTkToplevel):
 
                         if value_to_save is None and value: value_to_save = value; has_data = True # Capture value from Entry/Combo/Text
 
-                        if model_attr in ['participation_days', 'penalty_points']: kwargs[model_attr] = str(value_to_save) if value_to_save is not None else ""
+                        if model_attr in NUMERIC_FIELDS:
+                            try: kwargs[model_attr] = parse_number(value_to_save, integer=NUMERIC_FIELDS[model_attr])
+                            except ValueError: raise ValueError(f"'{value_to_save}' is not a valid number for {model_attr.replace('_', ' ')}") from None
                         elif value_to_save is not None: kwargs[model_attr] = value_to_save
-                    if has_data:
-                        try: target_list.append(model_class(**kwargs))
+
+                    item = item_widgets.get('item')
+                    if item is not None and id(item) in existing:
+                        if not has_data: continue # Cleared row: dropped below like a removed one
+                        kept.add(id(item))
+                        for model_attr in field_map:
+                            new_value, old_value = kwargs.get(model_attr), getattr(item, model_attr, None)
+                            if new_value == old_value: continue
+                            setattr(item, model_attr, new_value)
+                    elif has_data:
+                        try:
+                            new_item = model_class(**kwargs)
+                            target_list.append(new_item); kept.add(id(new_item))
                         except TypeError as te: print(f"Err creating {model_class.__name__} ({kwargs}): {te}")
+                # Rows whose widgets were removed (or cleared)
+                for item in [i for i in target_list if id(i) not in kept]:
+                    target_list.remove(item)
 
             # --- Save Relationships using Helper ---
             save_relation('technical_grades', self.tech_grades, TechnicalGrade,
@@ -712,15 +769,45 @@ class EngineerDialog(ctk.CTkToplevel):
             # --- End Save Relationships ---
 
             self.session.add(self.engineer)
-            self.session.commit()
+            with count_statements(self.session) as statements:
+                self.session.commit()
+            self.last_save_statement_count = statements["count"]
+            print(f"Saved engineer {self.engineer.id}: {statements['count']} SQL statements")
             if self.on_save: self.on_save()
             notification.show_success("Engineer data saved successfully")
             self.destroy()
+        except ValueError as e: # Invalid input (e.g. a number field holding "2020-01-05"); the dialog stays open
+            notification.show_error(str(e)); self.session.rollback()
         except Exception as e:
             notification.show_error(f"Error saving: {str(e)}"); print(f"--- Save Error ---"); traceback.print_exc(); print(f"--- End ---")
             self.session.rollback()
 
     # --- Upload PDF ---
     def _upload_pdf(self):
+        """Copies the chosen PDF into the attachment store in the background (stored once per content)."""
         file_path = filedialog.askopenfilename(title="Select PDF File", filetypes=[("PDF Files", "*.pdf")])
-        if file_path: self.pdf_file_path.set(file_path)
\ No newline at end of file
+        if not file_path: return
+        name, previous = os.path.basename(file_path), self.pdf_file_path.get()
+        self._pdf_importing = True
+        self.pdf_file_button.configure(state="disabled")
+        self.pdf_file_path.set(f"Importing {name}...")
+
+        def store(session):
+            attachment = import_attachment(session, file_path)
+            session.commit()
+            return attachment.id, attachment.size
+
+        def done(result):
+            self._pdf_importing = False
+            self.pdf_file_button.configure(state="normal")
+            self.attachment_id = result[0]
+            self.pdf_file_path.set(name)
+            print(f"Stored PDF '{name}' as attachment {result[0]} ({result[1]:,} bytes)")
+
+        def failed(error):
+            self._pdf_importing = False
+            self.pdf_file_button.configure(state="normal")
+            self.pdf_file_path.set(previous)
+            notification.show_error(f"Could not import PDF: {error}")
+
+        self.attachment_executor.submit("pdf", store, on_done=done, on_error=failed)
\ No newline at end of file
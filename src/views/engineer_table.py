@@ -14,6 +14,14 @@ import traceback
 # !!! IMPORTANT: Ensure these lines are uncommented and point to your actual files !!!
 from src.models.engineer import Engineer # <<< Make sure this import is correct and active
 from .engineer_dialog import EngineerDialog # <<< Make sure this import is correct and active
+from src.utils.cache import CountCache, PageCache, normalize_filters
+from src.utils.change_tracker import change_tracker
+from src.utils.schema import ENGINEER_CHILD_TABLES, FTS_TABLE, STATS_TABLE
+from src.services.search import search_subquery
+from src.utils.background import BackgroundQueryExecutor
+from src.utils.db import session_scope
+from src.services.engineer_repository import grid_fields, project_engineers, delete_engineers, engineer_field, STATS_FIELDS, HEALTH_FIELDS
+from src.utils.numbers import numeric_filter_clause
 # from src.services.notification import notification # <<< If you use a custom notification service
 # ==========================================
 
@@ -41,13 +49,14 @@ class EngineerTable(ctk.CTkFrame):
     A CustomTkinter frame that displays Engineer data in a sortable, filterable,
     paginated table with selection capabilities. Adapted for the specific Engineer model.
     """
-    def __init__(self, parent, session, on_page_change=None):
+    def __init__(self, parent, session_factory, on_page_change=None):
         """
         Initializes the EngineerTable.
 
         Args:
             parent: The parent widget.
-            session: The SQLAlchemy session object for database interaction.
+            session_factory: SQLAlchemy sessionmaker. Page loads, dialogs and bulk
+                operations each open their own short-lived session from it.
             on_page_change (callable, optional): A callback function executed
                 when the page changes. It receives (current_page, total_pages).
                 Defaults to None.
@@ -75,23 +84,55 @@ class EngineerTable(ctk.CTkFrame):
              messagebox.showerror("Initialization Error", errmsg, parent=parent)
 
 
-        self.session = session
+        self.session_factory = session_factory
         self.on_page_change = on_page_change
         self.current_page = 1
         self.rows_per_page = 10
         self.total_pages = 1
         self.selected_rows = set()
         self.all_engineer_ids_on_current_page = []
+        # --- Rendered Page State ---
+        # (view key, data sequence) of the rows on screen; load_data() with the same key and no
+        # committed write since only refreshes the checkboxes instead of querying and rebuilding
+        self._rendered_state = None
+        self._row_checkbox_vars = {} # engineer id -> BooleanVar of its Select checkbox
 
         # --- State Variables ---
         self.sort_column = None
         self.sort_direction = None
         self.column_filters = {}
+        self.search_text = "" # Full-text search over engineers and career records (ranked)
         self._resize_job = None
         self.header_widgets = {}
         self._current_menu = None
         self.column_visibility = {}
 
+        # --- Pagination Mode ---
+        # "keyset" seeks from the boundary row of a neighbouring page instead of skipping rows with OFFSET,
+        # so late pages cost the same as early ones. "offset" keeps the plain OFFSET/LIMIT behaviour.
+        self.pagination_mode = "keyset"
+        # Tk thread only: workers get a copy and return the boundaries they learned (see _merge_page_bounds)
+        self._page_bounds = {} # page number -> (sort value, id) of the last row on the previous page
+        self._page_bounds_signature = None
+        self._page_bounds_epoch = 0 # Bumped by invalidate_page_bounds(); results from an older epoch are not merged
+
+        # --- Row Count Cache ---
+        # Counts per normalized filter set, invalidated by commits touching the engineers table.
+        # In offset mode a cache miss is answered by COUNT(*) OVER () on the page query itself.
+        # Child rows feed the full-text search; attachment_health backs the PDF column.
+        # engineer_search and engineer_stats are written by triggers, so a change reported for
+        # them is a rebuild (or a deferred import catching up)
+        self.count_cache = CountCache(tables=("engineers",) + ENGINEER_CHILD_TABLES + ("attachment_health", FTS_TABLE, STATS_TABLE))
+        self.use_window_count = True
+
+        # --- Page Result Cache ---
+        # Projected rows per (filters + search, sort, page, rows per page, selected fields), LRU by size.
+        # Row-level change events drop only the pages an inserted/updated/deleted engineer can affect.
+        self.page_cache = PageCache(tables=self.count_cache.tables)
+        change_tracker.track_rows("engineers")
+        for table in ENGINEER_CHILD_TABLES + ("attachment_health",): change_tracker.track_rows(table, key="engineer_id")
+        change_tracker.subscribe_rows(self._on_rows_changed)
+
         # --- Column Definitions (ADAPTED to your Engineer model) ---
         self.columns = [
             {"name": "Select",          "width": 50, "weight": 0, "min_width": 50,  "sortable": False, "filterable": False, "hideable": False, "select_all": True},
@@ -103,6 +144,12 @@ class EngineerTable(ctk.CTkFrame):
             {"name": "Expertise",       "width": 120,"weight": 2, "min_width": 100, "db_field": "evaluation_target",   "sortable": True,  "filterable": True,  "hideable": True},
             {"name": "Is PM",           "width": 60, "weight": 0, "min_width": 60,  "db_field": "selected",            "sortable": True,  "filterable": True,  "hideable": True}, # ADDED: Mapped to 'selected' field
             {"name": "Experience",      "width": 90, "weight": 1, "min_width": 80,  "db_field": "experience",          "sortable": True,  "filterable": False, "hideable": True}, # db_field='experience'(String), filterable=False
+            # Aggregates from engineer_stats (numeric filters accept 5, >5, <=10, 5-10)
+            {"name": "Projects",        "width": 70, "weight": 0, "min_width": 70,  "db_field": "project_count",       "sortable": True,  "filterable": True,  "hideable": True},
+            {"name": "Qualifications",  "width": 90, "weight": 0, "min_width": 90,  "db_field": "qualification_count", "sortable": True,  "filterable": True,  "hideable": True},
+            {"name": "Part. Days",      "width": 80, "weight": 0, "min_width": 80,  "db_field": "participation_days",  "sortable": True,  "filterable": True,  "hideable": True},
+            # Cached result of the background file check (ok, modified, external, missing; "-" = no file or not checked yet)
+            {"name": "PDF",             "width": 70, "weight": 0, "min_width": 70,  "db_field": "attachment_status",   "sortable": True,  "filterable": True,  "hideable": True},
             {"name": "Actions",         "width": 180,"weight": 0, "min_width": 180, "sortable": False, "filterable": False, "hideable": False}
         ]
         self.column_visibility = {col['name']: True for col in self.columns}
@@ -158,6 +205,13 @@ class EngineerTable(ctk.CTkFrame):
 
         # --- Loading Indicator ---
         self.loading_label = ctk.CTkLabel(self.table_container, text="Loading...", font=("Arial", 14), text_color=self.text_color_secondary)
+        self._loading_job = None
+        self._loading_step = 0
+
+        # --- Background Query Worker ---
+        # Page queries run on worker threads, each with its own session from the factory
+        self.query_executor = BackgroundQueryExecutor(self, self.session_factory)
+        self.bind("<Destroy>", self._on_destroy, add="+")
 
         # --- Bind Events ---
         self.content_frame.bind("<Configure>", self._on_content_frame_configure)
@@ -182,6 +236,12 @@ class EngineerTable(ctk.CTkFrame):
              print("Skipping initial data load because 'Engineer' class is not defined.")
 
 
+    def _on_destroy(self, event=None):
+        """Stops background work when the table widget goes away."""
+        if event is None or event.widget is self:
+            self.query_executor.shutdown()
+            change_tracker.unsubscribe(self._on_rows_changed)
+
     # --- Mouse Wheel Scrolling ---
     def _on_mousewheel(self, event):
         """Handles mouse wheel events to scroll the canvas vertically."""
@@ -416,6 +476,14 @@ class EngineerTable(ctk.CTkFrame):
             self.current_page = 1 # Reset page when filters change
             self.load_data()
 
+    def apply_search(self, search_text):
+        """Runs a ranked full-text search across engineers and their career records ("" clears it)."""
+        search_text = (search_text or "").strip()
+        if search_text != self.search_text:
+            self.search_text = search_text
+            self.current_page = 1
+            self.load_data()
+
     def _toggle_column_visibility(self, column_name, visible):
         """Hides or shows a column."""
         visible_count = sum(1 for v in self.column_visibility.values() if v)
@@ -470,12 +538,23 @@ class EngineerTable(ctk.CTkFrame):
     def _redraw_table_layout(self):
         """Clears content, redraws headers, reloads data. Used after visibility changes."""
         for widget in self.content_frame.winfo_children(): widget.destroy()
+        self._rendered_state = None
         self._redraw_headers() # This reconfigures columns based on new visibility
         self.after(10, self.load_data) # Reload data into the new layout
 
     # --- Data Loading ---
     def load_data(self):
-        """Fetches and displays data based on current state."""
+        """
+        Fetches and displays data based on current state.
+
+        The query runs on a background worker with its own session; the rows are
+        rendered on the Tk thread once they arrive. Calling load_data again before
+        the previous query finished supersedes it (its result is discarded).
+
+        When the view state matches the rendered page and the data sequence shows no
+        committed write since, the rows on screen are reused and only the selection
+        checkboxes are updated.
+        """
         # --- Check if Engineer class is available ---
         if 'Engineer' not in globals() and 'Engineer' not in locals():
              print("Error: 'Engineer' class not defined. Cannot load data.")
@@ -486,91 +565,228 @@ class EngineerTable(ctk.CTkFrame):
              error_label.pack(pady=20)
              return # Stop loading process
 
-        # --- Show Loading Indicator ---
-        self.loading_label.place(relx=0.5, rely=0.5, anchor="center")
-        self.update_idletasks()
-        num_visible_columns = sum(1 for v in self.column_visibility.values() if v)
+        # Snapshot the view state so the worker never reads widget attributes that may change meanwhile
+        sort_info = next((c for c in self.columns if c['name'] == self.sort_column), {})
+        request = {
+            # Only the visible columns (plus the sort column for keyset boundaries) are selected
+            "fields": grid_fields(self.columns, self.column_visibility, extra=(sort_info.get('db_field'),)),
+            "filters": dict(self.column_filters),
+            "search_text": self.search_text,
+            "sort_column": self.sort_column,
+            "sort_direction": self.sort_direction,
+            "page": self.current_page,
+            "rows_per_page": self.rows_per_page,
+            "pagination_mode": self.pagination_mode,
+        }
+        # Read before the query runs: a write racing the query makes the next call reload
+        sequence = change_tracker.data_sequence()
+        if self._rendered_state == (self._view_key(request), sequence):
+            self.query_executor.cancel("page") # A pending load of another page is no longer wanted
+            self._stop_loading_animation()
+            self._render_selection()
+            return
 
-        try:
-            # --- Clear Previous Data ---
-            for widget in self.content_frame.winfo_children(): widget.destroy()
-            self.all_engineer_ids_on_current_page.clear()
-
-            # --- Build Query (Using the imported Engineer model) ---
-            # Ensure 'Engineer' here refers to your imported SQLAlchemy model
-            base_query = self.session.query(Engineer)
-            query = base_query
-
-            # --- Apply Filters ---
-            filter_clauses = []
-            for col_name, filter_value in self.column_filters.items():
-                 if not filter_value: continue
-                 column_info = next((c for c in self.columns if c["name"] == col_name), None)
-                 # Check if column is valid, filterable, and mapped
-                 if column_info and column_info.get("filterable") and column_info.get("db_field"):
-                     db_field_name = column_info["db_field"]
-                     # Get the actual SQLAlchemy Column object from the imported Engineer class
-                     model_attr = getattr(Engineer, db_field_name, None)
-                     if model_attr is not None: # Ensure the attribute exists on the model
-                         try:
-                             # Get the column type directly from the SQLAlchemy attribute
-                             attr_type = model_attr.type
-
-                             # Apply filter based on type
-                             if isinstance(attr_type, (SQLString, sqlalchemy.types.Text)):
-                                 filter_clauses.append(model_attr.ilike(f"%{filter_value}%"))
-                             elif isinstance(attr_type, SQLInteger):
-                                 if filter_value.isdigit(): filter_clauses.append(model_attr == int(filter_value))
-                                 else: filter_clauses.append(sqlalchemy.sql.false()) # No match if not a digit
-                             elif isinstance(attr_type, SQLFloat):
-                                 try: filter_clauses.append(model_attr == float(filter_value))
-                                 except ValueError: filter_clauses.append(sqlalchemy.sql.false()) # No match if not float
-                             elif isinstance(attr_type, SQLBoolean):
-                                 f_val_lower = filter_value.lower()
-                                 if f_val_lower in ['true', 'yes', '1']: filter_clauses.append(model_attr == True)
-                                 elif f_val_lower in ['false', 'no', '0']: filter_clauses.append(model_attr == False)
-                                 else: filter_clauses.append(sqlalchemy.sql.false()) # No match if invalid boolean text
-                             elif isinstance(attr_type, SQLDate):
-                                 # Implement date filtering if needed (currently disabled in self.columns)
-                                 pass
-
-                         except AttributeError as ae:
-                              # This might happen if getattr returns something unexpected, or .type is missing
-                              print(f"Warning: Could not get SQLAlchemy type for filter field '{db_field_name}'. Error: {ae}. Falling back to string filter.")
-                              # Fallback to string filter might be okay sometimes
-                              filter_clauses.append(model_attr.ilike(f"%{filter_value}%"))
-                         except Exception as filter_err:
-                             print(f"Error applying filter for column '{col_name}': {filter_err}")
-                             traceback.print_exc()
-            # Add filters to the query
-            if filter_clauses: query = query.filter(sqlalchemy.and_(*filter_clauses))
-
-            # --- Apply Sorting ---
-            if self.sort_column:
-                col_info = next((c for c in self.columns if c['name'] == self.sort_column), None)
-                if col_info and col_info.get('sortable') and col_info.get('db_field'):
-                    db_field = col_info['db_field']
-                    # Get the SQLAlchemy Column object
-                    model_attr = getattr(Engineer, db_field, None)
-                    if model_attr is not None:
-                         try:
-                             sort_func = asc if self.sort_direction == 'asc' else desc
-                             # Apply sorting using the Column object
-                             query = query.order_by(sort_func(model_attr))
-                         except Exception as sort_err:
-                             print(f"Error applying sort for column '{self.sort_column}': {sort_err}")
-                             traceback.print_exc()
-
-            # --- Count and Paginate ---
+        # --- Show Loading Indicator (stays up until the worker reports back) ---
+        self._start_loading_animation()
+        bounds, epoch = self._page_bounds_snapshot(request)
+        self.query_executor.submit(
+            "page",
+            lambda session: self._query_page(session, request, bounds),
+            on_done=lambda result: self._render_page(result, request, sequence, epoch),
+            on_error=self._show_load_error,
+        )
+
+    def _view_key(self, request):
+        """Hashable form of a load_data request (everything that decides which rows are shown)."""
+        return (tuple(request["fields"]), tuple(sorted(request["filters"].items())), request["search_text"],
+                request["sort_column"], request["sort_direction"], request["page"], request["rows_per_page"],
+                request["pagination_mode"])
+
+    def _render_selection(self):
+        """Updates the Select checkboxes of the rendered rows from selected_rows (no query, no rebuild)."""
+        for engineer_id, checkbox_var in self._row_checkbox_vars.items():
+            checked = engineer_id in self.selected_rows
+            if checkbox_var.get() != checked: checkbox_var.set(checked)
+        self._update_select_all_checkbox_state()
+
+    def _build_filter_clauses(self, filters):
+        """Translates {column name: text} filters into SQL clauses based on the column types."""
+        filter_clauses = []
+        for col_name, filter_value in filters.items():
+             if not filter_value: continue
+             column_info = next((c for c in self.columns if c["name"] == col_name), None)
+             # Check if column is valid, filterable, and mapped
+             if column_info and column_info.get("filterable") and column_info.get("db_field"):
+                 db_field_name = column_info["db_field"]
+                 # Get the actual SQLAlchemy Column object (Engineer or engineer_stats)
+                 model_attr = engineer_field(db_field_name)
+                 if model_attr is not None: # Ensure the attribute exists on the model
+                     try:
+                         # Get the column type directly from the SQLAlchemy attribute
+                         attr_type = model_attr.type
+
+                         # Apply filter based on type
+                         if isinstance(attr_type, (SQLString, sqlalchemy.types.Text)):
+                             filter_clauses.append(model_attr.ilike(f"%{filter_value}%"))
+                         elif isinstance(attr_type, (SQLInteger, SQLFloat)):
+                             filter_clauses.append(self._numeric_filter_clause(model_attr, filter_value))
+                         elif isinstance(attr_type, SQLBoolean):
+                             f_val_lower = filter_value.lower()
+                             if f_val_lower in ['true', 'yes', '1']: filter_clauses.append(model_attr == True)
+                             elif f_val_lower in ['false', 'no', '0']: filter_clauses.append(model_attr == False)
+                             else: filter_clauses.append(sqlalchemy.sql.false()) # No match if invalid boolean text
+                         elif isinstance(attr_type, SQLDate):
+                             # Implement date filtering if needed (currently disabled in self.columns)
+                             pass
+
+                     except AttributeError as ae:
+                          # This might happen if getattr returns something unexpected, or .type is missing
+                          print(f"Warning: Could not get SQLAlchemy type for filter field '{db_field_name}'. Error: {ae}. Falling back to string filter.")
+                          # Fallback to string filter might be okay sometimes
+                          filter_clauses.append(model_attr.ilike(f"%{filter_value}%"))
+                     except Exception as filter_err:
+                         print(f"Error applying filter for column '{col_name}': {filter_err}")
+                         traceback.print_exc()
+        return filter_clauses
+
+    def _numeric_filter_clause(self, model_attr, filter_value):
+        """Numeric filter text: "5" (equal), ">5", ">=5", "<5", "<=5" or a range "5-10". No match if invalid."""
+        return numeric_filter_clause(model_attr, filter_value)
+
+    def _apply_filters_and_search(self, query, request):
+        """
+        Applies the column filters and the full-text search of `request` to an engineers query.
+        Returns (query, rank column or None); the rank is only used when no sort column is set.
+        """
+        # --- Apply Filters ---
+        filter_clauses = self._build_filter_clauses(request["filters"])
+        if filter_clauses: query = query.filter(sqlalchemy.and_(*filter_clauses))
+
+        # --- Apply Full-Text Search ---
+        rank_column = None
+        fts = search_subquery(request["search_text"]) if request["search_text"] else None
+        if fts is not None:
+            query = query.join(fts, fts.c.engineer_id == Engineer.id)
+            if not request["sort_column"]: rank_column = fts.c.rank # Best matches first unless user sorts
+        return query, rank_column
+
+    def export_id_query(self):
+        """
+        Returns callable(session) -> query of the engineer ids matching the current
+        filters and search (all pages), for src.services.exporter.
+        """
+        request = {"filters": dict(self.column_filters), "search_text": self.search_text, "sort_column": self.sort_column}
+        return lambda session: self._apply_filters_and_search(project_engineers(session, ("id",)), request)[0]
+
+    def _query_page(self, session, request, bounds=None):
+        """
+        Worker-thread part of load_data: count + page query for `request`.
+        Must not touch any Tk widget or shared table state; `bounds` is a copy of the keyset
+        page-boundary index (see _page_bounds_snapshot). Returns a dict consumed by _render_page,
+        with the newly learned boundaries under "page_bounds".
+        """
+        known = dict(bounds or {1: None})
+        bounds = dict(known)
+        # --- Build Query (column projection: lightweight rows, no ORM instances) ---
+        query = project_engineers(session, request["fields"])
+        query, rank_column = self._apply_filters_and_search(query, request)
+
+        # --- Resolve Sorting (applied per pagination mode below) ---
+        sort_attr, descending = self._get_sort_key(request)
+        if rank_column is not None:
+            order = lambda q: q.order_by(rank_column, Engineer.id)
+        else:
+            order = lambda q: self._order_query(q, sort_attr, descending)
+        # Ranked results are ordered by a computed score, so they always page with OFFSET
+        use_keyset = request["pagination_mode"] == "keyset" and rank_column is None
+
+        # --- Count and Paginate ---
+        page, per_page = request["page"], request["rows_per_page"]
+        filter_key = normalize_filters(request["filters"]) + (("__search__", request["search_text"].strip().lower()),)
+        data_version = self.count_cache.version()
+        total_count = self.count_cache.get(filter_key)
+        engineers = None
+        if total_count is None and not use_keyset and self.use_window_count:
+            # One round trip: the page rows carry the total count of the filtered set
+            engineers, total_count = self._fetch_offset_page_with_count(query, order, page, per_page)
+            if total_count is not None: self.count_cache.put(filter_key, total_count, data_version)
+        if total_count is None:
             try: total_count = query.count()
             except Exception as count_e: print(f"Count Error: {count_e}"); traceback.print_exc(); total_count = 0
+            else: self.count_cache.put(filter_key, total_count, data_version)
+
+        total_pages = max(1, math.ceil(total_count / per_page) if per_page > 0 else 1)
+        if page > total_pages:
+            page = total_pages
+            engineers = None # Page moved, fetch again
+
+        # --- Fetch Data (page cache first) ---
+        signature = (filter_key, request["sort_column"], request["sort_direction"], per_page)
+        page_key = signature + (page, request["fields"])
+        if engineers is None:
+            engineers = self.page_cache.get(page_key)
+            if engineers is not None:
+                if use_keyset: self._remember_keyset_bound(engineers, sort_attr, request, page, bounds)
+                return {"engineers": engineers, "page": page, "total_pages": total_pages,
+                        "page_bounds": self._learned_bounds(bounds, known)}
+        if engineers is not None:
+            pass # Already fetched together with the count
+        elif use_keyset:
+            engineers = self._fetch_keyset_page(query, sort_attr, descending, request, page, bounds)
+        else:
+            engineers = order(query).offset((page - 1) * per_page).limit(per_page).all()
+        self.page_cache.put(page_key, engineers, signature, page, per_page, order=self._page_order(sort_attr, descending, rank_column),
+                            depends=self._page_depends(request), version=data_version)
+        return {"engineers": engineers, "page": page, "total_pages": total_pages,
+                "page_bounds": self._learned_bounds(bounds, known)}
+
+    # --- Page Cache Helpers ---
+    def _page_order(self, sort_attr, descending, rank_column):
+        """"id"/"id_desc" when the result set is ordered by id alone (lets the page cache place new rows), else None."""
+        if rank_column is not None or sort_attr is not None: return None
+        return "id_desc" if descending else "id"
+
+    def _page_depends(self, request):
+        """Fields deciding which rows a result set holds and in what order ("*": any, for full-text search)."""
+        depends = set()
+        for col_name, value in request["filters"].items():
+            col_info = next((c for c in self.columns if c["name"] == col_name), {})
+            if value and col_info.get("db_field"): depends.add(col_info["db_field"])
+        sort_info = next((c for c in self.columns if c["name"] == request["sort_column"]), {})
+        if sort_info.get("db_field"): depends.add(sort_info["db_field"])
+        if request["search_text"].strip(): depends.add("*")
+        return depends
+
+    def _on_rows_changed(self, tables, rows):
+        """Change-tracker callback (any thread): drops the cached pages the committed rows can affect."""
+        touched = tables.intersection(self.page_cache.tables)
+        if not touched: return
+        if any(table not in rows for table in touched):
+            self.page_cache.clear() # Bulk or raw write: rows unknown
+            return
+        for table in touched:
+            for op, engineer_id, columns in rows[table]:
+                if table == "engineers":
+                    self.page_cache.invalidate_row(engineer_id, op, columns)
+                elif table == "attachment_health":
+                    self.page_cache.invalidate_row(engineer_id, "update", set(HEALTH_FIELDS))
+                else: # Career rows feed the engineer_stats columns and the search index
+                    self.page_cache.invalidate_row(engineer_id, "update", set(STATS_FIELDS) | {"*"})
+
+    def _render_page(self, result, request=None, sequence=None, bounds_epoch=None):
+        """UI-thread part of load_data: rebuilds the table rows from a _query_page result."""
+        if not self.winfo_exists(): return
+        self._rendered_state = None
+        if request is not None: self._merge_page_bounds(request, result.get("page_bounds"), bounds_epoch)
+        num_visible_columns = sum(1 for v in self.column_visibility.values() if v)
+        try:
+            engineers = result["engineers"]
+            self.current_page = result["page"]
+            self.total_pages = result["total_pages"]
 
-            self.total_pages = max(1, math.ceil(total_count / self.rows_per_page) if self.rows_per_page > 0 else 1)
-            if self.current_page > self.total_pages: self.current_page = self.total_pages
-            offset = (self.current_page - 1) * self.rows_per_page
-
-            # --- Fetch Data ---
-            engineers = query.offset(offset).limit(self.rows_per_page).all()
+            # --- Clear Previous Data ---
+            for widget in self.content_frame.winfo_children(): widget.destroy()
+            self._row_checkbox_vars = {}
             self.all_engineer_ids_on_current_page = [eng.id for eng in engineers if eng.id is not None]
 
             # --- Get Visible Columns Map ---
@@ -620,13 +836,14 @@ class EngineerTable(ctk.CTkFrame):
                          # Create widget based on column type
                          if col_name == "Select":
                              checkbox_var = tk.BooleanVar(value=(engineer.id in self.selected_rows))
+                             self._row_checkbox_vars[engineer.id] = checkbox_var
                              checkbox = ctk.CTkCheckBox(cell_container, text="", variable=checkbox_var, command=lambda eng_id=engineer.id: self.toggle_row_selection(eng_id), width=20, height=20, fg_color="#1f538d", hover_color="#3b8ed0", border_color="#4F4F4F", corner_radius=3)
                              checkbox.grid(row=0, column=0, sticky="w", padx=(self.base_left_padding, 0), pady=self.vertical_padding)
                          elif col_name == "Actions":
                              actions_frame = self._create_actions_frame(cell_container, engineer)
                              actions_frame.grid(row=0, column=0, sticky="ew", padx=(self.base_left_padding, 5), pady=(self.vertical_padding // 2))
                          elif col_info.get("db_field"):
-                             attr_val = getattr(engineer, col_info["db_field"], "-") # Get data from engineer object
+                             attr_val = getattr(engineer, col_info["db_field"], "-") # Get data from the projected row
                              # Format data for display
                              if isinstance(attr_val, bool): text = "Yes" if attr_val else "No" # Handles 'selected' field for 'Is PM' column
                              elif isinstance(attr_val, (int, float)): text = str(attr_val)
@@ -645,22 +862,186 @@ class EngineerTable(ctk.CTkFrame):
             # Update scroll region after layout changes
             self.content_frame.update_idletasks()
             self.after(10, self._on_content_frame_configure)
+            # The page may have been clamped to the last page; key it by the page actually shown
+            if request is not None: self._rendered_state = (self._view_key(dict(request, page=self.current_page)), sequence)
 
         # --- Exception Handling ---
         except Exception as e:
-            print(f"Error loading table data: {str(e)}")
             print(traceback.format_exc())
-            # Display error in table area
-            for widget in self.content_frame.winfo_children(): widget.destroy()
-            error_label = ctk.CTkLabel(self.content_frame, text=f"Error loading data:\n{str(e)}", text_color="red", font=("Arial", 12), anchor="center", justify="center")
-            self.content_frame.grid_rowconfigure(0, weight=1); self.content_frame.grid_columnconfigure(0, weight=1)
-            error_label.grid(row=0, column=0, columnspan=max(1, num_visible_columns), sticky="nsew", padx=20, pady=40)
-            # Show notification popup
-            try: show_notification(self, f"Could not load engineer data.\n{str(e)}", "Error Loading Data", "error")
-            except Exception as ne: print(f"--- ERROR IN NOTIFICATION SERVICE ---"); print(f"Original error: {e}"); print(f"Notification error: {ne}"); traceback.print_exc(); messagebox.showerror("Error Loading Data", f"Could not load engineer data.\n{str(e)}\n\n(Notification service also failed)", parent=self)
+            self._show_load_error(e)
         finally:
              # --- Hide Loading Indicator ---
-             self.loading_label.place_forget()
+             self._stop_loading_animation()
+
+    def _show_load_error(self, e):
+        """Displays a query/render error in the table area."""
+        self._rendered_state = None
+        self._stop_loading_animation()
+        if not self.winfo_exists(): return
+        print(f"Error loading table data: {str(e)}")
+        num_visible_columns = sum(1 for v in self.column_visibility.values() if v)
+        # Display error in table area
+        for widget in self.content_frame.winfo_children(): widget.destroy()
+        error_label = ctk.CTkLabel(self.content_frame, text=f"Error loading data:\n{str(e)}", text_color="red", font=("Arial", 12), anchor="center", justify="center")
+        self.content_frame.grid_rowconfigure(0, weight=1); self.content_frame.grid_columnconfigure(0, weight=1)
+        error_label.grid(row=0, column=0, columnspan=max(1, num_visible_columns), sticky="nsew", padx=20, pady=40)
+        # Show notification popup
+        try: show_notification(self, f"Could not load engineer data.\n{str(e)}", "Error Loading Data", "error")
+        except Exception as ne: print(f"--- ERROR IN NOTIFICATION SERVICE ---"); print(f"Original error: {e}"); print(f"Notification error: {ne}"); traceback.print_exc(); messagebox.showerror("Error Loading Data", f"Could not load engineer data.\n{str(e)}\n\n(Notification service also failed)", parent=self)
+
+    # --- Loading Indicator Animation ---
+    def _start_loading_animation(self):
+        self.loading_label.place(relx=0.5, rely=0.5, anchor="center")
+        self.loading_label.lift()
+        if self._loading_job is None:
+            self._loading_step = 0
+            self._animate_loading()
+
+    def _animate_loading(self):
+        self._loading_step = (self._loading_step + 1) % 4
+        self.loading_label.configure(text="Loading" + "." * self._loading_step)
+        self._loading_job = self.after(300, self._animate_loading)
+
+    def _stop_loading_animation(self):
+        if self._loading_job is not None:
+            self.after_cancel(self._loading_job)
+            self._loading_job = None
+        self.loading_label.place_forget()
+
+    # --- Sorting & Keyset Pagination Helpers ---
+    def _get_sort_key(self, request):
+        """Returns (model attribute, descending) for the requested sort, or (None, False) to order by id."""
+        sort_column, descending = request["sort_column"], request["sort_direction"] == 'desc'
+        if not sort_column: return None, False
+        col_info = next((c for c in self.columns if c['name'] == sort_column), None)
+        if not col_info or not col_info.get('sortable') or not col_info.get('db_field'): return None, False
+        model_attr = engineer_field(col_info['db_field'])
+        if model_attr is None or col_info['db_field'] == 'id':
+            return None, descending # Sorting by id needs no separate sort column
+        return model_attr, descending
+
+    def _order_query(self, query, sort_attr, descending, reverse=False):
+        """Orders by the sort column with id as tie-breaker, so every row has a unique position."""
+        use_desc = descending != reverse
+        sort_func = desc if use_desc else asc
+        if sort_attr is not None:
+            return query.order_by(sort_func(sort_attr), sort_func(Engineer.id))
+        return query.order_by(sort_func(Engineer.id))
+
+    def _keyset_predicate(self, sort_attr, descending, key, after=True, inclusive=False):
+        """
+        Builds the seek predicate selecting rows after (or before) `key` in the current ordering.
+
+        SQLite puts NULLs first in ascending order and last in descending order, so
+        "after in DESC" is exactly "before in ASC"; NULL sort values need explicit
+        IS NULL terms because a row-value comparison against NULL is never true.
+        """
+        value, row_id = key
+        forward = after != descending # True -> move towards larger values
+        if forward: id_cmp = Engineer.id >= row_id if inclusive else Engineer.id > row_id
+        else: id_cmp = Engineer.id <= row_id if inclusive else Engineer.id < row_id
+        if sort_attr is None: return id_cmp
+
+        if value is None:
+            same_value = sqlalchemy.and_(sort_attr.is_(None), id_cmp)
+            # NULLs sort lowest: going up also includes every non-NULL value
+            return sqlalchemy.or_(same_value, sort_attr.isnot(None)) if forward else same_value
+
+        row_value = sqlalchemy.tuple_(sort_attr, Engineer.id)
+        boundary = sqlalchemy.tuple_(value, row_id)
+        if forward:
+            return row_value >= boundary if inclusive else row_value > boundary
+        seek = row_value <= boundary if inclusive else row_value < boundary
+        return sqlalchemy.or_(seek, sort_attr.is_(None))
+
+    def _fetch_offset_page_with_count(self, query, order, page, per_page):
+        """
+        Fetches an offset page with COUNT(*) OVER () attached to every row.
+        `order` applies the ORDER BY to a query. Returns (rows, total) or
+        (None, None) when the page is empty (no row to read the count from).
+        The rows keep the extra total_count field; the renderer ignores it.
+        """
+        counted = query.add_columns(func.count().over().label("total_count"))
+        result = order(counted).offset((page - 1) * per_page).limit(per_page).all()
+        if not result: return None, None
+        return result, result[0].total_count
+
+    def _row_key(self, engineer, sort_attr):
+        return (getattr(engineer, sort_attr.key) if sort_attr is not None else None, engineer.id)
+
+    def _keyset_signature(self, request):
+        """Identifies the ordered result set; cached page boundaries are only valid for one signature."""
+        return (tuple(sorted(request["filters"].items())), request["search_text"], request["sort_column"],
+                request["sort_direction"], request["rows_per_page"])
+
+    def invalidate_page_bounds(self):
+        """Drops cached keyset page boundaries (call after rows were added/removed)."""
+        self._page_bounds = {}
+        self._page_bounds_signature = None
+        self._page_bounds_epoch += 1
+
+    def _keyset_bounds(self, request):
+        """The page-boundary index of the request's result set (a fresh one if the signature changed). Tk thread."""
+        signature = self._keyset_signature(request)
+        if signature != self._page_bounds_signature:
+            self._page_bounds = {1: None} # Page 1 starts at the beginning of the result set
+            self._page_bounds_signature = signature
+        return self._page_bounds
+
+    def _page_bounds_snapshot(self, request):
+        """(copy of the boundary index, epoch) handed to a worker with the request. Tk thread."""
+        return dict(self._keyset_bounds(request)), self._page_bounds_epoch
+
+    def _merge_page_bounds(self, request, learned, epoch):
+        """Adds the boundaries a worker learned, unless the index was invalidated or re-keyed since. Tk thread."""
+        if not learned or epoch != self._page_bounds_epoch: return
+        if self._keyset_signature(request) != self._page_bounds_signature: return
+        self._page_bounds.update(learned)
+
+    @staticmethod
+    def _learned_bounds(bounds, known):
+        """Boundaries in a worker's copy that were not in the snapshot it started from."""
+        return {page: key for page, key in bounds.items() if page not in known or known[page] != key}
+
+    def _remember_keyset_bound(self, rows, sort_attr, request, page, bounds):
+        """Records where the next page starts from a page served by the page cache."""
+        if len(rows) == request["rows_per_page"]:
+            bounds[page + 1] = self._row_key(rows[-1], sort_attr)
+
+    def _fetch_keyset_page(self, query, sort_attr, descending, request, page, bounds):
+        """Fetches `page` using the worker's copy of the page-boundary index (runs on the worker thread)."""
+        per_page = request["rows_per_page"]
+
+        if page in bounds:
+            # Known start boundary: seek directly, no rows skipped
+            start_key = bounds[page]
+            page_query = query if start_key is None else query.filter(self._keyset_predicate(sort_attr, descending, start_key))
+            rows = self._order_query(page_query, sort_attr, descending).limit(per_page).all()
+        elif page + 1 in bounds:
+            # Stepping back from the next page: seek backwards from its start boundary (inclusive,
+            # since that key is the last row of this page) and fetch one extra row to learn our own boundary
+            end_key = bounds[page + 1]
+            page_query = query.filter(self._keyset_predicate(sort_attr, descending, end_key, after=False, inclusive=True))
+            rows = self._order_query(page_query, sort_attr, descending, reverse=True).limit(per_page + 1).all()
+            rows.reverse()
+            if len(rows) > per_page:
+                bounds[page] = self._row_key(rows[0], sort_attr)
+                rows = rows[1:]
+        else:
+            # Arbitrary jump: seek from the nearest cached page below, skipping only the pages in between.
+            # One extra leading row is fetched to record this page's start boundary.
+            anchor = max(p for p in bounds if p < page)
+            anchor_key = bounds[anchor]
+            page_query = query if anchor_key is None else query.filter(self._keyset_predicate(sort_attr, descending, anchor_key))
+            skip = (page - anchor) * per_page - 1
+            rows = self._order_query(page_query, sort_attr, descending).offset(skip).limit(per_page + 1).all()
+            if rows:
+                bounds[page] = self._row_key(rows[0], sort_attr)
+                rows = rows[1:]
+
+        if len(rows) == per_page:
+            bounds[page + 1] = self._row_key(rows[-1], sort_attr)
+        return rows
 
     # --- Action Button Creation ---
     def _create_actions_frame(self, parent, engineer):
@@ -722,13 +1103,18 @@ class EngineerTable(ctk.CTkFrame):
     # --- Dialogs and Data Actions ---
     def show_details_or_edit(self, engineer):
         """Shows the EngineerDialog for viewing/editing."""
-        # Assumes EngineerDialog is imported or defined
-        dialog = EngineerDialog(self, self.session, engineer=engineer, on_save=self.load_data)
+        # Grid rows are projections; the dialog opens its own session and loads the ORM instance by id
+        dialog = EngineerDialog(self, self.session_factory, engineer=engineer.id, on_save=self.refresh_data)
 
     def add_engineer(self):
         """Shows the EngineerDialog to add a new engineer."""
         # Assumes EngineerDialog is imported or defined
-        dialog = EngineerDialog(self, self.session, engineer=None, on_save=self.load_data)
+        dialog = EngineerDialog(self, self.session_factory, engineer=None, on_save=self.refresh_data)
+
+    def refresh_data(self):
+        """Reloads the current page after rows were added, edited or deleted."""
+        self.invalidate_page_bounds()
+        self.load_data()
 
     # --- Methods for External Control Buttons ---
     def select_all_on_page(self):
@@ -800,7 +1186,7 @@ class EngineerTable(ctk.CTkFrame):
         """ Resets filters, sorting, column visibility to defaults, and goes to page 1. """
         # Determine if any non-default state exists
         visibility_changed = any(not v for name, v in self.column_visibility.items() if next((c for c in self.columns if c['name'] == name), {}).get('hideable', True))
-        filters_active = bool(self.column_filters)
+        filters_active = bool(self.column_filters) or bool(self.search_text)
         sorting_active = bool(self.sort_column)
         page_not_first = self.current_page != 1
         needs_reset = visibility_changed or filters_active or sorting_active or page_not_first
@@ -811,6 +1197,7 @@ class EngineerTable(ctk.CTkFrame):
 
         # Reset state variables
         self.column_filters.clear()
+        self.search_text = ""
         self.sort_column = None
         self.sort_direction = None
         needs_redraw = False
@@ -828,6 +1215,16 @@ class EngineerTable(ctk.CTkFrame):
              self.load_data()
         show_notification(self, "Table view reset to default.", "View Reset", "info")
 
+    def set_pagination_mode(self, mode):
+        """Switches between "keyset" (seek) and "offset" pagination."""
+        if mode not in ("keyset", "offset"):
+            print(f"Warning: Unknown pagination mode '{mode}'")
+            return
+        if self.pagination_mode != mode:
+            self.pagination_mode = mode
+            self.invalidate_page_bounds()
+            self.load_data()
+
     def set_page_change_callback(self, callback):
         """Sets the callback function for page changes."""
         self.on_page_change = callback
@@ -843,8 +1240,12 @@ class EngineerTable(ctk.CTkFrame):
             # Ensure IDs are valid integers before querying
             valid_ids = [id_ for id_ in self.selected_rows if isinstance(id_, int)]
             if not valid_ids: return []
-            # Fetch engineers using the SQLAlchemy session and the imported Engineer class
-            return self.session.query(Engineer).filter(Engineer.id.in_(valid_ids)).all()
+            # Fetch in a short-lived session; the returned objects are detached (scalar attributes loaded)
+            session = self.session_factory()
+            try:
+                return session.query(Engineer).filter(Engineer.id.in_(valid_ids)).all()
+            finally:
+                session.close()
         except NameError: # Catch if Engineer class is not defined
              show_notification(self, "Setup Error: Engineer model not available for fetching.", "Fetch Error", "error")
              return []
@@ -861,15 +1262,18 @@ class EngineerTable(ctk.CTkFrame):
                                    parent=self):
             return # User cancelled
 
+        engineer_id, engineer_name = engineer.id, getattr(engineer, 'name', None) # Name column may be hidden
         try:
-            self.session.delete(engineer) # Delete from session
-            self.session.commit()         # Commit changes to DB
-            show_notification(self, f"Engineer '{engineer.name}' deleted successfully.", "Deletion Successful", "info")
+            with session_scope(self.session_factory) as session: # Commits, or rolls back on error
+                db_engineer = session.get(Engineer, engineer_id)
+                if db_engineer is not None:
+                    engineer_name = db_engineer.name
+                    session.delete(db_engineer) # ORM delete cascades to child rows
+            show_notification(self, f"Engineer '{engineer_name}' deleted successfully.", "Deletion Successful", "info")
             # Remove from selection if present and reload data
-            self.selected_rows.discard(engineer.id)
-            self.load_data()
+            self.selected_rows.discard(engineer_id)
+            self.refresh_data()
         except Exception as e:
-            self.session.rollback() # Rollback DB changes on error
             show_notification(self, f"Error deleting engineer: {e}", "Delete Error", "error")
             traceback.print_exc()
 
@@ -886,43 +1290,28 @@ class EngineerTable(ctk.CTkFrame):
                                    parent=self):
             return # User cancelled
 
-        deleted_count = 0
-        try:
-            # Ensure IDs are valid integers
-            valid_ids = [id_ for id_ in self.selected_rows if isinstance(id_, int)]
-            if not valid_ids:
-                 show_notification(self, "No valid engineer IDs selected for deletion.", "Delete Error", "error")
-                 return
+        # Ensure IDs are valid integers
+        valid_ids = [id_ for id_ in self.selected_rows if isinstance(id_, int)]
+        if not valid_ids:
+             show_notification(self, "No valid engineer IDs selected for deletion.", "Delete Error", "error")
+             return
 
+        try:
             # --- Perform Deletion ---
-            # Use bulk delete for efficiency if cascading isn't needed or handled by DB
-            # Ensure 'Engineer' refers to the imported model class
-            deleted_count = self.session.query(Engineer).filter(Engineer.id.in_(valid_ids)).delete(synchronize_session=False)
-            # Note: synchronize_session=False is often faster but might require session.expire_all()
-            # if you need the session to reflect the deletions immediately without a refresh.
-            # If you have complex cascades handled by SQLAlchemy ORM events,
-            # you might need to fetch and delete individually instead.
-            # Example: Fetch and delete approach
-            # engineers_to_delete = self.session.query(Engineer).filter(Engineer.id.in_(valid_ids)).all()
-            # if engineers_to_delete:
-            #     for engineer in engineers_to_delete:
-            #         self.session.delete(engineer)
-            #     deleted_count = len(engineers_to_delete)
-
-            self.session.commit() # Commit the transaction
-            show_notification(self, f"Successfully deleted {deleted_count} engineer(s).", "Deletion Successful", "info")
+            # Set-based delete of the engineers and their child rows in one transaction
+            with session_scope(self.session_factory) as session:
+                counts = delete_engineers(session, valid_ids)
+            deleted_count = counts.pop("engineers", 0)
+            child_count = sum(counts.values())
+            print(f"Bulk delete: {deleted_count} engineers, {child_count} child rows ({', '.join(f'{t}={n}' for t, n in counts.items() if n)})")
+            show_notification(self, f"Successfully deleted {deleted_count} engineer(s) and {child_count} related record(s).", "Deletion Successful", "info")
 
             # Clear selection and reload data
             self.selected_rows.clear()
-            self.load_data()
+            self.refresh_data()
 
-        except NameError: # Catch if Engineer class is not defined
-             show_notification(self, "Setup Error: Engineer model not available for deletion.", "Delete Error", "error")
-             self.session.rollback() # Rollback any partial changes
-        except Exception as e: # Catch other potential DB or SQLAlchemy errors
-            self.session.rollback() # Rollback DB changes on error
+        except Exception as e: # Catch DB or SQLAlchemy errors (the transaction was rolled back)
             show_notification(self, f"Error deleting selected engineers: {e}", "Delete Error", "error")
             traceback.print_exc()
-            # Optionally reload data even on error to reflect potential partial success/failure
-            self.load_data()
+            self.refresh_data()
 
@@ -0,0 +1,130 @@
+import customtkinter as ctk
+import queue
+import threading
+from tkinter import filedialog
+from src.services.exporter import export_engineers
+from src.services.notification import notification
+
+
+class ExportDialog(ctk.CTkToplevel):
+    """Exports the selected engineers or the current filter result (runs on a worker thread)."""
+
+    POLL_INTERVAL_MS = 100
+    FORMATS = {"JSONL (one file, nested records)": "jsonl", "CSV (one file per table)": "csv"}
+
+    def __init__(self, parent, session_factory, selected_ids=None, id_query=None):
+        """
+        Args:
+            parent: The parent widget.
+            session_factory: SQLAlchemy sessionmaker.
+            selected_ids: Ids of the selected engineers (may be empty).
+            id_query: callable(session) returning the engineer ids of the current filter (EngineerTable.export_id_query()).
+        """
+        super().__init__(parent)
+        self.session_factory = session_factory
+        self.selected_ids = sorted(selected_ids or [])
+        self.id_query = id_query
+        self._worker = None
+        self._stop_event = threading.Event()
+        self._events = queue.Queue()
+        self.title("Export Engineers")
+        self.geometry("520x330")
+        self.grid_columnconfigure(0, weight=1)
+
+        ctk.CTkLabel(self, text="Export", font=("Arial Bold", 16), anchor="w").grid(row=0, column=0, sticky="w", padx=20, pady=(15, 5))
+
+        # Scope
+        self.scope_var = ctk.StringVar(value="selected" if self.selected_ids else "filter")
+        selected_radio = ctk.CTkRadioButton(self, text=f"Selected engineers ({len(self.selected_ids)})", variable=self.scope_var, value="selected")
+        selected_radio.grid(row=1, column=0, sticky="w", padx=20, pady=5)
+        if not self.selected_ids: selected_radio.configure(state="disabled")
+        ctk.CTkRadioButton(self, text="All engineers matching the current filters and search", variable=self.scope_var, value="filter").grid(row=2, column=0, sticky="w", padx=20, pady=5)
+
+        # Format
+        self.format_var = ctk.StringVar(value=next(iter(self.FORMATS)))
+        ctk.CTkOptionMenu(self, values=list(self.FORMATS), variable=self.format_var, width=280).grid(row=3, column=0, sticky="w", padx=20, pady=10)
+
+        # Progress
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.grid(row=4, column=0, sticky="ew", padx=20, pady=(10, 5))
+        self.progress_bar.set(0)
+        self.status_label = ctk.CTkLabel(self, text="", anchor="w")
+        self.status_label.grid(row=5, column=0, sticky="w", padx=20)
+
+        # Buttons
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.grid(row=6, column=0, sticky="ew", padx=20, pady=15)
+        btn_frame.grid_columnconfigure((0, 1), weight=1)
+        self.export_button = ctk.CTkButton(btn_frame, text="Export...", command=self.start_export)
+        self.export_button.grid(row=0, column=0, padx=5, sticky="ew")
+        self.close_button = ctk.CTkButton(btn_frame, text="Close", command=self._close, fg_color="gray50", hover_color="gray40")
+        self.close_button.grid(row=0, column=1, padx=5, sticky="ew")
+
+        self.protocol("WM_DELETE_WINDOW", self._close)
+        self.transient(parent)
+        self.grab_set()
+
+    def start_export(self):
+        if self._worker is not None: return
+        fmt = self.FORMATS[self.format_var.get()]
+        if fmt == "jsonl":
+            path = filedialog.asksaveasfilename(parent=self, title="Export to", defaultextension=".jsonl",
+                                                initialfile="engineers.jsonl", filetypes=[("JSON Lines", "*.jsonl")])
+        else:
+            path = filedialog.askdirectory(parent=self, title="Export CSV files to folder")
+        if not path: return
+        kwargs = {"engineer_ids": self.selected_ids} if self.scope_var.get() == "selected" else {"id_query": self.id_query}
+        self._stop_event.clear()
+        self.progress_bar.set(0)
+        self.status_label.configure(text="Exporting...")
+        self.export_button.configure(state="disabled")
+        self.close_button.configure(text="Stop")
+        self._worker = threading.Thread(target=self._run, args=(path, fmt, kwargs), name="export-worker", daemon=True)
+        self._worker.start()
+        self.after(self.POLL_INTERVAL_MS, self._poll)
+
+    # --- Worker Thread ---
+    def _run(self, path, fmt, kwargs):
+        try:
+            stats = export_engineers(self.session_factory, path, fmt=fmt, should_stop=self._stop_event.is_set,
+                                     progress=lambda s: self._events.put(("progress", s)), **kwargs)
+            self._events.put(("done", stats))
+        except Exception as e:
+            self._events.put(("error", e))
+
+    # --- UI Side ---
+    def _poll(self):
+        if not self.winfo_exists(): return
+        while True:
+            try: kind, payload = self._events.get_nowait()
+            except queue.Empty: break
+            if kind == "progress":
+                self._show_progress(payload)
+            elif kind == "done":
+                self._show_progress(payload)
+                self._worker = None
+                self.export_button.configure(state="normal"); self.close_button.configure(text="Close")
+                if payload["status"] == "done":
+                    self.progress_bar.set(1)
+                    notification.show_success(f"Exported {payload['engineers']} engineers", parent=self)
+                return
+            elif kind == "error":
+                self._worker = None
+                self.export_button.configure(state="normal"); self.close_button.configure(text="Close")
+                self.status_label.configure(text="Export failed")
+                notification.show_error(f"Export failed: {payload}", parent=self)
+                return
+        self.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _show_progress(self, stats):
+        if stats["total"]: self.progress_bar.set(min(1.0, stats["engineers"] / stats["total"]))
+        self.status_label.configure(
+            text=f"{stats['engineers']} of {stats['total']} engineers, {stats['rows']} rows - {stats['engineers_per_sec']:.0f} engineers/s"
+        )
+
+    def _close(self):
+        if self._worker is not None:
+            self._stop_event.set() # Stops after the current batch; the dialog stays open until then
+            self.status_label.configure(text="Stopping...")
+            return
+        self.destroy()
@@ -0,0 +1,189 @@
+import customtkinter as ctk
+import os
+import queue
+import threading
+from tkinter import filedialog
+from src.services.importer import import_file, detect_format, TABLE_MODELS, IMPORT_BATCH_SIZE
+from src.services.notification import notification
+
+
+class ImportView(ctk.CTkFrame):
+    """Page for bulk importing engineers from CSV/JSONL files (runs the import on a worker thread)."""
+
+    POLL_INTERVAL_MS = 100
+    AUTO_TABLE = "Auto (from file name)"
+
+    def __init__(self, parent, engine, on_complete=None):
+        """
+        Args:
+            parent: The parent widget.
+            engine: SQLAlchemy engine of engineers.db.
+            on_complete: Callback run after an import committed rows (e.g. refresh the engineer table).
+        """
+        super().__init__(parent, fg_color="transparent")
+        self.engine = engine
+        self.on_complete = on_complete
+        self._worker = None
+        self._stop_event = threading.Event()
+        self._events = queue.Queue()
+        self._poll_job = None
+
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_rowconfigure(6, weight=1)
+
+        ctk.CTkLabel(self, text="Import Data", font=("Arial Bold", 20), anchor="w").grid(row=0, column=0, columnspan=3, sticky="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(
+            self, anchor="w", justify="left", text_color="gray60",
+            text="JSONL: one engineer per line, career records nested under their section name (e.g. \"project_details\": [...]).\n"
+                 "CSV: one table per file with a header row; child tables need an engineer_id column.\n"
+                 "Interrupted imports resume where they stopped when the same file is imported again.",
+        ).grid(row=1, column=0, columnspan=3, sticky="w", padx=10, pady=(0, 10))
+
+        # File selection
+        ctk.CTkLabel(self, text="File:", width=100, anchor="w").grid(row=2, column=0, sticky="w", padx=10, pady=5)
+        self.path_var = ctk.StringVar()
+        ctk.CTkEntry(self, textvariable=self.path_var, height=32).grid(row=2, column=1, sticky="ew", padx=(0, 10), pady=5)
+        ctk.CTkButton(self, text="Browse...", width=100, command=self._browse).grid(row=2, column=2, padx=(0, 10), pady=5)
+
+        # Options
+        options = ctk.CTkFrame(self, fg_color="transparent")
+        options.grid(row=3, column=0, columnspan=3, sticky="ew", padx=10, pady=5)
+        ctk.CTkLabel(options, text="CSV table:", anchor="w").pack(side="left")
+        self.table_var = ctk.StringVar(value=self.AUTO_TABLE)
+        ctk.CTkOptionMenu(options, values=[self.AUTO_TABLE] + list(TABLE_MODELS), variable=self.table_var, width=220).pack(side="left", padx=(5, 20))
+        ctk.CTkLabel(options, text="Batch size:", anchor="w").pack(side="left")
+        self.batch_var = ctk.StringVar(value=str(IMPORT_BATCH_SIZE))
+        ctk.CTkOptionMenu(options, values=["100", "500", "1000", "5000"], variable=self.batch_var, width=90).pack(side="left", padx=(5, 20))
+        self.restart_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(options, text="Import again if already imported", variable=self.restart_var).pack(side="left")
+
+        # Controls
+        controls = ctk.CTkFrame(self, fg_color="transparent")
+        controls.grid(row=4, column=0, columnspan=3, sticky="ew", padx=10, pady=5)
+        self.start_button = ctk.CTkButton(controls, text="Start Import", command=self.start_import, width=140)
+        self.start_button.pack(side="left")
+        self.stop_button = ctk.CTkButton(controls, text="Stop", command=self.stop_import, width=100, state="disabled", fg_color="#E74C3C", hover_color="#C0392B")
+        self.stop_button.pack(side="left", padx=10)
+
+        # Progress
+        progress_frame = ctk.CTkFrame(self, fg_color="transparent")
+        progress_frame.grid(row=5, column=0, columnspan=3, sticky="ew", padx=10, pady=5)
+        progress_frame.grid_columnconfigure(0, weight=1)
+        self.progress_bar = ctk.CTkProgressBar(progress_frame)
+        self.progress_bar.grid(row=0, column=0, sticky="ew")
+        self.progress_bar.set(0)
+        self.status_label = ctk.CTkLabel(progress_frame, text="Idle", anchor="w")
+        self.status_label.grid(row=1, column=0, sticky="w", pady=(5, 0))
+
+        # Log
+        self.log = ctk.CTkTextbox(self, height=200)
+        self.log.grid(row=6, column=0, columnspan=3, sticky="nsew", padx=10, pady=(5, 10))
+        self.log.configure(state="disabled")
+
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    # --- UI Actions ---
+    def _browse(self):
+        path = filedialog.askopenfilename(title="Select Import File", filetypes=[("Import files", "*.jsonl *.ndjson *.json *.csv"), ("All files", "*.*")])
+        if path: self.path_var.set(path)
+
+    def start_import(self):
+        path = self.path_var.get().strip()
+        if self._worker is not None: return
+        if not path or not os.path.isfile(path):
+            notification.show_error("Please choose a file to import.")
+            return
+        try: detect_format(path)
+        except ValueError as e:
+            notification.show_error(str(e))
+            return
+        table = None if self.table_var.get() == self.AUTO_TABLE else self.table_var.get()
+        self._stop_event.clear()
+        self.progress_bar.set(0)
+        self.status_label.configure(text="Starting...")
+        self._write_log(f"Importing {os.path.basename(path)}...")
+        self.start_button.configure(state="disabled")
+        self.stop_button.configure(state="normal")
+        self._worker = threading.Thread(
+            target=self._run, args=(path, table, int(self.batch_var.get()), self.restart_var.get()),
+            name="import-worker", daemon=True,
+        )
+        self._worker.start()
+        self._schedule_poll()
+
+    def stop_import(self):
+        """Stops after the current batch; the import can be resumed later."""
+        if self._worker is not None:
+            self._stop_event.set()
+            self.status_label.configure(text="Stopping after the current batch...")
+
+    # --- Worker Thread ---
+    def _run(self, path, table, batch_size, restart):
+        try:
+            stats = import_file(self.engine, path, target=table, batch_size=batch_size, restart=restart,
+                                progress=lambda s: self._events.put(("progress", s)),
+                                should_stop=self._stop_event.is_set)
+            self._events.put(("done", stats))
+        except Exception as e:
+            self._events.put(("error", e))
+
+    # --- UI Side ---
+    def _schedule_poll(self):
+        if self._poll_job is None:
+            self._poll_job = self.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        finished = False
+        while True:
+            try: kind, payload = self._events.get_nowait()
+            except queue.Empty: break
+            if kind == "progress":
+                self._show_progress(payload)
+            elif kind == "done":
+                self._show_progress(payload)
+                self._on_finished(payload)
+                finished = True
+            elif kind == "error":
+                self._write_log(f"Import failed: {payload}")
+                self.status_label.configure(text="Failed - committed batches are kept, start again to resume")
+                notification.show_error(f"Import failed: {payload}")
+                finished = True
+        if finished:
+            self._worker = None
+            self.start_button.configure(state="normal")
+            self.stop_button.configure(state="disabled")
+        else:
+            self._schedule_poll()
+
+    def _show_progress(self, stats):
+        if stats["total_bytes"]: self.progress_bar.set(min(1.0, stats["bytes_read"] / stats["total_bytes"]))
+        resumed = f", {stats['skipped']} skipped (already imported)" if stats["skipped"] else ""
+        self.status_label.configure(
+            text=f"{stats['records']} records, {stats['rows']} rows in {stats['elapsed']:.1f}s - "
+                 f"{stats['records_per_sec']:.0f} records/s, {stats['rows_per_sec']:.0f} rows/s{resumed}"
+        )
+
+    def _on_finished(self, stats):
+        if stats["status"] == "done":
+            self.progress_bar.set(1)
+            self._write_log(f"Done: {stats['records'] - stats['rejected']} records imported ({stats['rows']} rows), {stats['rejected']} rejected.")
+            notification.show_success(f"Imported {stats['records'] - stats['rejected']} records")
+        else:
+            self._write_log(f"Stopped after {stats['records']} records. Start the same file again to resume.")
+        for error in stats["errors"]: self._write_log(f"  rejected {error}")
+        if stats["rows"] and self.on_complete: self.on_complete()
+
+    def _write_log(self, message):
+        self.log.configure(state="normal")
+        self.log.insert("end", message + "\n")
+        self.log.see("end")
+        self.log.configure(state="disabled")
+
+    def _on_destroy(self, event=None):
+        if event is not None and event.widget is not self: return
+        self._stop_event.set() # A running import stops at the next batch boundary
+        if self._poll_job is not None:
+            try: self.after_cancel(self._poll_job)
+            except Exception: pass
+            self._poll_job = None
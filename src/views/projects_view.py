@@ -0,0 +1,226 @@
+import customtkinter as ctk
+from src.services.projects import (
+    project_page, contract_group_page, count_projects, distinct_values, filter_clauses, page_key, PROJECT_PAGE_SIZE,
+)
+from src.utils.background import BackgroundQueryExecutor
+from src.utils.cache import CountCache, normalize_filters
+
+
+def _text(value):
+    if value is None: return ""
+    if isinstance(value, float): return f"{value:,.1f}"
+    if isinstance(value, int): return f"{value:,}"
+    return str(value)
+
+
+class ProjectsView(ctk.CTkFrame):
+    """
+    Projects of all engineers, newest contract first, or grouped by contract number.
+    Only the current page is fetched and drawn; queries run on a worker thread.
+    """
+
+    ALL = "All"
+    # (header, row attribute, weight) per view mode
+    LIST_COLUMNS = (
+        ("Contract Date", "contract_date", 1), ("Contract No.", "contract_number", 1), ("Service", "service_name", 3),
+        ("Client", "client", 2), ("Construction Type", "construction_type", 1), ("Sector", "technical_sector", 1),
+        ("Equity %", "equity_ratio", 1), ("Engineer", "engineer_name", 1),
+    )
+    GROUP_COLUMNS = (
+        ("Contract No.", "contract_number", 1), ("Service", "service_name", 3), ("Client", "client", 2),
+        ("Contract Date", "contract_date", 1), ("Construction Type", "construction_type", 1),
+        ("Engineers", "engineer_count", 1), ("Equity % (sum)", "equity_ratio", 1), ("Names", "engineer_names", 2),
+    )
+
+    def __init__(self, parent, session_factory):
+        super().__init__(parent, fg_color="transparent")
+        self.executor = BackgroundQueryExecutor(self, session_factory, max_workers=1, name="projects-worker")
+        self.count_cache = CountCache(tables=("project_details",))
+        self.page = 1
+        self.total_pages = 1
+        self._page_keys = {1: None}  # page -> keyset position of the last row of the previous page
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(3, weight=1)
+
+        ctk.CTkLabel(self, text="Projects", font=("Arial Bold", 20), anchor="w").grid(row=0, column=0, sticky="w", padx=10, pady=(10, 5))
+
+        # --- Filters ---
+        filters = ctk.CTkFrame(self)
+        filters.grid(row=1, column=0, sticky="ew", padx=10, pady=5)
+        self.filter_vars = {}
+
+        def add_entry(column, label, key, placeholder, width=110):
+            ctk.CTkLabel(filters, text=label).grid(row=0, column=column, padx=(10, 2), pady=8, sticky="w")
+            var = ctk.StringVar()
+            entry = ctk.CTkEntry(filters, textvariable=var, placeholder_text=placeholder, width=width)
+            entry.grid(row=0, column=column + 1, padx=(0, 5), pady=8)
+            entry.bind("<Return>", lambda e: self.apply_filters())
+            self.filter_vars[key] = var
+
+        add_entry(0, "Contract from", "contract_date_from", "YYYY-MM-DD")
+        add_entry(2, "to", "contract_date_to", "YYYY-MM-DD")
+        add_entry(4, "Client", "client", "starts with...", width=140)
+        add_entry(6, "Equity %", "equity_ratio", ">=50, 20-40", width=90)
+
+        self.option_menus = {}
+        for i, (key, label) in enumerate((("construction_type", "Construction type"), ("technical_sector", "Sector"))):
+            ctk.CTkLabel(filters, text=label).grid(row=1, column=i * 2, padx=(10, 2), pady=(0, 8), sticky="w")
+            var = ctk.StringVar(value=self.ALL)
+            menu = ctk.CTkOptionMenu(filters, values=[self.ALL], variable=var, width=160, command=lambda _: self.apply_filters())
+            menu.grid(row=1, column=i * 2 + 1, padx=(0, 5), pady=(0, 8), sticky="w")
+            self.filter_vars[key] = var
+            self.option_menus[key] = menu
+        self.filter_vars["contract_number"] = ctk.StringVar() # Set by opening a contract in the grouped view
+
+        self.group_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(filters, text="Group by contract number", variable=self.group_var,
+                        command=self.apply_filters).grid(row=1, column=4, columnspan=2, padx=10, pady=(0, 8), sticky="w")
+        ctk.CTkButton(filters, text="Apply", width=80, command=self.apply_filters).grid(row=1, column=6, padx=5, pady=(0, 8))
+        ctk.CTkButton(filters, text="Clear", width=80, fg_color="gray50", hover_color="gray40",
+                      command=self.clear_filters).grid(row=1, column=7, padx=5, pady=(0, 8))
+
+        # --- Table ---
+        self.header_frame = ctk.CTkFrame(self, corner_radius=8)
+        self.header_frame.grid(row=2, column=0, sticky="ew", padx=10)
+        self.rows_frame = ctk.CTkScrollableFrame(self, corner_radius=8)
+        self.rows_frame.grid(row=3, column=0, sticky="nsew", padx=10, pady=5)
+
+        # --- Pagination ---
+        pagination = ctk.CTkFrame(self, fg_color="transparent")
+        pagination.grid(row=4, column=0, sticky="ew", padx=10, pady=(0, 10))
+        self.count_label = ctk.CTkLabel(pagination, text="", anchor="w")
+        self.count_label.pack(side="left")
+        self.next_button = ctk.CTkButton(pagination, text="Next", width=100, command=self.next_page)
+        self.next_button.pack(side="right")
+        self.page_label = ctk.CTkLabel(pagination, text="Page 1 of 1")
+        self.page_label.pack(side="right", padx=10)
+        self.prev_button = ctk.CTkButton(pagination, text="Previous", width=100, command=self.prev_page)
+        self.prev_button.pack(side="right")
+
+        self._draw_headers()
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    # --- Filters ---
+    def current_filters(self):
+        return {key: ("" if var.get() == self.ALL else var.get().strip()) for key, var in self.filter_vars.items()}
+
+    def apply_filters(self):
+        try: filter_clauses(self.current_filters()) # Validate on the UI thread for a readable message
+        except ValueError as e:
+            self.count_label.configure(text=str(e), text_color="#E74C3C")
+            return
+        self.page = 1
+        self._page_keys = {1: None}
+        self._draw_headers()
+        self.load_page()
+
+    def clear_filters(self):
+        for key, var in self.filter_vars.items():
+            var.set(self.ALL if key in self.option_menus else "")
+        self.apply_filters()
+
+    def open_contract(self, contract_number):
+        """Lists the individual participations of one contract."""
+        self.group_var.set(False)
+        self.filter_vars["contract_number"].set(contract_number)
+        self.apply_filters()
+
+    def _load_options(self):
+        """Fills the drop-downs with the values present in the data (once per visit, in the background)."""
+        def query(session):
+            return {key: distinct_values(session, key) for key in self.option_menus}
+        def apply(values):
+            for key, menu in self.option_menus.items():
+                menu.configure(values=[self.ALL] + values[key])
+        self.executor.submit("options", query, on_done=apply)
+
+    # --- Loading ---
+    def on_show(self):
+        """Called by the app every time the page is shown."""
+        self._load_options()
+        self.load_page()
+
+    def load_page(self):
+        request = {"filters": self.current_filters(), "grouped": self.group_var.get(), "page": self.page}
+        if self.page not in self._page_keys: # Lost the keyset position
+            self.page = request["page"] = 1
+        request["after"] = self._page_keys[request["page"]]
+        self.page_label.configure(text="Loading...")
+        self.executor.submit("page", lambda session: self._query(session, request),
+                             on_done=self._render, on_error=self._show_error)
+
+    def _query(self, session, request):
+        """Worker thread: page rows plus the (cached) total count."""
+        filters, grouped = request["filters"], request["grouped"]
+        fetch = contract_group_page if grouped else project_page
+        rows = fetch(session, filters, after=request["after"], rows_per_page=PROJECT_PAGE_SIZE)
+        count_key = normalize_filters(filters) + (("__grouped__", str(grouped)),)
+        total = self.count_cache.get(count_key)
+        if total is None:
+            version = self.count_cache.version()
+            total = count_projects(session, filters, grouped)
+            self.count_cache.put(count_key, total, version)
+        return request, rows, total
+
+    # --- Rendering ---
+    def _columns(self):
+        return self.GROUP_COLUMNS if self.group_var.get() else self.LIST_COLUMNS
+
+    def _configure_columns(self, frame):
+        for col, (_, _, weight) in enumerate(self._columns()):
+            frame.grid_columnconfigure(col, weight=weight, uniform="project_col")
+
+    def _draw_headers(self):
+        for widget in self.header_frame.winfo_children(): widget.destroy()
+        self._configure_columns(self.header_frame)
+        for col, (header, _, _) in enumerate(self._columns()):
+            ctk.CTkLabel(self.header_frame, text=header, font=("Arial Bold", 12), anchor="w").grid(row=0, column=col, sticky="ew", padx=5, pady=6)
+
+    def _render(self, result):
+        request, rows, total = result
+        if request["grouped"] != self.group_var.get(): return # Mode switched while loading
+        grouped = request["grouped"]
+        self.total_pages = max(1, -(-total // PROJECT_PAGE_SIZE))
+        if len(rows) == PROJECT_PAGE_SIZE:
+            self._page_keys[request["page"] + 1] = page_key(rows[-1], grouped)
+
+        for widget in self.rows_frame.winfo_children(): widget.destroy()
+        self._configure_columns(self.rows_frame)
+        if not rows:
+            ctk.CTkLabel(self.rows_frame, text="No projects found matching your criteria.", text_color="gray60").grid(row=0, column=0, columnspan=8, pady=20)
+        for r, row in enumerate(rows):
+            for col, (_, attr, _) in enumerate(self._columns()):
+                label = ctk.CTkLabel(self.rows_frame, text=_text(getattr(row, attr)), anchor="w", wraplength=260)
+                label.grid(row=r, column=col, sticky="ew", padx=5, pady=2)
+                if grouped:
+                    label.configure(cursor="hand2")
+                    label.bind("<Double-Button-1>", lambda e, n=row.contract_number: self.open_contract(n))
+
+        noun = "contracts" if grouped else "projects"
+        contract = request["filters"].get("contract_number")
+        hint = " - double-click a contract to list its projects" if grouped else ""
+        self.count_label.configure(text=f"{total:,} {noun}" + (f" in contract {contract}" if contract else "") + hint,
+                                   text_color=("gray10", "gray90"))
+        self.page_label.configure(text=f"Page {self.page} of {self.total_pages}")
+        self.prev_button.configure(state="normal" if self.page > 1 else "disabled")
+        self.next_button.configure(state="normal" if self.page < self.total_pages else "disabled")
+
+    def _show_error(self, error):
+        self.page_label.configure(text="Error")
+        print(f"Error loading projects: {error}")
+
+    # --- Navigation ---
+    def next_page(self):
+        if self.page < self.total_pages and self.page + 1 in self._page_keys:
+            self.page += 1
+            self.load_page()
+
+    def prev_page(self):
+        if self.page > 1:
+            self.page -= 1
+            self.load_page()
+
+    def _on_destroy(self, event=None):
+        if event is not None and event.widget is not self: return
+        self.executor.shutdown()
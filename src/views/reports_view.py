@@ -0,0 +1,187 @@
+import customtkinter as ctk
+import os
+import queue
+import threading
+from tkinter import filedialog
+from src.services.reports import generate_reports, REPORT_FORMATS, REPORT_WORKERS
+from src.services.notification import notification
+
+
+class ReportsView(ctk.CTkFrame):
+    """Page generating career statement reports for many engineers (runs on a worker thread)."""
+
+    POLL_INTERVAL_MS = 100
+    ALL = "All engineers"
+    SELECTED = "Engineers selected in the table"
+
+    def __init__(self, parent, session_factory, get_selection=None):
+        """
+        Args:
+            parent: The parent widget.
+            session_factory: sessionmaker of engineers.db.
+            get_selection: Optional callable returning the engineer ids selected in the Engineers table.
+        """
+        super().__init__(parent, fg_color="transparent")
+        self.session_factory = session_factory
+        self.get_selection = get_selection
+        self._worker = None
+        self._stop_event = threading.Event()
+        self._events = queue.Queue()
+        self._poll_job = None
+
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_rowconfigure(6, weight=1)
+
+        ctk.CTkLabel(self, text="Reports", font=("Arial Bold", 20), anchor="w").grid(row=0, column=0, columnspan=3, sticky="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(
+            self, anchor="w", justify="left", text_color="gray60",
+            text="Writes one career statement per engineer (basic information, grades, qualifications, education,\n"
+                 "training, participation, awards, sanctions and projects). Engineers unchanged since the last run are not rendered again.",
+        ).grid(row=1, column=0, columnspan=3, sticky="w", padx=10, pady=(0, 10))
+
+        # Output directory
+        ctk.CTkLabel(self, text="Folder:", width=100, anchor="w").grid(row=2, column=0, sticky="w", padx=10, pady=5)
+        self.path_var = ctk.StringVar(value=os.path.join(os.path.expanduser("~"), "engineer_reports"))
+        ctk.CTkEntry(self, textvariable=self.path_var, height=32).grid(row=2, column=1, sticky="ew", padx=(0, 10), pady=5)
+        ctk.CTkButton(self, text="Browse...", width=100, command=self._browse).grid(row=2, column=2, padx=(0, 10), pady=5)
+
+        # Options
+        options = ctk.CTkFrame(self, fg_color="transparent")
+        options.grid(row=3, column=0, columnspan=3, sticky="ew", padx=10, pady=5)
+        ctk.CTkLabel(options, text="Format:", anchor="w").pack(side="left")
+        self.format_var = ctk.StringVar(value=REPORT_FORMATS[0])
+        ctk.CTkOptionMenu(options, values=list(REPORT_FORMATS), variable=self.format_var, width=90).pack(side="left", padx=(5, 20))
+        ctk.CTkLabel(options, text="Engineers:", anchor="w").pack(side="left")
+        self.scope_var = ctk.StringVar(value=self.ALL)
+        scopes = [self.ALL, self.SELECTED] if get_selection else [self.ALL]
+        ctk.CTkOptionMenu(options, values=scopes, variable=self.scope_var, width=240).pack(side="left", padx=(5, 20))
+        ctk.CTkLabel(options, text="Processes:", anchor="w").pack(side="left")
+        self.workers_var = ctk.StringVar(value=str(REPORT_WORKERS))
+        ctk.CTkOptionMenu(options, values=[str(n) for n in (1, 2, 4, 8)], variable=self.workers_var, width=70).pack(side="left", padx=5)
+
+        # Controls
+        controls = ctk.CTkFrame(self, fg_color="transparent")
+        controls.grid(row=4, column=0, columnspan=3, sticky="ew", padx=10, pady=5)
+        self.start_button = ctk.CTkButton(controls, text="Generate Reports", command=self.start, width=140)
+        self.start_button.pack(side="left")
+        self.stop_button = ctk.CTkButton(controls, text="Stop", command=self.stop, width=100, state="disabled", fg_color="#E74C3C", hover_color="#C0392B")
+        self.stop_button.pack(side="left", padx=10)
+
+        # Progress
+        progress_frame = ctk.CTkFrame(self, fg_color="transparent")
+        progress_frame.grid(row=5, column=0, columnspan=3, sticky="ew", padx=10, pady=5)
+        progress_frame.grid_columnconfigure(0, weight=1)
+        self.progress_bar = ctk.CTkProgressBar(progress_frame)
+        self.progress_bar.grid(row=0, column=0, sticky="ew")
+        self.progress_bar.set(0)
+        self.status_label = ctk.CTkLabel(progress_frame, text="Idle", anchor="w")
+        self.status_label.grid(row=1, column=0, sticky="w", pady=(5, 0))
+
+        # Log
+        self.log = ctk.CTkTextbox(self, height=200)
+        self.log.grid(row=6, column=0, columnspan=3, sticky="nsew", padx=10, pady=(5, 10))
+        self.log.configure(state="disabled")
+
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    # --- UI Actions ---
+    def _browse(self):
+        path = filedialog.askdirectory(title="Select Report Folder")
+        if path: self.path_var.set(path)
+
+    def start(self):
+        if self._worker is not None: return
+        directory = self.path_var.get().strip()
+        if not directory:
+            notification.show_error("Please choose a folder for the reports.")
+            return
+        engineer_ids = None
+        if self.scope_var.get() == self.SELECTED:
+            engineer_ids = sorted(self.get_selection())
+            if not engineer_ids:
+                notification.show_error("No engineers are selected in the Engineers table.")
+                return
+        fmt, workers = self.format_var.get(), int(self.workers_var.get())
+        self._stop_event.clear()
+        self.progress_bar.set(0)
+        self.status_label.configure(text="Starting...")
+        self._write_log(f"Generating {fmt.upper()} reports in {directory}...")
+        self.start_button.configure(state="disabled")
+        self.stop_button.configure(state="normal")
+        self._worker = threading.Thread(target=self._run, args=(directory, fmt, engineer_ids, workers), name="reports-worker", daemon=True)
+        self._worker.start()
+        self._schedule_poll()
+
+    def stop(self):
+        """Stops after the current batch."""
+        if self._worker is not None:
+            self._stop_event.set()
+            self.status_label.configure(text="Stopping after the current batch...")
+
+    # --- Worker Thread ---
+    def _run(self, directory, fmt, engineer_ids, workers):
+        try:
+            stats = generate_reports(self.session_factory, directory, fmt, engineer_ids=engineer_ids, workers=workers,
+                                     progress=lambda s: self._events.put(("progress", s)),
+                                     should_stop=self._stop_event.is_set)
+            self._events.put(("done", stats))
+        except Exception as e:
+            self._events.put(("error", e))
+
+    # --- UI Side ---
+    def _schedule_poll(self):
+        if self._poll_job is None:
+            self._poll_job = self.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        finished = False
+        while True:
+            try: kind, payload = self._events.get_nowait()
+            except queue.Empty: break
+            if kind == "progress":
+                self._show_progress(payload)
+            elif kind == "done":
+                self._show_progress(payload)
+                self._on_finished(payload)
+                finished = True
+            elif kind == "error":
+                self._write_log(f"Report generation failed: {payload}")
+                self.status_label.configure(text="Failed")
+                notification.show_error(f"Report generation failed: {payload}")
+                finished = True
+        if finished:
+            self._worker = None
+            self.start_button.configure(state="normal")
+            self.stop_button.configure(state="disabled")
+        else:
+            self._schedule_poll()
+
+    def _show_progress(self, stats):
+        if stats["total"]: self.progress_bar.set(min(1.0, stats["engineers"] / stats["total"]))
+        self.status_label.configure(
+            text=f"{stats['engineers']} of {stats['total']} engineers - {stats['rendered']} rendered, "
+                 f"{stats['cached']} unchanged - {stats['elapsed']:.1f}s"
+        )
+
+    def _on_finished(self, stats):
+        if stats["status"] == "done":
+            self.progress_bar.set(1)
+            self._write_log(f"Done: {stats['engineers']} reports ({stats['rendered']} rendered, {stats['cached']} unchanged) in {stats['elapsed']:.1f}s.")
+            notification.show_success(f"Generated {stats['engineers']} reports")
+        else:
+            self._write_log(f"Stopped after {stats['engineers']} engineers.")
+
+    def _write_log(self, message):
+        self.log.configure(state="normal")
+        self.log.insert("end", message + "\n")
+        self.log.see("end")
+        self.log.configure(state="disabled")
+
+    def _on_destroy(self, event=None):
+        if event is not None and event.widget is not self: return
+        self._stop_event.set() # A running generation stops at the next batch boundary
+        if self._poll_job is not None:
+            try: self.after_cancel(self._poll_job)
+            except Exception: pass
+            self._poll_job = None
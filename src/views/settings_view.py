@@ -0,0 +1,192 @@
+import customtkinter as ctk
+import queue
+import threading
+from CTkMessagebox import CTkMessagebox
+from src.services.backup import (
+    create_backup, list_backups, integrity_check, restore_backup, backup_root, BACKUP_KEEP_LAST, BACKUP_KEEP_DAYS,
+)
+from src.services.notification import notification
+from src.utils.db import get_engine
+
+
+class SettingsView(ctk.CTkFrame):
+    """Settings page: database backups (backup, verify and restore run on a worker thread)."""
+
+    POLL_INTERVAL_MS = 100
+
+    def __init__(self, parent, on_restore=None):
+        """
+        Args:
+            parent: The parent widget.
+            on_restore: Callback run after a backup was restored (e.g. reload the engineer table).
+        """
+        super().__init__(parent, fg_color="transparent")
+        self.on_restore = on_restore
+        self._worker = None
+        self._events = queue.Queue()
+        self._poll_job = None
+        self.selected_path = None
+        self._rows = {}
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(4, weight=1)
+
+        ctk.CTkLabel(self, text="Settings", font=("Arial Bold", 20), anchor="w").grid(row=0, column=0, sticky="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(self, text="Backups", font=("Arial Bold", 16), anchor="w").grid(row=1, column=0, sticky="w", padx=10, pady=(10, 0))
+        ctk.CTkLabel(
+            self, anchor="w", justify="left", text_color="gray60",
+            text=f"Backups are consistent copies taken while the app keeps running, checked with PRAGMA integrity_check.\n"
+                 f"The newest {BACKUP_KEEP_LAST} are kept, plus one per day for {BACKUP_KEEP_DAYS} days. Folder: {backup_root()}",
+        ).grid(row=2, column=0, sticky="w", padx=10, pady=(0, 5))
+
+        # Controls
+        controls = ctk.CTkFrame(self, fg_color="transparent")
+        controls.grid(row=3, column=0, sticky="ew", padx=10, pady=5)
+        self.backup_button = ctk.CTkButton(controls, text="Back Up Now", width=130, command=self.start_backup)
+        self.backup_button.pack(side="left")
+        self.verify_button = ctk.CTkButton(controls, text="Verify", width=100, command=self.verify_selected)
+        self.verify_button.pack(side="left", padx=10)
+        self.restore_button = ctk.CTkButton(controls, text="Restore...", width=100, fg_color="#E74C3C", hover_color="#C0392B",
+                                            command=self.restore_selected)
+        self.restore_button.pack(side="left")
+
+        # Backup list
+        self.list_frame = ctk.CTkScrollableFrame(self, corner_radius=8)
+        self.list_frame.grid(row=4, column=0, sticky="nsew", padx=10, pady=5)
+        self.list_frame.grid_columnconfigure(0, weight=1)
+
+        # Progress
+        progress_frame = ctk.CTkFrame(self, fg_color="transparent")
+        progress_frame.grid(row=5, column=0, sticky="ew", padx=10, pady=(5, 10))
+        progress_frame.grid_columnconfigure(0, weight=1)
+        self.progress_bar = ctk.CTkProgressBar(progress_frame)
+        self.progress_bar.grid(row=0, column=0, sticky="ew")
+        self.progress_bar.set(0)
+        self.status_label = ctk.CTkLabel(progress_frame, text="Idle", anchor="w")
+        self.status_label.grid(row=1, column=0, sticky="w", pady=(5, 0))
+
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    # --- Backup List ---
+    def on_show(self):
+        """Called by the app every time the page is shown."""
+        self.refresh_list()
+
+    def refresh_list(self):
+        for widget in self.list_frame.winfo_children(): widget.destroy()
+        self._rows = {}
+        backups = list_backups()
+        if self.selected_path not in {b["path"] for b in backups}: self.selected_path = None
+        if not backups:
+            ctk.CTkLabel(self.list_frame, text="No backups yet.", text_color="gray60").grid(row=0, column=0, pady=20)
+        for r, backup in enumerate(backups):
+            row = ctk.CTkFrame(self.list_frame, fg_color="transparent", corner_radius=6)
+            row.grid(row=r, column=0, sticky="ew", pady=1)
+            row.grid_columnconfigure(0, weight=1)
+            labels = (
+                ctk.CTkLabel(row, text=backup["name"], anchor="w"),
+                ctk.CTkLabel(row, text=f"{backup['created']:%Y-%m-%d %H:%M}", anchor="e", width=130),
+                ctk.CTkLabel(row, text=f"{backup['size'] / (1024 * 1024):,.1f} MB", anchor="e", width=90),
+            )
+            for col, label in enumerate(labels):
+                label.grid(row=0, column=col, sticky="ew", padx=8, pady=3)
+                label.bind("<Button-1>", lambda e, p=backup["path"]: self._select(p))
+            row.bind("<Button-1>", lambda e, p=backup["path"]: self._select(p))
+            self._rows[backup["path"]] = row
+        self._select(self.selected_path)
+
+    def _select(self, path):
+        self.selected_path = path
+        for row_path, row in self._rows.items():
+            row.configure(fg_color=("gray75", "gray30") if row_path == path else "transparent")
+
+    # --- Actions ---
+    def start_backup(self):
+        self._start("backup", lambda progress: create_backup(progress=progress), "Backing up...")
+
+    def verify_selected(self):
+        if not self.selected_path:
+            notification.show_error("Please select a backup to verify.")
+            return
+        path = self.selected_path
+        self._start("verify", lambda progress: integrity_check(path), "Checking integrity...")
+
+    def restore_selected(self):
+        if not self.selected_path:
+            notification.show_error("Please select a backup to restore.")
+            return
+        path = self.selected_path
+        msg = CTkMessagebox(title="Restore Backup", icon="warning", option_1="Cancel", option_2="Restore",
+                            message="Replace the current database with this backup?\n"
+                                    "The current data is saved as a \"pre-restore\" backup first.")
+        if msg.get() != "Restore": return
+        self._start("restore", lambda progress: restore_backup(path, engine=get_engine(), progress=progress), "Restoring...")
+
+    def _start(self, kind, task, message):
+        if self._worker is not None: return
+        self.progress_bar.set(0)
+        self.status_label.configure(text=message)
+        for button in (self.backup_button, self.verify_button, self.restore_button): button.configure(state="disabled")
+        self._worker = threading.Thread(target=self._run, args=(kind, task), name="backup-worker", daemon=True)
+        self._worker.start()
+        self._schedule_poll()
+
+    # --- Worker Thread ---
+    def _run(self, kind, task):
+        try:
+            result = task(lambda done, total: self._events.put(("progress", (done, total))))
+            self._events.put(("done", (kind, result)))
+        except Exception as e:
+            self._events.put(("error", (kind, e)))
+
+    # --- UI Side ---
+    def _schedule_poll(self):
+        if self._poll_job is None:
+            self._poll_job = self.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        finished = False
+        while True:
+            try: event, payload = self._events.get_nowait()
+            except queue.Empty: break
+            if event == "progress":
+                done, total = payload
+                if total: self.progress_bar.set(done / total)
+            elif event == "done":
+                self._on_finished(*payload)
+                finished = True
+            elif event == "error":
+                kind, error = payload
+                self.status_label.configure(text=f"{kind.capitalize()} failed: {error}")
+                notification.show_error(f"{kind.capitalize()} failed: {error}")
+                finished = True
+        if finished:
+            self._worker = None
+            for button in (self.backup_button, self.verify_button, self.restore_button): button.configure(state="normal")
+            self.refresh_list()
+        else:
+            self._schedule_poll()
+
+    def _on_finished(self, kind, result):
+        self.progress_bar.set(1)
+        if kind == "backup":
+            self.selected_path = result
+            self.status_label.configure(text=f"Backup written: {result}")
+            notification.show_success("Backup complete")
+        elif kind == "verify":
+            ok, messages, version = result
+            text = f"Integrity check passed (schema version {version})" if ok else "Integrity check FAILED: " + "; ".join(messages[:3])
+            self.status_label.configure(text=text)
+            if not ok: notification.show_error("The backup is damaged")
+        else:
+            self.status_label.configure(text=f"Restored. The previous database was saved as {result}")
+            notification.show_success("Backup restored")
+            if self.on_restore: self.on_restore()
+
+    def _on_destroy(self, event=None):
+        if event is not None and event.widget is not self: return
+        if self._poll_job is not None:
+            try: self.after_cancel(self._poll_job)
+            except Exception: pass
+            self._poll_job = None
@@ -0,0 +1,33 @@
+import os
+import sys
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import Base
+from src.utils.db import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.change_tracker import change_tracker
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "engineers.db")
+
+
+@pytest.fixture
+def engine(db_path):
+    """A new database built the way init_database() builds one (models, then migrations)."""
+    engine = create_db_engine(db_path)
+    Base.metadata.create_all(engine)
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    factory = sessionmaker(bind=engine)
+    change_tracker.install(factory)
+    return factory
@@ -0,0 +1,33 @@
+import sqlite3
+import pytest
+from src.utils.cache import CountCache, ResultCache
+from src.utils.change_tracker import change_tracker
+
+
+@pytest.fixture
+def watched(engine, db_path):
+    change_tracker.watch(db_path)
+    return db_path
+
+
+def _write_from_another_connection(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO engineers (name) VALUES ('Written elsewhere')")
+    conn.commit()
+    conn.close()
+
+
+def test_count_cache_drops_counts_after_external_write(watched):
+    cache = CountCache(tables=("engineers",))
+    cache.put(("all",), 0, cache.version())
+    assert cache.get(("all",)) == 0
+    _write_from_another_connection(watched)
+    assert cache.get(("all",)) is None
+
+
+def test_result_cache_drops_results_after_external_write(watched):
+    cache = ResultCache()
+    cache.put("tile", [], ("engineers",), cache.version(("engineers",)))
+    assert cache.get("tile", ("engineers",)) == []
+    _write_from_another_connection(watched)
+    assert cache.get("tile", ("engineers",)) is None
@@ -0,0 +1,83 @@
+from src.models.engineer import Engineer, TechnicalSectorParticipation, Qualification, TechnicalGrade
+from src.services.combinations import find_teams, save_combination, reevaluate_combinations, list_combinations
+from src.services.engineer_repository import delete_engineers
+
+
+def _engineer(session, engineer_id, road_days=0, qualifications=()):
+    engineer = Engineer(id=engineer_id, name=f"E{engineer_id}")
+    if road_days: engineer.technical_sector_participation.append(TechnicalSectorParticipation(technical_sector="Road", participation_days=road_days))
+    engineer.technical_qualifications.extend(Qualification(title=t) for t in qualifications)
+    session.add(engineer)
+
+
+def test_dominated_engineer_still_completes_a_team(session_factory):
+    # A dominates B, but neither reaches 100 days alone: {A, B} is the only team
+    with session_factory() as session:
+        _engineer(session, 1, road_days=60)
+        _engineer(session, 2, road_days=50)
+        session.commit()
+        result = find_teams(session, {"sector_days": {"Road": 100}, "max_members": 3})
+    assert result["complete"]
+    assert [team["engineer_ids"] for team in result["teams"]] == [[1, 2]]
+
+
+def test_heavily_dominated_engineer_is_pruned(session_factory):
+    # Four engineers dominate #5 and a team has two members, so #5 can always be swapped out
+    with session_factory() as session:
+        for i in range(1, 5): _engineer(session, i, road_days=60)
+        _engineer(session, 5, road_days=45)
+        session.commit()
+        result = find_teams(session, {"sector_days": {"Road": 100}, "max_members": 2}, limit=3)
+    teams = [team["engineer_ids"] for team in result["teams"]]
+    assert teams and all(len(team) == 2 and 5 not in team for team in teams)
+
+
+def test_qualification_and_days_combined(session_factory):
+    with session_factory() as session:
+        _engineer(session, 1, road_days=80, qualifications=("PE",))
+        _engineer(session, 2, road_days=30)
+        session.commit()
+        result = find_teams(session, {"qualifications": ["PE"], "sector_days": {"Road": 100}, "max_members": 2})
+    assert [team["engineer_ids"] for team in result["teams"]] == [[1, 2]]
+
+
+def test_more_single_member_teams_than_the_limit(session_factory):
+    # Every engineer meets the requirement alone; the 10 with the most days must all be listed
+    with session_factory() as session:
+        for i in range(1, 21): _engineer(session, i, road_days=99 + i)
+        session.commit()
+        result = find_teams(session, {"sector_days": {"Road": 50}, "max_members": 8}, limit=10)
+    assert [team["engineer_ids"] for team in result["teams"]] == [[i] for i in range(20, 10, -1)]
+
+
+def test_equal_profiles_do_not_prune_each_other(session_factory):
+    with session_factory() as session:
+        for i in range(1, 21):
+            _engineer(session, i)
+            session.add(TechnicalGrade(engineer_id=i, grade="A"))
+        session.commit()
+        result = find_teams(session, {"grades": ["A"], "max_members": 8}, limit=10)
+    assert len(result["teams"]) == 10 and all(len(team["engineer_ids"]) == 1 for team in result["teams"])
+
+
+def test_deleted_member_is_not_replaced_by_a_reused_id(session_factory):
+    with session_factory() as session:
+        _engineer(session, 1, road_days=120)
+        session.commit()
+        save_combination(session, "Road team", {"sector_days": {"Road": 100}, "max_members": 2}, [1])
+        session.commit()
+        assert list_combinations(session)[0]["status"] == "meets"
+        delete_engineers(session, [1])
+        session.commit()
+        # SQLite hands the freed id to the next engineer
+        session.add(Engineer(name="Mallory"))
+        session.flush()
+        session.add(TechnicalSectorParticipation(engineer_id=1, technical_sector="Road", participation_days=500))
+        session.commit()
+        assert session.get(Engineer, 1).name == "Mallory"
+        reevaluate_combinations(session)
+        session.commit()
+        combination = list_combinations(session)[0]
+    assert combination["status"] == "unmet"
+    assert combination["members"] == [(None, "E1 (deleted)")]
+    assert combination["missing"] == ["Road: 0 of 100 days", "1 member(s) no longer exist: E1 (deleted)"]
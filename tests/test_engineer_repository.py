@@ -0,0 +1,87 @@
+from src.models.engineer import Engineer, AttachmentHealth
+from src.services.engineer_repository import project_engineers, grid_fields, engineer_field
+
+
+def _add_engineers_with_health(session_factory):
+    with session_factory() as session:
+        session.add_all([Engineer(id=1, name="A"), Engineer(id=2, name="B"), Engineer(id=3, name="C")])
+        session.add_all([AttachmentHealth(engineer_id=1, status="ok"), AttachmentHealth(engineer_id=2, status="missing")])
+        session.commit()
+
+
+def test_projected_rows_expose_attachment_status(session_factory):
+    _add_engineers_with_health(session_factory)
+    columns = [{"name": "Name", "db_field": "name"}, {"name": "PDF", "db_field": "attachment_status"}]
+    fields = grid_fields(columns, {})
+    with session_factory() as session:
+        rows = project_engineers(session, fields).order_by(Engineer.id).all()
+    # The grid reads the cell with getattr(row, db_field)
+    assert [getattr(row, "attachment_status", "-") for row in rows] == ["ok", "missing", None]
+
+
+def test_attachment_status_filters_and_sorts(session_factory):
+    _add_engineers_with_health(session_factory)
+    status = engineer_field("attachment_status")
+    with session_factory() as session:
+        filtered = project_engineers(session, ("id",)).filter(status.ilike("%miss%")).all()
+        ordered = project_engineers(session, ("id", "attachment_status")).order_by(status.desc(), Engineer.id).all()
+    assert [row.id for row in filtered] == [2]
+    assert [row.attachment_status for row in ordered] == ["ok", "missing", None]
+
+
+def _headless_table(columns):
+    """EngineerTable with just the state _query_page needs (no Tk widgets)."""
+    from src.views.engineer_table import EngineerTable
+    from src.utils.cache import CountCache, PageCache
+    table = EngineerTable.__new__(EngineerTable)
+    table.columns = columns
+    table.column_visibility = {c["name"]: True for c in columns}
+    table.count_cache = CountCache(tables=("engineers", "attachment_health"))
+    table.page_cache = PageCache(tables=table.count_cache.tables)
+    table.use_window_count = True
+    table._page_bounds, table._page_bounds_signature, table._page_bounds_epoch = {}, None, 0
+    return table
+
+
+def test_keyset_pages_sorted_by_attachment_status(session_factory):
+    with session_factory() as session:
+        session.add_all([Engineer(id=i, name=f"E{i}") for i in range(1, 8)])
+        session.add_all([AttachmentHealth(engineer_id=i, status=("ok" if i % 2 else "missing")) for i in range(1, 6)])
+        session.commit()
+    columns = [{"name": "ID", "db_field": "id", "sortable": True, "filterable": True},
+               {"name": "PDF", "db_field": "attachment_status", "sortable": True, "filterable": True}]
+    pages = {}
+    for mode in ("keyset", "offset"):
+        table = _headless_table(columns)
+        request = {"fields": grid_fields(columns, {}), "filters": {}, "search_text": "", "sort_column": "PDF",
+                   "sort_direction": "asc", "rows_per_page": 2, "pagination_mode": mode}
+        pages[mode] = []
+        with session_factory() as session:
+            for p in (1, 2, 3, 4):
+                page_request = dict(request, page=p)
+                bounds, epoch = table._page_bounds_snapshot(page_request)
+                result = table._query_page(session, page_request, bounds)
+                table._merge_page_bounds(page_request, result["page_bounds"], epoch)
+                pages[mode].append([(r.attachment_status, r.id) for r in result["engineers"]])
+        if mode == "keyset":
+            # Boundaries carry the status value, not None
+            assert table._page_bounds[3] == ("missing", 4)
+    assert pages["keyset"] == pages["offset"]
+    assert [id_ for page in pages["keyset"] for _, id_ in page] == [6, 7, 2, 4, 1, 3, 5]
+
+
+def test_invalidated_page_bounds_are_not_merged(session_factory):
+    with session_factory() as session:
+        session.add_all([Engineer(id=i, name=f"E{i}") for i in range(1, 6)])
+        session.commit()
+    columns = [{"name": "ID", "db_field": "id", "sortable": True, "filterable": True}]
+    table = _headless_table(columns)
+    request = {"fields": grid_fields(columns, {}), "filters": {}, "search_text": "", "sort_column": "ID",
+               "sort_direction": "asc", "rows_per_page": 2, "pagination_mode": "keyset", "page": 2}
+    bounds, epoch = table._page_bounds_snapshot(request)
+    with session_factory() as session:
+        result = table._query_page(session, request, bounds)
+    assert result["page_bounds"] == {2: (None, 2), 3: (None, 4)} and bounds == {1: None} # The snapshot is not modified
+    table.invalidate_page_bounds() # e.g. a delete on the Tk thread while the worker ran
+    table._merge_page_bounds(request, result["page_bounds"], epoch)
+    assert table._page_bounds == {}
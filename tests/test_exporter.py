@@ -0,0 +1,47 @@
+import os
+from src.models.engineer import Engineer, ProjectDetail, Qualification
+from src.services.exporter import export_engineers
+from src.services.importer import import_file, CHILD_MODELS
+
+
+def _add_engineers(session_factory):
+    with session_factory() as session:
+        session.add_all([
+            Engineer(id=1, name="Kim", project_details=[ProjectDetail(service_name="Bridge"), ProjectDetail(service_name="Tunnel")]),
+            Engineer(id=2, name="Lee", technical_qualifications=[Qualification(title="Civil")]),
+        ])
+        session.commit()
+
+
+def _careers(session_factory):
+    """Sorted (engineer name, project or qualification) pairs."""
+    with session_factory() as session:
+        projects = session.query(Engineer.name, ProjectDetail.service_name).join(ProjectDetail, ProjectDetail.engineer_id == Engineer.id).all()
+        titles = session.query(Engineer.name, Qualification.title).join(Qualification, Qualification.engineer_id == Engineer.id).all()
+    return sorted(projects + titles)
+
+
+def _import_csv_directory(engine, directory):
+    import_file(engine, os.path.join(directory, "engineers.csv"))
+    for model in CHILD_MODELS:
+        stats = import_file(engine, os.path.join(directory, f"{model.__tablename__}.csv"))
+        assert stats["rejected"] == 0, stats["errors"]
+
+
+def test_jsonl_round_trip_into_same_database(engine, session_factory, tmp_path):
+    _add_engineers(session_factory)
+    path = str(tmp_path / "engineers.jsonl")
+    export_engineers(session_factory, path, fmt="jsonl")
+    stats = import_file(engine, path)
+    assert stats["status"] == "done" and stats["rejected"] == 0
+    assert _careers(session_factory) == sorted(2 * [("Kim", "Bridge"), ("Kim", "Tunnel"), ("Lee", "Civil")])
+
+
+def test_csv_round_trip_into_same_database(engine, session_factory, tmp_path):
+    _add_engineers(session_factory)
+    directory = str(tmp_path / "export")
+    export_engineers(session_factory, directory, fmt="csv")
+    _import_csv_directory(engine, directory)
+    with session_factory() as session:
+        assert session.query(Engineer).count() == 4
+    assert _careers(session_factory) == sorted(2 * [("Kim", "Bridge"), ("Kim", "Tunnel"), ("Lee", "Civil")])
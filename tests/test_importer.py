@@ -0,0 +1,74 @@
+import json
+from src.models.engineer import Engineer, ProjectDetail
+from src.services.importer import import_file
+from src.utils.schema import search_deferred, search_trigger_names
+
+
+def _write_jsonl(path, docs):
+    with open(path, "w", encoding="utf-8") as f:
+        for doc in docs: f.write(json.dumps(doc) + "\n")
+    return str(path)
+
+
+def _triggers(engine):
+    with engine.connect() as conn:
+        return {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+
+
+def test_taken_ids_are_renumbered(engine, session_factory, tmp_path):
+    with session_factory() as session:
+        session.add(Engineer(id=1, name="Existing"))
+        session.commit()
+    path = _write_jsonl(tmp_path / "engineers.jsonl", [
+        {"id": 1, "name": "Imported", "project_details": [{"service_name": "Bridge"}]},
+        {"id": 7, "name": "Free id"},
+    ])
+    stats = import_file(engine, path, batch_size=1)
+    assert stats["status"] == "done" and stats["rejected"] == 0
+    with session_factory() as session:
+        names = dict(session.query(Engineer.id, Engineer.name).all())
+        project_owner = session.query(ProjectDetail.engineer_id).scalar()
+    assert names[1] == "Existing" and names[7] == "Free id"
+    new_id = next(i for i, name in names.items() if name == "Imported")
+    assert new_id not in (1, 7) and project_owner == new_id
+
+
+def test_csv_children_follow_renumbered_engineers(engine, session_factory, tmp_path):
+    with session_factory() as session:
+        session.add(Engineer(id=1, name="Existing"))
+        session.commit()
+    (tmp_path / "engineers.csv").write_text("id,name\n1,Imported\n", encoding="utf-8")
+    (tmp_path / "project_details.csv").write_text(
+        "id,engineer_id,service_name\n10,1,Mapped\n11,99,Orphan\n", encoding="utf-8")
+    import_file(engine, str(tmp_path / "engineers.csv"))
+    stats = import_file(engine, str(tmp_path / "project_details.csv"))
+    assert stats["rejected"] == 1 and "line 3" in stats["errors"][0]
+    with session_factory() as session:
+        imported = session.query(Engineer.id).filter(Engineer.name == "Imported").scalar()
+        owners = session.query(ProjectDetail.engineer_id, ProjectDetail.service_name).all()
+    with engine.connect() as conn:
+        orphan_stats = conn.exec_driver_sql(
+            "SELECT count(*) FROM engineer_stats WHERE engineer_id NOT IN (SELECT id FROM engineers)").scalar()
+    assert owners == [(imported, "Mapped")]
+    assert orphan_stats == 0
+
+
+def test_search_index_caught_up_once_after_import(engine, tmp_path):
+    path = _write_jsonl(tmp_path / "engineers.jsonl", [{"name": f"Engineer {i}"} for i in range(5)])
+    import_file(engine, path, batch_size=2)
+    triggers = _triggers(engine)
+    assert set(search_trigger_names()) <= triggers
+    with engine.connect() as conn:
+        assert not search_deferred(conn.connection.driver_connection)
+        hits = conn.exec_driver_sql("SELECT count(*) FROM engineer_search WHERE engineer_search MATCH 'engineer'").scalar()
+    assert hits == 5
+
+
+def test_stopped_import_restores_search_triggers(engine, tmp_path):
+    path = _write_jsonl(tmp_path / "engineers.jsonl", [{"name": f"Engineer {i}"} for i in range(5)])
+    stats = import_file(engine, path, batch_size=2, should_stop=lambda: True)
+    assert stats["status"] == "stopped"
+    assert set(search_trigger_names()) <= _triggers(engine)
+    with engine.connect() as conn:
+        hits = conn.exec_driver_sql("SELECT count(*) FROM engineer_search WHERE engineer_search MATCH 'engineer'").scalar()
+    assert hits == 2
@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+from src.utils.migrations import _normalize_numeric_text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_migrations_do_not_import_services():
+    code = (
+        "import sys; import src.utils.migrations; "
+        "print(sorted(m for m in sys.modules if m.startswith('src.services')))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_unparseable_numbers_are_kept_as_rejects(engine):
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        # What the retyped copy leaves behind: numeric affinity keeps text it can't convert
+        conn.executemany("INSERT INTO sanctions (id, penalty_points) VALUES (?, ?)", [(1, "1,200"), (2, "two points"), (3, None), (4, "2020-01-05")])
+        assert _normalize_numeric_text(conn, "sanctions", "penalty_points", False) == 2
+        assert conn.execute("SELECT id, penalty_points FROM sanctions ORDER BY id").fetchall() == [(1, 1200.0), (2, None), (3, None), (4, None)]
+        assert conn.execute("SELECT table_name, column_name, row_id, value FROM numeric_conversion_rejects ORDER BY row_id").fetchall() == [
+            ("sanctions", "penalty_points", 2, "two points"), ("sanctions", "penalty_points", 4, "2020-01-05")]
+    finally:
+        raw.close()
@@ -0,0 +1,13 @@
+import pytest
+from src.utils.numbers import parse_number
+
+
+@pytest.mark.parametrize("text, number", [("1,200", 1200), ("540일", 540), ("540 days", 540), ("1.5", 1.5), ("", None)])
+def test_whole_value_numbers(text, number):
+    assert parse_number(text) == number
+
+
+@pytest.mark.parametrize("text", ["2020-01-05", "1,2,3", "3 years 6 months", "1.5e3", "two points"])
+def test_text_around_a_number_is_rejected(text):
+    with pytest.raises(ValueError):
+        parse_number(text, integer=True)
@@ -0,0 +1,24 @@
+from src.services.projects import project_page_query, count_projects_query
+
+
+def _plan(engine, stmt):
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return " | ".join(row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql))
+
+
+def test_filtered_count_reads_the_index_only(engine):
+    plan = _plan(engine, count_projects_query({"construction_type": "Bridge"}))
+    assert "COVERING INDEX ix_project_details_construction_type_contract_date" in plan
+
+
+def test_filtered_page_is_ordered_by_the_index_but_reads_table_rows(engine):
+    plan = _plan(engine, project_page_query({"construction_type": "Bridge"}))
+    assert "USING INDEX ix_project_details_construction_type_contract_date" in plan
+    assert "COVERING" not in plan and "TEMP B-TREE" not in plan
+
+
+def test_client_prefix_page_sorts_its_matches(engine):
+    plan = _plan(engine, project_page_query({"client": "Seoul"}))
+    assert "ix_project_details_client_contract_date" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" in plan
@@ -0,0 +1,36 @@
+import os
+from src.models.engineer import Engineer
+from src.services.reports import generate_reports, report_file_name
+from src.utils.change_tracker import change_tracker
+
+
+def _report(session_factory, directory, engineer_id, name):
+    generate_reports(session_factory, directory, fmt="csv", engineer_ids=[engineer_id], workers=1)
+    with open(os.path.join(directory, report_file_name(engineer_id, name, "csv")), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_reused_engineer_id_is_not_served_from_cache(session_factory, tmp_path):
+    with session_factory() as session:
+        session.add(Engineer(name="First Engineer"))
+        session.commit()
+        engineer_id = session.query(Engineer.id).scalar()
+    assert "First Engineer" in _report(session_factory, str(tmp_path / "a"), engineer_id, "First Engineer")
+    with session_factory() as session:
+        session.delete(session.get(Engineer, engineer_id))
+        session.commit()
+        session.add(Engineer(name="Second Engineer"))
+        session.commit()
+        # SQLite hands the highest rowid out again once it was deleted
+        assert session.query(Engineer.id).scalar() == engineer_id
+    assert "Second Engineer" in _report(session_factory, str(tmp_path / "b"), engineer_id, "Second Engineer")
+
+
+def test_restore_clears_cached_reports(session_factory, tmp_path):
+    with session_factory() as session:
+        session.add(Engineer(name="Kim"))
+        session.commit()
+    generate_reports(session_factory, str(tmp_path / "a"), fmt="csv", workers=1)
+    change_tracker.mark_changed("engineer_versions") # What backup._upgrade reports after a restore
+    stats = generate_reports(session_factory, str(tmp_path / "b"), fmt="csv", workers=1)
+    assert stats["rendered"] == 1 and stats["cached"] == 0
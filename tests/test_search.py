@@ -0,0 +1,17 @@
+from src.models.engineer import Engineer
+from src.services.search import rebuild_search_index
+from src.utils.cache import CountCache
+from src.utils.change_tracker import change_tracker
+from src.utils.schema import FTS_TABLE
+
+
+def test_rebuild_marks_search_index_changed(engine, session_factory):
+    with session_factory() as session:
+        session.add(Engineer(name="Kim"))
+        session.commit()
+    cache = CountCache(tables=("engineers", FTS_TABLE))
+    cache.put(("__search__", "kim"), 1, cache.version())
+    version = change_tracker.version(FTS_TABLE)
+    assert rebuild_search_index(engine) == 1
+    assert change_tracker.version(FTS_TABLE) != version
+    assert cache.get(("__search__", "kim")) is None